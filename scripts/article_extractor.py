@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+原文页面头部优先抽取
+基于 html.parser 增量解析：边下载边提取 <title>、<h1>、meta / og 描述与 JSON-LD 新闻标题/描述，
+正文摘录凑满后即可停止读取，不再对整页 HTML 做多轮正则替换；
+页面编码按 BOM、响应头 charset、前几 KB 内的 <meta charset> 顺序确定，不做全文编码猜测
+"""
+
+import codecs
+import json
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+TITLE_LIMIT = 200
+DESCRIPTION_LIMIT = 300
+EXCERPT_LIMIT = 1500
+# 摘录凑满后仍未遇到 <h1> 时，最多再解析这么多字符等待 <h1>
+H1_GRACE_CHARS = 32 * 1024
+
+SKIP_TAGS = {"script", "style", "noscript"}
+DESCRIPTION_META_NAMES = {"description", "og:description"}
+JSON_LD_ARTICLE_TYPES = {"NewsArticle", "Article", "ReportageNewsArticle", "BlogPosting"}
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# 在页面开头多少字节内查找 <meta charset>
+CHARSET_SNIFF_BYTES = 4 * 1024
+DEFAULT_CHARSET = "utf-8"
+BOM_CHARSETS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# GB2312 / GBK 页面常混入超出声明字符集的字符，统一按其超集 GB18030 解码
+CHARSET_ALIASES = {"gb2312": "gb18030", "gbk": "gb18030", "x-gbk": "gb18030", "gb_2312-80": "gb18030"}
+HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_RE = re.compile(
+    rb'<meta[^>]+?charset\s*=\s*["\']?\s*([\w.:-]+)',
+    re.IGNORECASE,
+)
+
+
+def collapse_whitespace(text: str) -> str:
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def normalize_charset(label: str) -> Optional[str]:
+    """把 charset 标签规范为 Python 编解码器名；无法识别时返回 None。"""
+    label = (label or "").strip().strip("\"'").lower()
+    if not label:
+        return None
+    label = CHARSET_ALIASES.get(label, label)
+    try:
+        return codecs.lookup(label).name
+    except LookupError:
+        return None
+
+
+def resolve_charset(content_type: str, head: bytes) -> str:
+    """确定页面编码：BOM > 响应头 charset > 前 CHARSET_SNIFF_BYTES 字节内的 <meta charset> > UTF-8。
+
+    同时兼容 <meta charset="gbk"> 与 <meta http-equiv="Content-Type" content="text/html; charset=gbk">。
+    """
+    for bom, charset in BOM_CHARSETS:
+        if head.startswith(bom):
+            return charset
+
+    header_match = HEADER_CHARSET_RE.search(content_type or "")
+    if header_match:
+        charset = normalize_charset(header_match.group(1))
+        if charset:
+            return charset
+
+    meta_match = META_CHARSET_RE.search(head[:CHARSET_SNIFF_BYTES])
+    if meta_match:
+        charset = normalize_charset(meta_match.group(1).decode("ascii", errors="ignore"))
+        # 字节流不可能真是 UTF-16（否则 ASCII 的 <meta> 无法匹配），按 HTML 规范改用 UTF-8
+        if charset and not charset.startswith("utf-16"):
+            return charset
+
+    return DEFAULT_CHARSET
+
+
+def find_json_ld_article(data) -> Dict:
+    """在 JSON-LD 数据（对象、数组或 @graph）中查找第一个新闻类条目。"""
+    if isinstance(data, list):
+        for entry in data:
+            found = find_json_ld_article(entry)
+            if found:
+                return found
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    types = data.get("@type")
+    types = set(types) if isinstance(types, list) else {types}
+    if types & JSON_LD_ARTICLE_TYPES:
+        return data
+    return find_json_ld_article(data.get("@graph", []))
+
+
+class ArticleContextExtractor(HTMLParser):
+    """增量抽取原文上下文：调用方逐段 feed() 已解码的 HTML，done 为 True 时即可停止读取。"""
+
+    def __init__(self, excerpt_limit: int = EXCERPT_LIMIT):
+        super().__init__(convert_charrefs=True)
+        self.excerpt_limit = excerpt_limit
+        self.page_title = ""
+        self.page_h1 = ""
+        self.meta_description = ""
+        self.json_ld_headline = ""
+        self.json_ld_description = ""
+        self.done = False
+        self._skip_depth = 0
+        self._capture = None
+        self._capture_parts: List[str] = []
+        self._json_ld = False
+        self._json_ld_parts: List[str] = []
+        self._text_parts: List[str] = []
+        self._text_chars = 0
+        self._chars_after_excerpt = 0
+
+    def feed(self, data: str) -> bool:
+        """喂入一段 HTML，返回是否已可以停止读取。"""
+        if self.done or not data:
+            return self.done
+        super().feed(data)
+        if self._text_chars >= self.excerpt_limit:
+            self._chars_after_excerpt += len(data)
+            if self.page_h1 or self._chars_after_excerpt >= H1_GRACE_CHARS:
+                self.done = True
+        return self.done
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag in SKIP_TAGS:
+            attrs = dict(attrs)
+            if tag == "script" and (attrs.get("type") or "").strip().lower() == "application/ld+json":
+                self._json_ld = True
+                self._json_ld_parts = []
+            self._skip_depth += 1
+            return
+        if tag == "meta":
+            self._handle_meta(dict(attrs))
+        elif self._skip_depth:
+            return
+        elif tag == "title" and not self.page_title and self._capture is None:
+            self._start_capture("title")
+        elif tag == "h1" and not self.page_h1 and self._capture is None:
+            self._start_capture("h1")
+
+    def handle_startendtag(self, tag, attrs) -> None:
+        if tag == "meta":
+            self._handle_meta(dict(attrs))
+
+    def handle_endtag(self, tag) -> None:
+        if tag in SKIP_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+            if tag == "script" and self._json_ld:
+                self._json_ld = False
+                self._handle_json_ld("".join(self._json_ld_parts))
+            return
+        if tag == self._capture:
+            text = collapse_whitespace("".join(self._capture_parts))[:TITLE_LIMIT]
+            if tag == "title":
+                self.page_title = text
+            else:
+                self.page_h1 = text
+            self._capture = None
+
+    def handle_data(self, data) -> None:
+        if self._skip_depth:
+            if self._json_ld:
+                self._json_ld_parts.append(data)
+            return
+        if self._capture is not None:
+            self._capture_parts.append(data)
+        if self._text_chars < self.excerpt_limit:
+            self._text_parts.append(data)
+            self._text_chars += len(data.strip())
+
+    def _start_capture(self, tag: str) -> None:
+        self._capture = tag
+        self._capture_parts = []
+
+    def _handle_meta(self, attrs: Dict) -> None:
+        name = (attrs.get("name") or attrs.get("property") or "").strip().lower()
+        if name in DESCRIPTION_META_NAMES and not self.meta_description:
+            self.meta_description = collapse_whitespace(attrs.get("content") or "")[:DESCRIPTION_LIMIT]
+
+    def _handle_json_ld(self, raw: str) -> None:
+        if self.json_ld_headline and self.json_ld_description:
+            return
+        try:
+            article = find_json_ld_article(json.loads(raw))
+        except ValueError:
+            return
+        headline = article.get("headline")
+        description = article.get("description")
+        if isinstance(headline, str) and not self.json_ld_headline:
+            self.json_ld_headline = collapse_whitespace(headline)[:TITLE_LIMIT]
+        if isinstance(description, str) and not self.json_ld_description:
+            self.json_ld_description = collapse_whitespace(description)[:DESCRIPTION_LIMIT]
+
+    def context(self) -> Dict[str, str]:
+        """返回 fetch_article_context 的上下文字段；页面缺少 h1 / meta 描述时用 JSON-LD 补齐。"""
+        # 未闭合的 <title> / <h1>（页面被截断）也保留已读到的文字
+        if self._capture is not None:
+            text = collapse_whitespace("".join(self._capture_parts))[:TITLE_LIMIT]
+            if self._capture == "title" and not self.page_title:
+                self.page_title = text
+            elif self._capture == "h1" and not self.page_h1:
+                self.page_h1 = text
+        return {
+            "page_title": self.page_title,
+            "page_h1": self.page_h1 or self.json_ld_headline,
+            "meta_description": self.meta_description or self.json_ld_description,
+            "page_excerpt": collapse_whitespace("".join(self._text_parts))[:self.excerpt_limit],
+        }
+
+
+def extract_article_context(raw_html: str, excerpt_limit: int = EXCERPT_LIMIT) -> Dict[str, str]:
+    """从完整 HTML 中抽取原文上下文。"""
+    extractor = ArticleContextExtractor(excerpt_limit)
+    extractor.feed(raw_html)
+    if not extractor.done:
+        extractor.close()
+    return extractor.context()
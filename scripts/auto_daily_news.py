@@ -12,6 +12,7 @@
 - 试运行模式 (--dry-run)
 - 环境变量 / .env.local 配置 AppID 与 API key
 - 默认启用 TLS 校验，支持显式降级
+- 发布成功后记录入选新闻，之后几天的采集自动剔除已发布过的新闻
 """
 
 import os
@@ -26,6 +27,7 @@ import requests
 
 # 共享工具
 from utils import get_env_var
+from published_store import PublishedStore, published_items
 
 try:
     import certifi
@@ -38,6 +40,8 @@ DOUBAO_API_KEY = get_env_var("DOUBAO_API_KEY", required=False)
 DEEPSEEK_API_KEY = get_env_var("DEEPSEEK_API_KEY", required=False)
 # 从环境变量读取 AppID，默认使用三更AI
 APPID = get_env_var("WECHAT_APP_ID", default="wx5c5f1c55d02d1354", required=False)  # 三更AI
+# 已发布新闻记录保留天数（与 RSS 收集器共用），0 为不记录
+PUBLISHED_STORE_DAYS = max(0, int(get_env_var("PUBLISHED_STORE_DAYS", "3", required=False) or 0))
 
 
 def parse_bool_env(value: str, default: bool = True) -> bool:
@@ -623,6 +627,23 @@ def publish_to_wechat(title, content, cover_url):
         log(f"发布异常: {e}")
         return False
 
+def record_published_news(today_str):
+    """发布成功后把当天入选的新闻记入已发布记录，之后几天的采集会剔除这些新闻"""
+    if not PUBLISHED_STORE_DAYS:
+        return
+    raw_news_file = os.path.join(WORK_DIR, f"raw_news_{today_str}.json")
+    try:
+        with open(raw_news_file, 'r', encoding='utf-8') as f:
+            raw_data = json.load(f)
+    except (OSError, ValueError) as e:
+        log(f"警告:未能读取入选新闻，跳过已发布记录: {e}")
+        return
+
+    store = PublishedStore(retention_days=PUBLISHED_STORE_DAYS)
+    count = store.record(published_items(raw_data.get("categorized_news")))
+    store.save()
+    log(f"已记录 {count} 条已发布新闻（保留 {PUBLISHED_STORE_DAYS} 天）")
+
 def main():
     """主函数"""
     # 解析命令行参数
@@ -749,6 +770,9 @@ def main():
 
     if success:
         log("发布成功！")
+        # 周报汇总的是上周的旧闻，记入后会把周一之后几天日报里的后续报道误剔除
+        if not is_monday:
+            record_published_news(today_str)
 
         # 5. 不再在 CI 中提交回仓库，避免与 .gitignore 冲突导致误报
         log("发布流程完成（已跳过自动 Git 提交）")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+RSS 解析基准：对比线程内解析与进程池解析（RSS_PARSE_WORKERS）的耗时
+用合成的 RSS 内容模拟已下载好的源，不发网络请求。解析受 GIL 限制，线程数增加不会提速；
+条目正文越大、源越多，进程池越划算，小源时进程间传输开销反而使其更慢
+
+用法: python bench_feed_parsing.py --feeds 60 --items 30 --body-kb 8 --workers 4
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from feed_parser import parse_feed_record
+
+
+def build_feed(items: int, body_kb: int, seed: int) -> bytes:
+    now = datetime.now(timezone.utc)
+    body = "<p>" + "正文内容 " * (body_kb * 1024 // 15) + "</p>"
+    entries = "".join(
+        f"<item><title>源 {seed} 新闻 {i}</title><link>https://example.com/{seed}/{i}</link>"
+        f"<description><![CDATA[{body[:600]}]]></description>"
+        f"<content:encoded><![CDATA[{body}]]></content:encoded>"
+        f"<pubDate>{format_datetime(now - timedelta(minutes=10 * i))}</pubDate></item>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<rss xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>'
+        f"<title>基准源 {seed}</title>{entries}</channel></rss>"
+    ).encode("utf-8")
+
+
+def run_threads(feeds, threads: int, limit: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda content: parse_feed_record(content, limit, 24), feeds))
+    return time.perf_counter() - started
+
+
+def run_processes(feeds, workers: int, threads: int, limit: int) -> float:
+    context = multiprocessing.get_context("fork") if sys.platform.startswith("linux") else None
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        # 预热：进程启动成本只在采集开始时付一次，不计入对比
+        list(pool.map(abs, range(workers)))
+        started = time.perf_counter()
+        # 与采集时一致：抓取线程各自把内容交给进程池并等待结果
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda content: pool.submit(parse_feed_record, content, limit, 24).result(), feeds))
+        return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="对比线程内与进程池 RSS 解析耗时")
+    parser.add_argument("--feeds", type=int, default=60, help="源数量")
+    parser.add_argument("--items", type=int, default=30, help="每个源的条目数")
+    parser.add_argument("--body-kb", type=int, nargs="+", default=[1, 8, 32], help="每条正文大小（KB），可给多个")
+    parser.add_argument("--limit", type=int, default=20, help="每个源保留的条目数")
+    parser.add_argument("--threads", type=int, default=12, help="抓取线程数")
+    parser.add_argument("--workers", type=int, default=max(2, (multiprocessing.cpu_count() or 2) - 1), help="解析进程数")
+    parser.add_argument("--rounds", type=int, default=3, help="每组重复次数，取最快一次")
+    args = parser.parse_args()
+
+    print(f"{args.feeds} 个源 × {args.items} 条，线程 {args.threads}，进程 {args.workers}")
+    print(f"{'正文/条':>8} {'源大小':>10} {'线程内':>10} {'进程池':>10} {'加速比':>8}")
+    for body_kb in args.body_kb:
+        feeds = [build_feed(args.items, body_kb, seed) for seed in range(args.feeds)]
+        avg_size = sum(len(feed) for feed in feeds) / len(feeds) / 1024
+        in_thread = min(run_threads(feeds, args.threads, args.limit) for _ in range(args.rounds))
+        pooled = min(run_processes(feeds, args.workers, args.threads, args.limit) for _ in range(args.rounds))
+        print(f"{body_kb:>6}KB {avg_size:>8.0f}KB {in_thread:>9.3f}s {pooled:>9.3f}s {in_thread / pooled:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
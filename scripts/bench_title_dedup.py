@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+标题去重基准：对比逐一比较全部已收录标题（原 is_similar_title 循环）与 MinHash/LSH 索引（exact_limit=0，不经过小规模的逐一比较阶段）
+用合成的中文标题（约 20% 为改写过的近似重复）计时，并核对两者保留的标题是否一致；
+逐一比较耗时随标题数平方增长，超过 --brute-max 条时按已测得的最大规模平方外推（标 ~）
+
+用法: python bench_title_dedup.py --sizes 500 5000 50000
+"""
+
+import argparse
+import random
+import time
+
+from title_dedup import LSH_BANDS, LSH_ROWS, TitleDedupIndex, jaccard_similar
+
+# 常用汉字区段，按 Zipf 分布抽样，模拟真实标题中高频字反复出现
+CHAR_POOL = [chr(code) for code in range(0x4E00, 0x4E00 + 3000)]
+WORDS = ["OpenAI", "英伟达", "发布", "大模型", "芯片", "融资", "亿元", "美联储", "利率", "财报", "苹果", "华为", "小米"]
+
+
+def build_titles(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(CHAR_POOL))]
+    titles = []
+    for _ in range(count):
+        if titles and rng.random() < 0.2:
+            # 近似重复：在已有标题上替换或追加少量字符
+            chars = list(rng.choice(titles))
+            for _ in range(rng.randint(1, 3)):
+                chars[rng.randrange(len(chars))] = rng.choice(CHAR_POOL[:200])
+            if rng.random() < 0.5:
+                chars.append(rng.choice("了的。！"))
+            titles.append("".join(chars))
+            continue
+        words = rng.sample(WORDS, 2) + ["".join(rng.choices(CHAR_POOL, weights, k=rng.randint(4, 8))) for _ in range(2)]
+        rng.shuffle(words)
+        titles.append("".join(words) + "".join(rng.choices(CHAR_POOL, weights, k=rng.randint(4, 10))))
+    return titles
+
+
+def brute_force_dedup(titles):
+    kept = []
+    kept_sets = []
+    for title in titles:
+        chars = frozenset(title)
+        if any(jaccard_similar(chars, existing) for existing in kept_sets):
+            continue
+        kept.append(title)
+        kept_sets.append(chars)
+    return kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="对比逐一比较与 MinHash/LSH 标题去重耗时")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000, 50000], help="标题数量，可给多个")
+    parser.add_argument("--bands", type=int, default=LSH_BANDS, help="LSH 段数")
+    parser.add_argument("--rows", type=int, default=LSH_ROWS, help="每段行数")
+    parser.add_argument("--brute-max", type=int, default=5000, help="逐一比较的最大标题数")
+    args = parser.parse_args()
+
+    print(f"LSH {args.bands} 段 × {args.rows} 行")
+    print(f"{'标题数':>8} {'逐一比较':>10} {'LSH':>10} {'加速比':>8} {'保留':>8} {'差异':>6}")
+    measured = None  # (标题数, 逐一比较耗时)
+    for size in args.sizes:
+        titles = build_titles(size)
+        started = time.perf_counter()
+        # exact_limit=0：从第一条起就走 LSH，测的是分桶本身
+        index = TitleDedupIndex(bands=args.bands, rows=args.rows, exact_limit=0)
+        kept = [title for title in titles if index.add_if_new(title)]
+        lsh_elapsed = time.perf_counter() - started
+
+        if size <= args.brute_max:
+            started = time.perf_counter()
+            expected = brute_force_dedup(titles)
+            brute_elapsed = time.perf_counter() - started
+            measured = (size, brute_elapsed)
+            diff = len(set(kept) ^ set(expected))
+            print(f"{size:>9} {brute_elapsed:>9.2f}s {lsh_elapsed:>9.2f}s {brute_elapsed / lsh_elapsed:>7.1f}x {len(kept):>8} {diff:>6}")
+        elif measured:
+            estimate = measured[1] * (size / measured[0]) ** 2
+            print(f"{size:>9} {'~' + format(estimate, '.0f'):>9}s {lsh_elapsed:>9.2f}s {'~' + format(estimate / lsh_elapsed, '.0f'):>7}x {len(kept):>8} {'-':>6}")
+        else:
+            print(f"{size:>9} {'-':>10} {lsh_elapsed:>9.2f}s {'-':>8} {len(kept):>8} {'-':>6}")
+
+
+if __name__ == "__main__":
+    main()
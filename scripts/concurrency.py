@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+RSS 抓取自适应并发控制
+AIMD（加性增、乘性减）：一轮请求全部成功后并发 +1，遇到超时或 429/5xx 时减半；
+同时限制单个 host 的并发，避免集中压垮同一个 RSSHub 镜像。
+线程池与 asyncio 两种引擎各用一个闸门包装同一个控制器；
+闸门可选接入按 host 的限速器（reserve(host) 返回需等待的秒数），被限速的请求不占并发名额
+"""
+
+import asyncio
+import collections
+import threading
+import time
+from typing import Dict, Optional
+
+
+class AIMDController:
+    """并发窗口的计数逻辑，本身不加锁，由闸门在各自的锁 / 事件循环内调用。"""
+
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 2,
+        maximum: int = 24,
+        per_host: int = 2,
+        decrease_factor: float = 0.5,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.per_host = max(1, per_host)
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.host_in_flight: Dict[str, int] = {}
+        self.peak_limit = self.limit
+        self.lowest_limit = self.limit
+        self.increases = 0
+        self.decreases = 0
+        self._window_successes = 0
+        # 同一窗口内的多个拥塞信号只减一次，避免一批并发超时把窗口压到最低
+        self._completions = 0
+        self._last_decrease_at = None
+        self.host_stats: Dict[str, Dict] = {}
+
+    def can_start(self, host: str) -> bool:
+        return self.in_flight < self.limit and self.host_in_flight.get(host, 0) < self.per_host
+
+    def started(self, host: str, waited: float) -> None:
+        self.in_flight += 1
+        self.host_in_flight[host] = self.host_in_flight.get(host, 0) + 1
+        stats = self.host_stats.setdefault(host, {"requests": 0, "congested": 0, "total_wait": 0.0, "max_wait": 0.0})
+        stats["requests"] += 1
+        stats["total_wait"] += waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+
+    def finished(self, host: str, congested: bool) -> None:
+        self.in_flight -= 1
+        self.host_in_flight[host] -= 1
+        self._completions += 1
+
+        if congested:
+            self.host_stats[host]["congested"] += 1
+            self._window_successes = 0
+            if self._last_decrease_at is None or self._completions - self._last_decrease_at > self.limit:
+                self.limit = max(self.minimum, int(self.limit * self.decrease_factor))
+                self.lowest_limit = min(self.lowest_limit, self.limit)
+                self.decreases += 1
+                self._last_decrease_at = self._completions
+            return
+
+        self._window_successes += 1
+        if self._window_successes >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self.peak_limit = max(self.peak_limit, self.limit)
+            self.increases += 1
+            self._window_successes = 0
+
+    def snapshot(self) -> Dict:
+        """本次采集的并发报告：最终 / 峰值 / 最低并发，以及各 host 的排队等待。"""
+        hosts = {}
+        for host, stats in sorted(self.host_stats.items()):
+            hosts[host] = {
+                "requests": stats["requests"],
+                "congested": stats["congested"],
+                "total_wait": round(stats["total_wait"], 3),
+                "avg_wait": round(stats["total_wait"] / stats["requests"], 3) if stats["requests"] else 0.0,
+                "max_wait": round(stats["max_wait"], 3),
+            }
+        return {
+            "final_limit": self.limit,
+            "peak_limit": self.peak_limit,
+            "lowest_limit": self.lowest_limit,
+            "max_limit": self.maximum,
+            "per_host_limit": self.per_host,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "hosts": hosts,
+        }
+
+
+class ThreadConcurrencyGate:
+    """线程池引擎的闸门：超出并发窗口、host 上限或 host 限速的请求在条件变量上排队。"""
+
+    def __init__(self, controller: AIMDController, limiter=None):
+        self.controller = controller
+        self.limiter = limiter
+        self._cond = threading.Condition()
+
+    def acquire(self, host: str, cancel: Optional[threading.Event] = None) -> Optional[float]:
+        """等到名额后返回排队秒数；cancel 在排队期间被置位时不占名额、不取令牌，返回 None。"""
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                if cancel is not None and cancel.is_set():
+                    return None
+                if not self.controller.can_start(host):
+                    self._cond.wait()
+                    continue
+                delay = self.limiter.reserve(host) if self.limiter else 0.0
+                if delay <= 0:
+                    break
+                # 该 host 被限速：不占用并发名额，到点或有请求结束时重新检查
+                self._cond.wait(timeout=delay)
+            waited = time.monotonic() - started
+            self.controller.started(host, waited)
+        return waited
+
+    def release(self, host: str, congested: bool) -> None:
+        with self._cond:
+            self.controller.finished(host, congested)
+            self._cond.notify_all()
+
+    def wake(self) -> None:
+        """唤醒全部排队者重新检查条件（置位 cancel 后调用，让被取消的请求尽快离开队列）。"""
+        with self._cond:
+            self._cond.notify_all()
+
+
+class AsyncConcurrencyGate:
+    """asyncio 引擎的闸门：事件循环单线程，无需加锁；release 为同步方法，任务被取消时也能在 finally 中安全归还。"""
+
+    def __init__(self, controller: AIMDController, limiter=None):
+        self.controller = controller
+        self.limiter = limiter
+        self._waiters = collections.deque()
+
+    async def acquire(self, host: str) -> float:
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        while True:
+            if self.controller.can_start(host):
+                delay = self.limiter.reserve(host) if self.limiter else 0.0
+                if delay <= 0:
+                    break
+                # 该 host 被限速：只挂起当前任务，其他 host 的任务照常运行
+                await asyncio.sleep(delay)
+                continue
+            waiter = loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        waited = time.monotonic() - started
+        self.controller.started(host, waited)
+        return waited
+
+    def release(self, host: str, congested: bool) -> None:
+        self.controller.finished(host, congested)
+        # 唤醒全部等待者各自重新检查条件（并发窗口可能变大，也可能只有某个 host 空出名额）
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
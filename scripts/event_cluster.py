@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+事件聚类
+按标题中的实体（公司/机构名、股票代码，中英文别名归一）、型号（GPT-5、iPhone 17）与数值
+（5万亿美元 = $5 trillion、20% = 20 percent）把报道同一事件的候选归为一组，中英文标题也能对上；
+只共享实体与数值时，同语言标题另需字面相似，跨语言标题需数值完全一致。发布时间相差超过窗口的不归为同一事件。
+每组保留一条代表，event_size 记录报道条数，其余报道挂在代表的 event_members 上
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+EVENT_WINDOW_HOURS = 36
+# 无共同型号、只共享实体与数值的同语言标题，词级 Jaccard（中文按字、英文按词）至少为此值才算同一事件
+EVENT_TITLE_SIMILARITY = 0.35
+
+# 规范名 → 中英文名称与股票代码（英文按词边界、忽略大小写匹配）
+ENTITY_ALIASES = {
+    "openai": ("OpenAI", "ChatGPT"),
+    "anthropic": ("Anthropic", "Claude"),
+    "google": ("Google", "Alphabet", "谷歌", "GOOG", "GOOGL"),
+    "deepmind": ("DeepMind",),
+    "microsoft": ("Microsoft", "微软", "MSFT"),
+    "apple": ("Apple", "苹果", "AAPL"),
+    "nvidia": ("Nvidia", "英伟达", "NVDA"),
+    "amd": ("AMD", "超威"),
+    "intel": ("Intel", "英特尔", "INTC"),
+    "meta": ("Meta", "Facebook", "脸书"),
+    "amazon": ("Amazon", "亚马逊", "AMZN", "AWS"),
+    "tesla": ("Tesla", "特斯拉", "TSLA"),
+    "xai": ("xAI",),
+    "spacex": ("SpaceX",),
+    "tsmc": ("TSMC", "台积电"),
+    "samsung": ("Samsung", "三星"),
+    "qualcomm": ("Qualcomm", "高通"),
+    "arm": ("Arm Holdings", "安谋"),
+    "broadcom": ("Broadcom", "博通", "AVGO"),
+    "oracle": ("Oracle", "甲骨文", "ORCL"),
+    "netflix": ("Netflix", "奈飞", "网飞", "NFLX"),
+    "alibaba": ("Alibaba", "阿里巴巴", "阿里", "BABA"),
+    "tencent": ("Tencent", "腾讯"),
+    "bytedance": ("ByteDance", "字节跳动", "字节", "TikTok"),
+    "baidu": ("Baidu", "百度", "BIDU"),
+    "huawei": ("Huawei", "华为"),
+    "xiaomi": ("Xiaomi", "小米"),
+    "byd": ("BYD", "比亚迪"),
+    "catl": ("CATL", "宁德时代"),
+    "jd": ("JD.com", "京东"),
+    "pdd": ("Pinduoduo", "拼多多", "Temu", "PDD"),
+    "meituan": ("Meituan", "美团"),
+    "deepseek": ("DeepSeek", "深度求索"),
+    "moonshot": ("Moonshot AI", "月之暗面", "Kimi"),
+    "zhipu": ("Zhipu", "智谱"),
+    "mistral": ("Mistral",),
+    "fed": ("Federal Reserve", "Fed", "美联储"),
+    "pboc": ("PBOC", "People's Bank of China", "中国人民银行", "央行"),
+    "ecb": ("ECB", "European Central Bank", "欧洲央行"),
+    "bitcoin": ("Bitcoin", "比特币", "BTC"),
+    "ethereum": ("Ethereum", "以太坊", "ETH"),
+    "gold": ("gold price", "金价", "黄金"),
+    "oil": ("crude oil", "oil prices", "原油", "油价"),
+}
+
+# 全大写缩写中的通用词，不作为实体
+GENERIC_ACRONYMS = {
+    "AI", "AGI", "LLM", "GPU", "CPU", "NPU", "API", "CEO", "CFO", "CTO", "IPO", "ETF", "GDP", "CPI", "PPI",
+    "US", "USA", "UK", "EU", "UN", "IT", "PC", "TV", "VR", "AR", "XR", "EV", "SEC", "FDA", "FTC", "DOJ",
+    "NEW", "THE", "AND", "FOR", "LIVE", "BREAKING", "UPDATE", "WATCH", "OK", "VS", "AM", "PM",
+}
+# 型号前的英文词与数字以空格分隔时（"Gemma 4"）才算型号；这些词后接数字不是型号
+MODEL_STOPWORDS = {
+    "a", "an", "the", "to", "of", "in", "on", "at", "by", "for", "from", "with", "and", "or", "over", "than",
+    "up", "down", "top", "about", "nearly", "only", "first", "worth", "after", "before", "since", "hits",
+    "tops", "hit", "reach", "reaches", "raises", "raise", "cuts", "cut", "adds", "add", "lays", "off", "is", "are",
+}
+
+MULTIPLIERS = {
+    "千": 1e3, "万": 1e4, "亿": 1e8, "万亿": 1e12,
+    "k": 1e3, "thousand": 1e3, "m": 1e6, "mn": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9, "t": 1e12, "tn": 1e12, "trillion": 1e12,
+}
+PERCENT_UNITS = {"%", "％", "percent"}
+POINT_UNITS = {"个百分点", "percentage point", "percentage points"}
+NUMBER_UNITS = "万亿|亿|万|千|trillion|billion|million|thousand|percentage points?|percent|个百分点|tn|bn|mn|%|％|[tbmk](?![a-z])"
+
+MODEL_RE = re.compile(
+    r"(?<![A-Za-z0-9])([A-Za-z][A-Za-z]{0,11})(-|\s)?(\d+(?:\.\d+)?)([A-Za-z]{0,3})(?![A-Za-z0-9.%％])"
+    rf"(?!\s*(?:{NUMBER_UNITS}))",
+    re.IGNORECASE,
+)
+NUMBER_RE = re.compile(
+    rf"(?<![A-Za-z0-9.])((?:US)?[$€£¥])?\s*(\d+(?:,\d{{3}})*(?:\.\d+)?)\s*({NUMBER_UNITS})?", re.IGNORECASE
+)
+ACRONYM_RE = re.compile(r"(?<![A-Za-z0-9])[A-Z]{2,6}(?![A-Za-z0-9])")
+CHINESE_RE = re.compile(r"[\u4e00-\u9fa5]")
+TITLE_TOKEN_RE = re.compile(r"[\u4e00-\u9fa5]|[a-z0-9]+")
+
+
+def build_alias_pattern(aliases: Dict[str, Iterable[str]]):
+    """所有别名合成一个正则（长名优先），返回 (pattern, 小写别名 → 规范名)。"""
+    lookup = {name.lower(): canonical for canonical, names in aliases.items() for name in names}
+    parts = []
+    for name in sorted(lookup, key=len, reverse=True):
+        escaped = re.escape(name)
+        parts.append(rf"(?<![a-z0-9]){escaped}(?![a-z0-9])" if name.isascii() else escaped)
+    return re.compile("|".join(parts)), lookup
+
+
+ALIAS_RE, ALIAS_LOOKUP = build_alias_pattern(ENTITY_ALIASES)
+
+
+def format_number(value: float, unit: str, currency: str = "") -> Optional[str]:
+    """数值特征：带倍数单位的换算成绝对值，百分比与百分点单独标记；无单位的只保留两位以上且不像年份的数。
+
+    单字母后缀（235B、7b、1T）不带货币符号时多是模型参数量或容量，原样标记，不换算成金额。
+    """
+    unit = (unit or "").lower()
+    if unit in PERCENT_UNITS:
+        return f"{value:g}%"
+    if unit in POINT_UNITS:
+        return f"{value:g}pp"
+    if len(unit) == 1 and unit.isascii() and not currency:
+        return f"{value:g}{unit}"
+    if unit in MULTIPLIERS:
+        return f"{value * MULTIPLIERS[unit]:.3g}"
+    if value < 10 or (value.is_integer() and 1900 <= value <= 2100):
+        return None
+    return f"{value:.3g}"
+
+
+def extract_event_features(title: str) -> FrozenSet[str]:
+    """标题的事件特征：e: 实体，m: 型号，n: 数值。"""
+    features = set()
+    for match in ALIAS_RE.finditer(title.lower()):
+        features.add(f"e:{ALIAS_LOOKUP[match.group()]}")
+
+    def take_model(match) -> str:
+        word, separator = match.group(1), match.group(2)
+        if separator and separator.isspace() and (word.lower() in MODEL_STOPWORDS or word.islower()):
+            return match.group()
+        if word.upper() in GENERIC_ACRONYMS:
+            return match.group()
+        features.add(f"m:{word.lower()}{match.group(3)}{match.group(4).lower()}")
+        return " "
+
+    # 型号先取出，GPT-5 中的 GPT 不再按缩写计入实体，5 也不再按数值计入
+    remainder = MODEL_RE.sub(take_model, title)
+    for match in ACRONYM_RE.finditer(remainder):
+        acronym = match.group()
+        if acronym not in GENERIC_ACRONYMS:
+            features.add(f"e:{ALIAS_LOOKUP.get(acronym.lower(), acronym.lower())}")
+    for match in NUMBER_RE.finditer(remainder):
+        number = format_number(float(match.group(2).replace(",", "")), match.group(3), match.group(1))
+        if number:
+            features.add(f"n:{number}")
+    return frozenset(features)
+
+
+def title_tokens(title: str) -> FrozenSet[str]:
+    """标题相似度的比较单位：中文按字，英文与数字按词。"""
+    return frozenset(TITLE_TOKEN_RE.findall(title.lower()))
+
+
+def is_same_event(features_a: FrozenSet[str], features_b: FrozenSet[str], title_a: str, title_b: str) -> bool:
+    """两条报道是否为同一事件。
+
+    共享型号时再共享任一特征即可；否则须共享实体与数值，且双方都未提到型号（型号不同即不同产品）。
+    只共享实体与数值时：同语言标题词级 Jaccard 不低于 EVENT_TITLE_SIMILARITY；
+    跨语言标题无法比较字面，要求双方数值完全一致且不只有百分比（涨跌 3% 之类太常见）。
+    """
+    shared = features_a & features_b
+    if any(feature.startswith("m:") for feature in shared):
+        return len(shared) >= 2
+    if not any(feature.startswith("e:") for feature in shared) or not any(feature.startswith("n:") for feature in shared):
+        return False
+    if any(feature.startswith("m:") for feature in features_a | features_b):
+        return False
+    if bool(CHINESE_RE.search(title_a)) == bool(CHINESE_RE.search(title_b)):
+        tokens_a, tokens_b = title_tokens(title_a), title_tokens(title_b)
+        return len(tokens_a & tokens_b) / len(tokens_a | tokens_b) >= EVENT_TITLE_SIMILARITY
+    numbers_a = {feature for feature in features_a if feature.startswith("n:")}
+    numbers_b = {feature for feature in features_b if feature.startswith("n:")}
+    return numbers_a == numbers_b and any(not feature.endswith(("%", "pp")) for feature in numbers_a)
+
+
+def parse_item_time(item: Dict) -> Optional[datetime]:
+    try:
+        return datetime.strptime(item.get("parsed_time", ""), "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return None
+
+
+def cluster_events(items: List[Dict], window_hours: float = EVENT_WINDOW_HOURS) -> List[List[Dict]]:
+    """把条目分组为事件，组内与组间都保持输入顺序。
+
+    每组以最早出现的条目为种子，后续条目只与各组种子比较（特征倒排索引只取至少共享一个特征的种子），
+    满足 is_same_event 且发布时间相差不超过 window_hours（缺少时间的不限）时并入最早的那一组；
+    不与组内其他成员比较，避免 A≈B、B≈C 把不相干的 A 与 C 串成一组。
+    """
+    times = [parse_item_time(item) for item in items]
+    window_seconds = window_hours * 3600
+    seed_postings: Dict[str, List[int]] = {}
+    seed_features: Dict[int, FrozenSet[str]] = {}
+    groups: Dict[int, List[Dict]] = {}
+    for index, item in enumerate(items):
+        title = item.get("title", "")
+        features = extract_event_features(title)
+        candidates = sorted({seed for feature in features for seed in seed_postings.get(feature, ())})
+        for seed in candidates:
+            if times[index] and times[seed] and abs((times[index] - times[seed]).total_seconds()) > window_seconds:
+                continue
+            if is_same_event(features, seed_features[seed], title, items[seed].get("title", "")):
+                groups[seed].append(item)
+                break
+        else:
+            groups[index] = [item]
+            seed_features[index] = features
+            for feature in features:
+                seed_postings.setdefault(feature, []).append(index)
+    return list(groups.values())
+
+
+def collapse_events(items: List[Dict], window_hours: float = EVENT_WINDOW_HOURS) -> List[Dict]:
+    """每个事件保留一条代表（优先中文标题，其次最早出现的），写入 event_size 与 event_sources；
+    同组其余报道按输入顺序存入代表的 event_members，不丢弃，供候选不足时作后备。"""
+    representatives = []
+    for group in cluster_events(items, window_hours):
+        representative = next((item for item in group if CHINESE_RE.search(item.get("title", ""))), group[0])
+        representative["event_size"] = len(group)
+        representative["event_sources"] = list(dict.fromkeys(item.get("rss_source", "") for item in group if item.get("rss_source")))
+        representative["event_members"] = [item for item in group if item is not representative]
+        representatives.append(representative)
+    return representatives
+
+
+def expand_event_members(events: List[Dict]) -> List[Dict]:
+    """把代表展开回原有报道：每个代表之后紧跟它的 event_members。"""
+    return [item for event in events for item in (event, *event.get("event_members", ()))]
+
+
+def event_index(events: List[Dict]) -> Dict[int, int]:
+    """id(报道) → id(所属事件的代表)，从展开后的候选中挑选时用来保证每个事件只取一条。"""
+    return {id(item): id(event) for event in events for item in (event, *event.get("event_members", ()))}
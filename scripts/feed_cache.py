@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+RSS 条件请求缓存
+按 URL 持久化 ETag / Last-Modified 与解析后的条目，重跑时通过 304 直接复用；
+条目是按当时的条数上限与时间窗口解析的，本次要得更多时不能复用，改发不带条件头的普通请求
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from utils import WORK_DIR
+
+FEED_CACHE_DIR = os.path.join(WORK_DIR, "cache", "feeds")
+# 周报窗口为 7 天，缓存保留略长于一周即可
+FEED_CACHE_MAX_AGE_HOURS = 8 * 24
+
+
+def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+    """根据缓存条目生成条件请求头。"""
+    headers = {}
+    if not entry:
+        return headers
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+class FeedCache:
+    """每个 URL 一个 JSON 文件的磁盘缓存，写入采用临时文件 + 原子替换，可被多线程并发使用。"""
+
+    def __init__(self, cache_dir: str = FEED_CACHE_DIR, max_age_hours: float = FEED_CACHE_MAX_AGE_HOURS):
+        self.cache_dir = cache_dir
+        self.max_age_seconds = max_age_hours * 3600
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def lookup(self, url: str, hours_ago: int, limit: int) -> Optional[Dict]:
+        """返回可用于条件请求的缓存条目。
+
+        缓存过期、没有校验器，或缓存时的时间窗口 / 条数上限比本次更小（如日报缓存用于周报）时视为未命中：
+        304 只说明源没变，缓存里却少了本次需要的条目。
+        """
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or entry.get("url") != url:
+            return None
+        if time.time() - entry.get("stored_at", 0) > self.max_age_seconds:
+            return None
+        if entry.get("hours_ago", 0) < hours_ago or entry.get("limit", 0) < limit:
+            return None
+        if not entry.get("etag") and not entry.get("last_modified"):
+            return None
+        return entry
+
+    def store(self, url: str, etag: str, last_modified: str, items: List[Dict], hours_ago: int, limit: int) -> None:
+        """保存校验器和条目；服务端未返回任何校验器时无需缓存。"""
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            "url": url,
+            "etag": etag or "",
+            "last_modified": last_modified or "",
+            "hours_ago": hours_ago,
+            "limit": limit,
+            "stored_at": time.time(),
+            "items": items,
+        }
+
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(url))
+        except (OSError, TypeError, ValueError):
+            # 缓存写入失败不影响本次采集
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+RSS/Atom 流式解析
+基于 XMLPullParser 边下载边解析：先检查发布时间再抽取正文，
+凑够 limit 条窗口内新闻或连续遇到过期条目后即停止读取；
+XML 损坏时删除控制字节并逐个抢救完好的 <item>/<entry> 片段；
+parse_feed_record() 为模块级函数，可交给进程池在工作进程中解析
+"""
+
+import html as html_module
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from collections import Counter, deque
+from typing import Dict, List, Optional
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+FEEDBURNER_NS = "{http://rssnamespace.org/feedburner/ext/1.0}"
+
+ITEM_TAGS = ("item", f"{ATOM_NS}entry")
+TITLE_TAGS = ("title", f"{ATOM_NS}title")
+DESC_PATHS = (f"{CONTENT_NS}encoded", "description", f"{ATOM_NS}summary", "content", f"{ATOM_NS}content")
+# feedburner 代理的源在 <feedburner:origLink> 中给出原文地址，优先于跳转链接
+LINK_PATHS = (f"{FEEDBURNER_NS}origLink", "link", f"{ATOM_NS}link")
+DATE_PATHS = ("pubDate", f"{ATOM_NS}published", f"{ATOM_NS}updated", "date")
+
+# 连续多少条过期条目后停止读取（多数 feed 按时间倒序，容忍少量置顶或乱序条目）
+STALE_RUN_LIMIT = 3
+# 一次性解析完整内容时每次喂给解析器的字节数，凑够条目后剩余内容不再解析
+PARSE_CHUNK_SIZE = 16 * 1024
+# 解析出错时片段级修复所需的内容：开头（xmlns 声明与频道标题）与最近读取的一段，其余已解析的内容不再保留
+SALVAGE_HEAD_BYTES = 64 * 1024
+SALVAGE_TAIL_BYTES = 256 * 1024
+
+CDATA_OPEN = '<![CDATA['
+CDATA_CLOSE = ']]>'
+TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+# 与 html.unescape 内部使用的实体模式一致；ENTITY_PREFIXES 为还可能被后续文本补全的不完整开头
+ENTITY_RE = re.compile(r'&(#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)')
+ENTITY_PREFIXES = ('&', '&#', '&#x', '&#X')
+CLEAN_CACHE_SIZE = 4096
+SUMMARY_LIMIT = 500
+
+
+def _cdata_segments(raw_text: str):
+    """逐段产出去掉 CDATA 包裹后的文本，与整体替换 <![CDATA[...]]> 等价。"""
+    pos = 0
+    while True:
+        start = raw_text.find(CDATA_OPEN, pos)
+        if start < 0:
+            break
+        end = raw_text.find(CDATA_CLOSE, start + len(CDATA_OPEN))
+        if end < 0:
+            break
+        yield raw_text[pos:start]
+        yield raw_text[start + len(CDATA_OPEN):end]
+        pos = end + len(CDATA_CLOSE)
+    yield raw_text[pos:]
+
+
+def _strip_tags(segments):
+    """逐段删除 <...> 标签，与对拼接后的文本做 re.sub(r'<[^>]+>', '') 等价（标签可跨段）。"""
+    pending = None  # 尚未遇到 '>' 的 '<' 之后的内容
+    for segment in segments:
+        pos = 0
+        if pending is not None:
+            close = segment.find('>')
+            if close < 0:
+                pending.append(segment)
+                continue
+            if close or any(pending):
+                pos = close + 1
+            else:
+                yield '<'  # "<>" 不是标签
+            pending = None
+        for match in TAG_RE.finditer(segment, pos):
+            if match.start() > pos:
+                yield segment[pos:match.start()]
+            pos = match.end()
+        tail = segment[pos:]
+        open_at = tail.find('<', tail.rfind('>') + 1)
+        if open_at < 0:
+            if tail:
+                yield tail
+        else:
+            if open_at:
+                yield tail[:open_at]
+            pending = [tail[open_at + 1:]]
+    if pending is not None:
+        # 直到结尾都没有 '>'，'<' 按普通字符保留
+        yield '<' + ''.join(pending)
+
+
+def _unescape_pieces(pieces):
+    """逐段反转义 HTML 实体；末尾可能被下一段补全的实体留到下一段一起处理。"""
+    carry = ''
+    for piece in pieces:
+        text = carry + piece
+        carry = ''
+        amp = text.rfind('&')
+        if amp >= 0:
+            match = ENTITY_RE.match(text, amp)
+            if (match.end() == len(text)) if match else text[amp:] in ENTITY_PREFIXES:
+                carry = text[amp:]
+                text = text[:amp]
+        if text:
+            yield html_module.unescape(text)
+    if carry:
+        yield html_module.unescape(carry)
+
+
+def clean_html_content(raw_text, limit: Optional[int] = None) -> str:
+    """清洗 HTML 内容：移除 CDATA、HTML标签、转义字符、多余空白
+
+    单遍逐段处理，结果与依次整体执行上述四步相同；给定 limit 时返回清洗结果的前 limit 个字符，
+    产出足够的文本后即停止处理剩余内容。
+    """
+    if not raw_text:
+        return ''
+    parts = []
+    size = 0
+    trailing_space = True  # 开头的空白直接丢弃
+    for piece in _unescape_pieces(_strip_tags(_cdata_segments(raw_text))):
+        piece = WHITESPACE_RE.sub(' ', piece)
+        if trailing_space and piece.startswith(' '):
+            piece = piece[1:]
+        if not piece:
+            continue
+        parts.append(piece)
+        size += len(piece)
+        trailing_space = piece.endswith(' ')
+        # 多取两个字符：连续空白已合并，第 limit 个字符之后必有非空白字符，截断处不受末尾 strip 影响
+        if limit is not None and size >= limit + 2:
+            break
+    text = ''.join(parts).rstrip(' ')
+    return text if limit is None else text[:limit]
+
+
+@lru_cache(maxsize=CLEAN_CACHE_SIZE)
+def clean_html_cached(raw_text: str) -> str:
+    """带缓存的 clean_html_content，供标题、主体候选等短文本在改写与校验中反复清洗。"""
+    return clean_html_content(raw_text)
+
+
+def parse_feed_datetime(date_text: str) -> datetime:
+    """解析 RSS/Atom 中常见的发布时间格式。"""
+    if not date_text:
+        raise ValueError("empty date")
+
+    normalized = date_text.strip()
+
+    # 优先兼容 RFC 2822 / RFC 822 风格时间。
+    try:
+        return parsedate_to_datetime(normalized)
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    # 再兼容 ISO 8601，例如 2026-04-04T15:12:06Z。
+    iso_candidate = normalized.replace("Z", "+00:00")
+    try:
+        return datetime.fromisoformat(iso_candidate)
+    except ValueError:
+        pass
+
+    # 补充少数 feed 使用的 UTC 文本后缀。
+    if normalized.endswith(" UTC"):
+        try:
+            return datetime.fromisoformat(normalized[:-4] + "+00:00")
+        except ValueError:
+            pass
+
+    raise ValueError(f"unsupported date format: {date_text}")
+
+
+def find_text(elem, paths) -> str:
+    """按候选路径顺序返回第一个非空子元素文本。"""
+    for path in paths:
+        child = elem.find(path)
+        if child is not None and child.text:
+            return child.text
+    return ''
+
+
+def find_link(elem) -> str:
+    """链接：Atom 取 href 属性，RSS 取文本。"""
+    for path in LINK_PATHS:
+        link_elem = elem.find(path)
+        if link_elem is not None:
+            link_text = link_elem.get('href', '') or (link_elem.text if link_elem.text else '')
+            if link_text:
+                return link_text
+    return ''
+
+
+# XML 1.0 不允许的 C0 控制字节（保留 \t \n \r），用 bytes.translate 一次性删除
+CONTROL_BYTES = bytes(c for c in range(32) if c not in (9, 10, 13))
+ITEM_FRAGMENT_RE = re.compile(rb'<(item|entry)\b[^>]*>.*?</\1\s*>', re.DOTALL)
+ITEM_START_RE = re.compile(rb'<(?:item|entry)\b')
+XML_DECL_RE = re.compile(rb'^\s*<\?xml[^>]*\?>')
+XMLNS_RE = re.compile(rb'\sxmlns(?::[\w.-]+)?\s*=\s*(?:"[^"]*"|\'[^\']*\')')
+FEED_TITLE_RE = re.compile(rb'<title\b[^>]*>.*?</title\s*>', re.DOTALL)
+
+
+def strip_control_bytes(content: bytes) -> bytes:
+    """删除非法控制字节。"""
+    return content.translate(None, CONTROL_BYTES)
+
+
+def salvage_feed_fragments(content: bytes):
+    """从损坏的 feed 中逐个抽取条目片段，各自独立解析。
+
+    返回 (频道标题, 可解析的条目元素列表, 丢弃的片段数)；没有任何条目片段时返回 None。
+    片段外包一层携带原文档 xmlns 声明的根元素，保证 Atom / content: 等命名空间照常解析。
+    """
+    content = strip_control_bytes(content)
+    first = ITEM_FRAGMENT_RE.search(content)
+    if first is None:
+        return None
+
+    head = content[:first.start()]
+    decl_match = XML_DECL_RE.match(head)
+    decl = decl_match.group(0).strip() if decl_match else b''
+    namespaces = {}
+    for match in XMLNS_RE.finditer(head):
+        name = match.group(0).split(b'=', 1)[0].strip()
+        namespaces.setdefault(name, match.group(0))
+    opening = decl + b'<recovered' + b''.join(namespaces.values()) + b'>'
+
+    feed_title = ''
+    title_match = FEED_TITLE_RE.search(head)
+    if title_match:
+        try:
+            feed_title = ET.fromstring(opening + title_match.group(0) + b'</recovered>')[0].text or ''
+        except ET.ParseError:
+            feed_title = ''
+
+    elements = []
+    dropped = 0
+    for match in ITEM_FRAGMENT_RE.finditer(content, first.start()):
+        try:
+            elements.append(ET.fromstring(opening + match.group(0) + b'</recovered>')[0])
+        except ET.ParseError:
+            dropped += 1
+    return feed_title, elements, dropped
+
+
+class FeedStreamParser:
+    """增量解析 RSS/Atom：调用方逐块 feed() 下载内容，done 为 True 时即可停止读取。
+
+    每个条目闭合后先判断发布时间，窗口外或缺少时间的条目直接丢弃，不做正文清洗；
+    处理完的条目立即 clear()。为损坏 XML 的片段级修复只保留开头 SALVAGE_HEAD_BYTES 与最近
+    SALVAGE_TAIL_BYTES 字节，正常解析时内存占用不随 feed 大小增长；出错之后读到的内容全部保留
+    （仍受 max_bytes 限制），出错前已解析出的条目直接沿用。
+    """
+
+    def __init__(self, limit: int = 10, hours_ago: int = 24, now: datetime = None, max_bytes: int = None):
+        self.limit = limit
+        self.max_bytes = max_bytes
+        self.max_scan = limit * 2
+        self.cutoff = (now or datetime.now().astimezone()) - timedelta(hours=hours_ago)
+        self.items: List[Dict] = []
+        self.scanned = 0
+        self.stale_run = 0
+        self.bytes_read = 0
+        self.done = False
+        self.failed = False
+        # 达到 max_bytes 后停止读取，只保留已完整解析的条目
+        self.truncated = False
+        # 走了损坏 XML 修复路径；dropped 为修复时无法解析而丢弃的条目片段数
+        self.recovered = False
+        self.dropped = 0
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._depth_in_item = 0
+        self._feed_title = ''
+        self._first_title = ''
+        # 仅在解析出错时用于片段级修复：开头、最近一段（_gap 表示两者之间有内容已丢弃）与出错后的全部内容
+        self._head = b''
+        self._tail = deque()
+        self._tail_bytes = 0
+        self._gap = False
+        self._after: List[bytes] = []
+        # 已检查过的条目（标题, 链接）计数，修复时每个出错前已处理的条目只跳过一次
+        self._seen = Counter()
+
+    @property
+    def buffered_bytes(self) -> int:
+        """当前为修复保留的字节数。"""
+        return len(self._head) + self._tail_bytes + sum(len(chunk) for chunk in self._after)
+
+    def feed(self, chunk: bytes) -> bool:
+        """喂入一段字节，返回是否已可以停止读取。"""
+        if self.done or not chunk:
+            return self.done
+        self.bytes_read += len(chunk)
+        if self.failed:
+            self._after.append(chunk)
+        else:
+            self._retain(chunk)
+            try:
+                self._parser.feed(chunk)
+                self._drain()
+            except ET.ParseError:
+                self.failed = True
+        # 解析出错后仍继续读取供修复使用，同样受 max_bytes 限制
+        if not self.done and self.max_bytes and self.bytes_read >= self.max_bytes:
+            self.done = True
+            self.truncated = True
+        return self.done
+
+    def close(self) -> Optional[List[Dict]]:
+        """结束解析，返回窗口内条目；XML 无法解析时返回 None。"""
+        if not self.done and not self.failed:
+            try:
+                self._parser.close()
+                self._drain()
+            except ET.ParseError:
+                self.failed = True
+
+        if self.failed:
+            return self._recover()
+        return self._finalize()
+
+    def record(self) -> Dict:
+        """结束解析并返回紧凑的结果记录（只含基本类型，可跨进程传递）；items 为 None 表示无法解析。"""
+        items = self.close()
+        return {
+            "items": items,
+            "bytes": self.bytes_read,
+            "truncated": self.truncated,
+            "recovered": self.recovered,
+            "dropped": self.dropped,
+        }
+
+    def _retain(self, chunk: bytes) -> None:
+        if len(self._head) < SALVAGE_HEAD_BYTES:
+            take = SALVAGE_HEAD_BYTES - len(self._head)
+            self._head += chunk[:take]
+            chunk = chunk[take:]
+        if not chunk:
+            return
+        self._tail.append(chunk)
+        self._tail_bytes += len(chunk)
+        while self._tail_bytes - len(self._tail[0]) >= SALVAGE_TAIL_BYTES:
+            self._tail_bytes -= len(self._tail.popleft())
+            self._gap = True
+
+    def _release(self) -> bytes:
+        """取出修复用的内容并清空缓冲。中间有丢弃时开头只留到第一个条目之前，避免与最近一段拼出残缺片段。"""
+        head = self._head
+        if self._gap:
+            first_item = ITEM_START_RE.search(head)
+            head = head[:first_item.start()] if first_item else head
+        content = head + b''.join(self._tail) + b''.join(self._after)
+        self._head, self._tail, self._tail_bytes, self._after = b'', deque(), 0, []
+        return content
+
+    def _drain(self) -> None:
+        for event, elem in self._parser.read_events():
+            if self.done:
+                continue
+            if elem.tag in ITEM_TAGS:
+                if event == "start":
+                    self._depth_in_item += 1
+                    continue
+                self._depth_in_item -= 1
+                self._handle_item(elem)
+                elem.clear()
+            elif event == "end" and elem.tag in TITLE_TAGS:
+                if elem.text and not self._first_title:
+                    self._first_title = elem.text
+                if elem.text and not self._depth_in_item and not self._feed_title:
+                    self._feed_title = elem.text
+
+    def _handle_item(self, elem) -> None:
+        self.scanned += 1
+        self._seen[(find_text(elem, TITLE_TAGS), find_link(elem))] += 1
+
+        # 先看时间：没有发布时间、格式无法解析或不在窗口内的条目直接跳过
+        pub_text = find_text(elem, DATE_PATHS)
+        pub_time_local = None
+        if pub_text:
+            try:
+                pub_time_local = parse_feed_datetime(pub_text).astimezone()
+            except Exception:
+                pub_time_local = None
+
+        if pub_time_local is not None and pub_time_local < self.cutoff:
+            self.stale_run += 1
+        elif pub_time_local is not None:
+            self.stale_run = 0
+            self.items.append(self._build_item(elem, pub_text, pub_time_local))
+
+        if (
+            len(self.items) >= self.limit
+            or self.scanned >= self.max_scan
+            or self.stale_run >= STALE_RUN_LIMIT
+        ):
+            self.done = True
+
+    def _build_item(self, elem, pub_text: str, pub_time_local: datetime) -> Dict:
+        title_text = find_text(elem, TITLE_TAGS).strip()
+        title = title_text if title_text else '无标题'
+
+        # 描述/摘要（优先 content:encoded 获取更丰富正文）
+        summary = clean_html_content(find_text(elem, DESC_PATHS), limit=SUMMARY_LIMIT)
+
+        return {
+            'title': title,
+            'original_title': title,
+            'summary': summary,
+            'original_summary': summary,
+            'link': find_link(elem),
+            'published': pub_text,
+            'source': '',
+            'parsed_time': pub_time_local.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def _finalize(self) -> List[Dict]:
+        # 频道标题可能出现在条目之后，统一在结束时回填来源
+        source_text = self._feed_title or self._first_title or '未知来源'
+        for item in self.items:
+            item['source'] = source_text
+        self._release()
+        return self.items[:self.limit]
+
+    def _recover(self) -> Optional[List[Dict]]:
+        salvaged = salvage_feed_fragments(self._release())
+        if salvaged is None:
+            return self._finalize() if self.scanned else None
+        handled = self._seen.copy()
+
+        feed_title, elements, self.dropped = salvaged
+        self.recovered = True
+        self.done = False
+        self._feed_title = self._feed_title or feed_title
+        for elem in elements:
+            if not self._first_title:
+                self._first_title = find_text(elem, TITLE_TAGS)
+            key = (find_text(elem, TITLE_TAGS), find_link(elem))
+            if handled[key] > 0:
+                handled[key] -= 1
+                continue
+            self._handle_item(elem)
+            if self.done:
+                break
+        return self._finalize()
+
+
+def parse_feed_items(content: bytes, limit: int = 10, hours_ago: int = 24):
+    """解析完整的 RSS/Atom 内容，返回时间窗口内的条目；XML 无法解析时返回 None。"""
+    parser = FeedStreamParser(limit, hours_ago)
+    parser.feed(content)
+    return parser.close()
+
+
+def parse_feed_record(content: bytes, limit: int = 10, hours_ago: int = 24, max_bytes: int = None) -> Dict:
+    """分块解析已下载的完整内容，返回 FeedStreamParser.record() 结果记录（供进程池调用）。"""
+    parser = FeedStreamParser(limit, hours_ago, max_bytes=max_bytes)
+    for start in range(0, len(content), PARSE_CHUNK_SIZE):
+        if parser.feed(content[start:start + PARSE_CHUNK_SIZE]):
+            break
+    return parser.record()
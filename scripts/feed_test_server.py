@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""采集引擎测试共用的本地 RSS 服务：按路径返回若干条新闻，可让指定路径延迟响应、缓慢下载或返回 503。"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+
+def build_feed(titles, path: str = "") -> bytes:
+    """一小时前发布的若干条新闻组成的 RSS。"""
+    pub_date = format_datetime(datetime.now(timezone.utc) - timedelta(hours=1))
+    items = "".join(
+        f"<item><title>{title}</title><link>https://example.com{path}/{i}</link>"
+        f"<description>摘要</description><pubDate>{pub_date}</pubDate></item>"
+        for i, title in enumerate(titles)
+    )
+    return f'<?xml version="1.0" encoding="utf-8"?><rss><channel><title>测试源</title>{items}</channel></rss>'.encode("utf-8")
+
+
+DRIP_PIECES = 8
+DRIP_PIECE_BYTES = 16 * 1024
+
+
+def match_prefix(path: str, table: Dict[str, float]) -> float:
+    return next((seconds for prefix, seconds in table.items() if path.startswith(prefix)), 0)
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """/broken 返回 503；其余路径返回 item_count 条标题含路径的新闻。
+
+    路径以 delays 中的前缀开头时先等待对应秒数再响应；以 drips 中的前缀开头时立即发出响应头，
+    正文前的空白分 DRIP_PIECES 块、每块间隔对应秒数慢慢发送（模拟下载中途很慢的镜像）。
+    """
+
+    delays: Dict[str, float] = {}
+    drips: Dict[str, float] = {}
+    item_count = 1
+
+    def do_GET(self) -> None:
+        delay = match_prefix(self.path, self.delays)
+        if delay:
+            time.sleep(delay)
+        try:
+            if self.path == "/broken":
+                self.send_response(503)
+                self.end_headers()
+                return
+            body = build_feed([f"{self.path} 公司发布新产品 {i}" for i in range(self.item_count)], self.path)
+            interval = match_prefix(self.path, self.drips)
+            if interval:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml")
+                self.end_headers()
+                for _ in range(DRIP_PIECES):
+                    self.wfile.write(b" " * DRIP_PIECE_BYTES)
+                    self.wfile.flush()
+                    time.sleep(interval)
+                # 前导空白之后不能再有 XML 声明
+                self.wfile.write(body.split(b"?>", 1)[1])
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端已放弃该请求（截止时间到达或对冲请求落败）
+            pass
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def start_feed_server(delays: Optional[Dict[str, float]] = None, item_count: int = 1,
+                      drips: Optional[Dict[str, float]] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """在随机端口启动服务，返回 (server, base_url)；处理线程为守护线程，慢请求不阻塞测试退出。"""
+    handler = type("ConfiguredFeedHandler", (FeedHandler,), {
+        "delays": dict(delays or {}),
+        "drips": dict(drips or {}),
+        "item_count": item_count,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def stop_feed_server(server: ThreadingHTTPServer) -> None:
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+共享 HTTP 连接池
+RSS、原文页面和第三方 API（Marketaux / Tavily）共用一个 keep-alive 会话，
+同一 host 的请求复用 TCP/TLS 连接，避免每次抓取都重新握手；
+显式协商压缩传输（gzip / deflate，安装 brotli / zstandard 时追加 br / zstd），
+并提供按字节上限读取响应体的辅助函数；
+按 host 的令牌桶调度请求节奏并遵守 Retry-After，被限速的 host 不影响其他 host
+"""
+
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from utils import SSL_CONTEXT
+
+# 缓存的 host 连接池数量（46 个源约 40 个 host，另加原文页面和 API）
+POOL_CONNECTIONS = 64
+# 每个 host 保留的 keep-alive 连接数的默认值；实际值由调用方按并发配置通过 configure_session() 设定，
+# 需覆盖同一 host 的最大并发，否则超出的线程用完连接后直接丢弃，无法复用
+POOL_MAXSIZE = 10
+# 读取响应体时的分块大小
+READ_CHUNK_SIZE = 16 * 1024
+# 服务端 Retry-After 的上限（秒），避免个别 host 让整个采集长时间等待
+RETRY_AFTER_MAX = 60.0
+# 遵守 Retry-After 的状态码
+RETRY_AFTER_STATUSES = (429, 503)
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+_POOL_MAXSIZE = POOL_MAXSIZE
+
+
+class SSLContextAdapter(HTTPAdapter):
+    """使用共享 certifi ssl_context 的连接池适配器。"""
+
+    def __init__(self, ssl_context=SSL_CONTEXT, **kwargs):
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self.ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs["ssl_context"] = self.ssl_context
+        return super().proxy_manager_for(*args, **kwargs)
+
+
+def create_session(pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+    """创建带连接池的会话；重试由调用方（fallback / 对冲）负责，这里不做自动重试。"""
+    session = requests.Session()
+    adapter = SSLContextAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=0,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # urllib3 按已安装的解码库给出可透明解压的编码列表
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
+
+
+def configure_session(pool_maxsize: int) -> None:
+    """设定共享会话每个 host 的连接数（不低于 POOL_MAXSIZE）；已创建的会话关闭后按新配置重建。"""
+    global _SESSION, _POOL_MAXSIZE
+    with _SESSION_LOCK:
+        _POOL_MAXSIZE = max(POOL_MAXSIZE, int(pool_maxsize))
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+
+
+def get_session() -> requests.Session:
+    """返回进程内共享的会话（线程安全的懒加载）。"""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = create_session(pool_maxsize=_POOL_MAXSIZE)
+    return _SESSION
+
+
+def iter_limited(response: requests.Response, max_bytes: int, chunk_size: int = READ_CHUNK_SIZE):
+    """逐块产出 stream=True 响应的（已解压）正文，累计达到 max_bytes 字节后停止。"""
+    size = 0
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if size + len(chunk) >= max_bytes:
+            yield chunk[:max_bytes - size]
+            return
+        size += len(chunk)
+        yield chunk
+
+
+def parse_retry_after(value: str, now: float = None) -> Optional[float]:
+    """解析 Retry-After（秒数或 HTTP 日期），返回需要等待的秒数；无法解析时返回 None。"""
+    value = (value or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(0.0, retry_at.timestamp() - now)
+
+
+class HostRateLimiter:
+    """按 host 的令牌桶：每 interval 秒补充一个令牌，最多积攒 burst 个；Retry-After 期间该 host 暂停。
+
+    reserve() 不阻塞，只返回还需等待的秒数，由并发闸门在等待期间放行其他 host；
+    不经过闸门的调用方（原文页面、Marketaux / Tavily）用 acquire()，只阻塞当前线程。
+    """
+
+    def __init__(self, interval: float = 0.5, burst: int = 2, retry_after_max: float = RETRY_AFTER_MAX):
+        self.interval = max(0.0, interval)
+        self.burst = max(1, burst)
+        self.retry_after_max = retry_after_max
+        self._tokens: Dict[str, float] = {}
+        self._updated: Dict[str, float] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, host: str) -> float:
+        """尝试为 host 取一个令牌：取到返回 0，否则返回距离可用还需的秒数（不占用令牌）。"""
+        if not self.interval and not self._blocked_until:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            blocked = self._blocked_until.get(host, 0.0) - now
+            if blocked > 0:
+                return blocked
+            if not self.interval:
+                return 0.0
+            tokens = self._tokens.get(host, float(self.burst))
+            elapsed = now - self._updated.get(host, now)
+            tokens = min(float(self.burst), tokens + elapsed / self.interval)
+            self._updated[host] = now
+            if tokens >= 1.0:
+                self._tokens[host] = tokens - 1.0
+                return 0.0
+            self._tokens[host] = tokens
+            return (1.0 - tokens) * self.interval
+
+    def acquire(self, host: str) -> float:
+        """阻塞当前线程直到取到 host 的令牌，返回等待秒数。"""
+        started = time.monotonic()
+        delay = self.reserve(host)
+        while delay > 0:
+            time.sleep(delay)
+            delay = self.reserve(host)
+        return time.monotonic() - started
+
+    def defer(self, host: str, seconds: float) -> None:
+        """在 seconds 秒内暂停向 host 发请求（取已有暂停与新暂停中较晚者）。"""
+        until = time.monotonic() + min(max(0.0, seconds), self.retry_after_max)
+        with self._lock:
+            self._blocked_until[host] = max(self._blocked_until.get(host, 0.0), until)
+
+    def observe(self, host: str, status: int, headers) -> Optional[float]:
+        """根据响应处理 Retry-After（仅 429 / 503），返回暂停秒数。"""
+        if status not in RETRY_AFTER_STATUSES:
+            return None
+        seconds = parse_retry_after(headers.get("Retry-After", "") if headers is not None else "")
+        if seconds is None:
+            return None
+        self.defer(host, seconds)
+        return min(seconds, self.retry_after_max)
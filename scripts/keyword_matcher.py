@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+多组关键词匹配
+把多个关键词表编进一个 Aho–Corasick 自动机，一次扫描文本即得到每个表命中的关键词，
+不再对每个关键词各做一次子串查找。每个表按原有口径匹配：
+MATCH_EXACT 区分大小写的子串；MATCH_IGNORE_CASE 忽略大小写的子串；
+MATCH_TOPIC 忽略大小写，纯英文数字关键词另需满足 re 的 \\b 词边界（与 contains_topic_keyword 相同）
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+MATCH_EXACT = "exact"
+MATCH_IGNORE_CASE = "ignore_case"
+MATCH_TOPIC = "topic"
+
+TOPIC_WORD_RE = re.compile(r"[a-z0-9.+\- ]+")
+
+# 自动机状态输出：(表名, 原关键词, 小写后长度, 匹配方式)
+Output = Tuple[str, str, int, str]
+
+
+def is_word_char(char: str) -> bool:
+    """与 re 的 \\w（str 模式）一致：Unicode 字母数字或下划线。"""
+    return char.isalnum() or char == "_"
+
+
+def at_word_boundary(text: str, position: int) -> bool:
+    """text 的 position 处是否满足 \\b：两侧恰有一侧是单词字符。"""
+    before = position > 0 and is_word_char(text[position - 1])
+    after = position < len(text) and is_word_char(text[position])
+    return before != after
+
+
+class KeywordMatcher:
+    """多个关键词表共用的 Aho–Corasick 自动机，构建后只读，可在线程间共享。
+
+    groups 为 {表名: 关键词列表} 或 {表名: (关键词列表, 匹配方式)}，未指定时为 MATCH_EXACT。
+    自动机按小写后的关键词构建、在小写后的文本上运行；MATCH_EXACT 的命中再与原文对应片段核对。
+    """
+
+    def __init__(self, groups: Dict[str, Union[Iterable[str], Tuple[Iterable[str], str]]]):
+        self.groups: Dict[str, Tuple[List[str], str]] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Output]] = [[]]
+        for group, spec in groups.items():
+            keywords, mode = spec if isinstance(spec, tuple) else (spec, MATCH_EXACT)
+            keywords = [keyword for keyword in keywords if keyword]
+            self.groups[group] = (keywords, mode)
+            for keyword in keywords:
+                self._insert(group, keyword, mode)
+        self._link()
+
+    def _insert(self, group: str, keyword: str, mode: str) -> None:
+        lowered = keyword.lower()
+        if mode == MATCH_TOPIC and not TOPIC_WORD_RE.fullmatch(lowered):
+            # 含中文等字符的主题词按普通子串匹配
+            mode = MATCH_IGNORE_CASE
+        state = 0
+        for char in lowered:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((group, keyword, len(lowered), mode))
+
+    def _link(self) -> None:
+        """按层次遍历建立失败指针，并把失败链上的输出并入各状态。"""
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                pending.append(next_state)
+
+    def find(self, text: str) -> Dict[str, Set[str]]:
+        """一次扫描 text，返回 {表名: 命中的关键词集合}，没有命中的表不出现。"""
+        hits: Dict[str, Set[str]] = {}
+        if not text:
+            return hits
+        lowered = text.lower()
+        # 个别字符小写后长度会变，此时小写文本与原文位置对不上，MATCH_EXACT 的表改为逐个子串查找
+        aligned = len(lowered) == len(text)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for group, keyword, length, mode in outputs[state]:
+                start = end - length
+                if mode == MATCH_EXACT:
+                    if not aligned or text[start:end] != keyword:
+                        continue
+                elif mode == MATCH_TOPIC:
+                    if not (at_word_boundary(lowered, start) and at_word_boundary(lowered, end)):
+                        continue
+                hits.setdefault(group, set()).add(keyword)
+        if not aligned:
+            for group, (keywords, mode) in self.groups.items():
+                if mode == MATCH_EXACT:
+                    found = {keyword for keyword in keywords if keyword in text}
+                    if found:
+                        hits[group] = found
+        return hits
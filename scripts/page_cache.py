@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+原文页面上下文磁盘缓存
+按规范化 URL（url_canon.canonical_url）保存 fetch_article_context 的抽取结果，过期（TTL）即失效，
+总大小超过上限时按最近使用时间（LRU）淘汰，工作流重试和周一周报可直接复用
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from url_canon import canonical_url
+from utils import WORK_DIR
+
+PAGE_CACHE_DIR = os.path.join(WORK_DIR, "cache", "pages")
+# 周报会用到过去 7 天的新闻，缓存保留略长于一周
+PAGE_CACHE_TTL_HOURS = 8 * 24
+PAGE_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+
+class PageCache:
+    """每个 URL 一个 JSON 文件；读取时刷新文件 mtime 作为 LRU 时间戳，可被多线程并发使用。"""
+
+    def __init__(
+        self,
+        cache_dir: str = PAGE_CACHE_DIR,
+        ttl_hours: float = PAGE_CACHE_TTL_HOURS,
+        max_bytes: int = PAGE_CACHE_MAX_BYTES,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, url: str) -> Optional[Dict[str, str]]:
+        """返回缓存的页面上下文；不存在或已过期时返回 None。"""
+        key = canonical_url(url)
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or entry.get("url") != key:
+            return None
+        if time.time() - entry.get("stored_at", 0) > self.ttl_seconds:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("context")
+
+    def put(self, url: str, context: Dict[str, str]) -> None:
+        """写入页面上下文，写入后按总大小淘汰最久未使用的条目。"""
+        key = canonical_url(url)
+        entry = {"url": key, "stored_at": time.time(), "context": context}
+
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError):
+            # 缓存写入失败不影响本次抓取
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """删除过期条目，并在总大小超过上限时从最久未使用的开始删除。"""
+        with self._evict_lock:
+            entries = []
+            try:
+                names = os.listdir(self.cache_dir)
+            except OSError:
+                return
+            now = time.time()
+            for name in names:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for mtime, size, path in sorted(entries):
+                expired = now - mtime > self.ttl_seconds
+                if not expired and total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+已发布新闻记录
+保存最近几天已发布新闻的链接与标题，次日采集时在分类前剔除，避免同一条新闻跨天重复入选、
+重复补抓原文与改写；每天一个 Bloom 过滤器存链接哈希，另存当天的原始标题，按字符级 Jaccard 比对，
+超过保留天数的整天记录直接丢弃
+"""
+
+import base64
+import hashlib
+import json
+import math
+import os
+import tempfile
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from title_dedup import TitleDedupIndex
+from url_canon import link_key
+from utils import WORK_DIR
+
+PUBLISHED_STORE_PATH = os.path.join(WORK_DIR, "cache", "published.json")
+PUBLISHED_RETENTION_DAYS = 3
+# 每天的 Bloom 过滤器按 512 条链接、万分之一误判率分配（约 1.2KB）
+BLOOM_CAPACITY = 512
+BLOOM_ERROR_RATE = 0.0001
+
+
+class BloomFilter:
+    """定长位数组 + 双重哈希的 Bloom 过滤器，可序列化为 JSON。"""
+
+    def __init__(self, capacity: int = BLOOM_CAPACITY, error_rate: float = BLOOM_ERROR_RATE):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:16], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def to_dict(self) -> Dict:
+        return {"size": self.size, "hashes": self.hashes, "bits": base64.b64encode(bytes(self.bits)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "BloomFilter":
+        bloom = cls.__new__(cls)
+        bloom.size = int(data["size"])
+        bloom.hashes = int(data["hashes"])
+        bloom.bits = bytearray(base64.b64decode(data["bits"]))
+        if bloom.size <= 0 or bloom.hashes <= 0 or len(bloom.bits) != (bloom.size + 7) // 8:
+            raise ValueError("bloom 数据损坏")
+        return bloom
+
+
+class PublishedStore:
+    """按天保存已发布新闻：{日期: {"links": Bloom 过滤器, "titles": [小写原始标题]}}。
+
+    采集时只读：contains() 判断条目的链接或标题是否已在近几天发布过；
+    发布成功后由 auto_daily_news 调用 record() 与 save() 追加当天记录。
+    """
+
+    def __init__(
+        self,
+        path: str = PUBLISHED_STORE_PATH,
+        retention_days: int = PUBLISHED_RETENTION_DAYS,
+        today: Optional[date] = None,
+    ):
+        self.path = path
+        self.retention_days = max(1, retention_days)
+        self.today = today or date.today()
+        self.days: Dict[str, Dict] = {}
+        self._title_index = TitleDedupIndex()
+        self.load()
+
+    def _is_retained(self, day: str) -> bool:
+        try:
+            age = (self.today - date.fromisoformat(day)).days
+        except ValueError:
+            return False
+        return age < self.retention_days
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        for day, entry in (data.get("days") or {}).items():
+            if not self._is_retained(day) or not isinstance(entry, dict):
+                continue
+            try:
+                links = BloomFilter.from_dict(entry["links"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            titles = [title for title in entry.get("titles") or [] if isinstance(title, str)]
+            self.days[day] = {"links": links, "titles": titles}
+            for title in titles:
+                self._title_index.add(title)
+
+    def save(self) -> None:
+        """原子写入，只保留保留期内的日期；写入失败不影响发布结果。"""
+        tmp_path = None
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            days = {
+                day: {"links": entry["links"].to_dict(), "titles": entry["titles"]}
+                for day, entry in sorted(self.days.items())
+                if self._is_retained(day)
+            }
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"days": days}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError):
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def contains(self, item: Dict) -> bool:
+        """条目的链接（规范化后）或标题（字符级 Jaccard > 0.6）与近几天已发布的新闻相同。"""
+        link = link_key(item.get("link"))
+        if link and any(link in entry["links"] for entry in self.days.values()):
+            return True
+        title = (item.get("original_title") or item.get("title") or "").lower()
+        return bool(title) and (title in self._title_index or self._title_index.find_similar(title) is not None)
+
+    def record(self, items: Iterable[Dict]) -> int:
+        """把已发布的条目记入当天；返回记录的条数。"""
+        entry = self.days.setdefault(self.today.isoformat(), {"links": BloomFilter(), "titles": []})
+        count = 0
+        for item in items:
+            link = link_key(item.get("link"))
+            if link:
+                entry["links"].add(link)
+            # 次日 RSS 中出现的是原始标题，记录改写前的标题
+            title = (item.get("original_title") or item.get("title") or "").lower()
+            if title and title not in entry["titles"]:
+                entry["titles"].append(title)
+                self._title_index.add(title)
+            count += 1
+        return count
+
+
+def published_items(categorized_news: Dict[str, List[Dict]]) -> List[Dict]:
+    """raw_news_*.json 中 categorized_news 的全部入选条目。"""
+    return [item for items in (categorized_news or {}).values() for item in items if isinstance(item, dict)]
@@ -6,45 +6,66 @@
 特性：
 - 46 个 RSS 源（AI 13 + 科技动态 21 + 财经 12）
 - RSSHub 多实例 fallback 机制（财经源高可用）
-- 并发 RSS 采集（10线程），采集时间从 7min 压缩到 ~30s
+- 并发 RSS 采集（AIMD 自适应并发 + 单 host 上限），采集时间从 7min 压缩到 ~30s
 - 分类补救机制（不足 3 条时自动补充）
 - 单行新闻简讯：每条新闻只保留一行事实型简讯
 - RSS 源健康摘要：记录空返回源与 fallback 命中情况
-- 强过滤与主体纠偏：减少栏目标题、导航噪音和泛化主体
-- 模糊去重：字符级 Jaccard 相似度（阈值 0.6）
-- HTML 清洗增强：CDATA + unescape + content:encoded 解析
+- 强过滤与主体纠偏：减少栏目标题、导航噪音和泛化主体；过滤与分类打分的各关键词表编为一个 Aho–Corasick 自动机，一次扫描得到全部命中
+- 链接去重：规范化 URL（去跟踪参数、统一 scheme/host、feedburner 跳转归并）哈希集合去重，先于标题模糊去重
+- 模糊去重：字符级 Jaccard 相似度（阈值 0.6），日报规模逐一精确比较，上万条时改用 MinHash/LSH 索引筛选候选（近似），每个源的结果到达即增量过滤去重，与抓取重叠
+- 事件聚类：按实体（中英文公司名/股票代码）、型号、数值与发布时间把同一事件的中英文报道归为一组，每个事件只送一条代表给分类，报道数在规则排序中封顶加分，其余报道留作分类不足时的补救候选
+- 跨天去重：剔除近 3 天已发布过的链接（每天一个 Bloom 过滤器）与近似标题，不再重复补抓原文与改写
+- HTML 清洗增强：CDATA + unescape + content:encoded 解析；单遍逐段清洗，摘要取满 500 字即停止，短文本清洗结果缓存复用
+- 流式 RSS 解析：边下载边解析，先判断发布时间，凑够条数或连续遇到过期条目即停止读取
+- 可选进程池解析（RSS_PARSE_WORKERS）：RSS 解析与 HTML 清洗交给工作进程，只回传精简条目记录
+- 损坏 XML 片段级修复：一次性删除控制字节，逐个抢救完好条目，健康摘要记录各源修复次数
 - 分类 JSON 解析正则 fallback
-- 入选新闻原文上下文补充：补抓页面标题/导语，减少主体缺失
+- 入选新闻原文上下文补充：补抓页面标题/导语，减少主体缺失；有界线程池并发抓取，页面结果落盘缓存（TTL + LRU）供重试与周报复用
+- 原文头部优先抽取：html.parser 增量解析标题、导语、JSON-LD 与正文摘录，拿到后即停止下载
+- 原文编码显式判定：BOM > 响应头 charset > <meta charset> > UTF-8，GBK 页面不再出现乱码标题
 - 使用 certifi 正确验证 SSL 证书
+- 共享 keep-alive 连接池：RSS、原文页面、Marketaux / Tavily 复用 TCP/TLS 连接
+- 按 host 令牌桶限速并遵守 Retry-After：被限速的 host 不占并发名额，其他 host 照常抓取
+- 压缩传输与读取上限：协商 gzip/deflate（可选 br/zstd）透明解压，RSS 与原文页面按字节上限停止读取
 - 纯 RSS 模式，不使用 AI 补充新闻
 - AI 不可用时自动切换规则分类兜底
 - 财经源不足时可选接入第三方 API 补源
+- RSS 条件请求缓存：ETag / Last-Modified，源返回 304 时复用上次解析结果
+- 可选 asyncio 采集引擎（--engine async / RSS_FETCH_ENGINE=async），全局与单 host 并发上限
+- 镜像源对冲抓取（RSS_HEDGE_MODE=delay/race）：错峰或同时请求镜像，取最先返回的非空结果
+- 采集总截止时间（--collect-deadline 45s / RSS_COLLECT_DEADLINE）：到点放弃慢源，健康摘要标记 timeout
+- 提前结束采集（--early-stop N / RSS_EARLY_STOP）：各分类都有 N 条有效候选后跳过其余源，按历史产出优先提交
+- 源抓取台账：跨运行记录各源耗时与 fallback 使用，按预期耗时从长到短提交，优先请求历史最快镜像
+- 源级熔断：连续多次运行失败的源暂时跳过（健康摘要标记 circuit_open），之后短超时半开探测，成功即恢复
+- 自适应超时：RSS 地址与原文 host 按历史耗时 p95 × 系数设定超时（3s 下限），死源几秒内失败
 """
 
+import codecs
 import os
 import sys
 import json
-import urllib.request
-import urllib.error
-import ssl
-import xml.etree.ElementTree as ET
+import urllib.parse
 import argparse
 from datetime import datetime, timedelta
-from typing import List, Dict
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Set
 import re
 import time
-import html as html_module
-from email.utils import parsedate_to_datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import math
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED, CancelledError, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import asyncio
+import itertools
+import queue
+import threading
 import requests
 
-# 尝试导入 certifi 用于正确的 SSL 证书验证
+# aiohttp 为可选依赖，仅 asyncio 采集引擎使用
 try:
-    import certifi
-    ssl_context = ssl.create_default_context(cafile=certifi.where())
+    import aiohttp
 except ImportError:
-    # 如果 certifi 不可用，使用不验证证书的上下文（备用）
-    ssl_context = ssl._create_unverified_context()
+    aiohttp = None
 
 # 导入共享工具函数
 try:
@@ -84,13 +105,125 @@ except ImportError:
             return None
         return value
 
+# 导入 RSS 采集辅助模块
+from feed_cache import FeedCache, conditional_headers
+from http_transport import SSL_CONTEXT, HostRateLimiter, configure_session, get_session, iter_limited
+from feed_parser import SUMMARY_LIMIT, FeedStreamParser, clean_html_cached, clean_html_content, parse_feed_datetime, parse_feed_record
+from source_ledger import SourceLedger
+from concurrency import AIMDController, AsyncConcurrencyGate, ThreadConcurrencyGate
+from page_cache import PageCache
+from title_dedup import TitleDedupIndex
+from published_store import PublishedStore
+from url_canon import RedirectCache, is_redirect_link, link_key
+from event_cluster import collapse_events, event_index, expand_event_members
+from keyword_matcher import MATCH_IGNORE_CASE, MATCH_TOPIC, KeywordMatcher
+from article_extractor import CHARSET_SNIFF_BYTES, ArticleContextExtractor, resolve_charset
+
 # 速率限制配置
-REQUEST_DELAY = 0.5  # 请求间隔（秒）
+REQUEST_DELAY = float(get_env_var("REQUEST_DELAY", "0.5", required=False) or 0.5)  # 同一 host 的请求间隔（秒），0 为不限速
+FEED_CHUNK_SIZE = 16 * 1024  # 流式解析 RSS 时每次读取的字节数
+RSS_FETCH_TIMEOUT = 30  # 单个 RSS 地址的请求超时上限（秒），有历史耗时时按台账自适应缩短
+ARTICLE_FETCH_TIMEOUT = 15  # 原文页面请求超时上限（秒），按 host 历史耗时自适应缩短
+# 单次读取的字节上限（解压后）：RSS 超出后只保留已完整解析的条目，原文页面只需标题、导语和 1500 字摘录
+RSS_MAX_FEED_BYTES = int(get_env_var("RSS_MAX_FEED_BYTES", str(4 * 1024 * 1024), required=False) or 4 * 1024 * 1024)
+ARTICLE_MAX_BYTES = int(get_env_var("ARTICLE_MAX_BYTES", str(512 * 1024), required=False) or 512 * 1024)
 HTTP_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
 }
 ARTICLE_CONTEXT_CACHE: Dict[str, Dict[str, str]] = {}
+# 原文上下文并发补充的线程数
+ARTICLE_FETCH_WORKERS = max(1, int(get_env_var("ARTICLE_FETCH_WORKERS", "6", required=False) or 6))
+# 原文页面磁盘缓存（cache/pages，按规范化 URL，TTL + LRU 淘汰），设置 ARTICLE_PAGE_CACHE=false 可关闭
+ARTICLE_PAGE_CACHE_ENABLED = (get_env_var("ARTICLE_PAGE_CACHE", "true", required=False) or "").strip().lower() not in {"0", "false", "no", "off"}
+ARTICLE_PAGE_CACHE_TTL_HOURS = float(get_env_var("ARTICLE_PAGE_CACHE_TTL_HOURS", "192", required=False) or 192)
+ARTICLE_PAGE_CACHE_MAX_MB = float(get_env_var("ARTICLE_PAGE_CACHE_MAX_MB", "20", required=False) or 20)
+PAGE_CACHE = PageCache(
+    ttl_hours=ARTICLE_PAGE_CACHE_TTL_HOURS,
+    max_bytes=int(ARTICLE_PAGE_CACHE_MAX_MB * 1024 * 1024),
+) if ARTICLE_PAGE_CACHE_ENABLED else None
+# RSS 条件请求缓存（ETag / Last-Modified），设置 RSS_FEED_CACHE=false 可关闭
+FEED_CACHE_ENABLED = (get_env_var("RSS_FEED_CACHE", "true", required=False) or "").strip().lower() not in {"0", "false", "no", "off"}
+FEED_CACHE = FeedCache() if FEED_CACHE_ENABLED else None
+# RSS 解析进程池：>0 时抓取线程只负责下载，XML 解析与正文清洗交给该数量的工作进程；0 为在抓取线程内流式解析（默认）
+RSS_PARSE_WORKERS = max(0, int(get_env_var("RSS_PARSE_WORKERS", "0", required=False) or 0))
+# RSS 采集引擎：thread（默认，线程池）或 async（单事件循环，需要 aiohttp）
+RSS_FETCH_ENGINES = ("thread", "async")
+RSS_FETCH_ENGINE = (get_env_var("RSS_FETCH_ENGINE", "thread", required=False) or "thread").strip().lower()
+if RSS_FETCH_ENGINE not in RSS_FETCH_ENGINES:
+    RSS_FETCH_ENGINE = "thread"
+# 自适应并发（AIMD）：从初始值起步，一轮全部成功后 +1，超时或 429/5xx 时减半；两种引擎共用
+# 旧的 RSS_ASYNC_MAX_CONCURRENCY / RSS_ASYNC_PER_HOST 仍作为默认值兼容
+RSS_MAX_CONCURRENCY = int(get_env_var("RSS_MAX_CONCURRENCY", get_env_var("RSS_ASYNC_MAX_CONCURRENCY", "24", required=False), required=False) or 24)
+RSS_INITIAL_CONCURRENCY = int(get_env_var("RSS_INITIAL_CONCURRENCY", "8", required=False) or 8)
+RSS_MIN_CONCURRENCY = int(get_env_var("RSS_MIN_CONCURRENCY", "2", required=False) or 2)
+# 单 host 并发上限：多个源共用同一 RSSHub 镜像时避免集中请求
+RSS_PER_HOST_LIMIT = int(get_env_var("RSS_PER_HOST_LIMIT", get_env_var("RSS_ASYNC_PER_HOST", "2", required=False), required=False) or 2)
+# 共享连接池每个 host 的连接数覆盖全部采集线程与原文补充线程，线程再多也能复用 keep-alive 连接
+configure_session(pool_maxsize=max(RSS_MAX_CONCURRENCY, ARTICLE_FETCH_WORKERS))
+# 按 host 的令牌桶限速：RSS、原文页面与 Marketaux / Tavily 共用，每 REQUEST_DELAY 秒补充一个令牌，
+# 最多积攒 HOST_RATE_BURST 个；服务端返回 429 / 503 的 Retry-After 时暂停该 host，其他 host 不受影响
+HOST_RATE_BURST = max(1, int(get_env_var("HOST_RATE_BURST", "2", required=False) or 2))
+HOST_RATE_LIMITER = HostRateLimiter(interval=REQUEST_DELAY, burst=HOST_RATE_BURST)
+# 镜像源对冲抓取：off（默认，逐个 fallback）、delay（超过阈值再发起下一个镜像）、race（同时请求全部镜像）
+RSS_HEDGE_MODE = (get_env_var("RSS_HEDGE_MODE", "off", required=False) or "off").strip().lower()
+RSS_HEDGE_DELAY = float(get_env_var("RSS_HEDGE_DELAY", "3", required=False) or 3)
+
+
+def parse_duration(text: Optional[str]) -> float:
+    """解析 45 / 45s / 2m 形式的时长，返回秒数；空值、0 或 off 返回 0（不限时）。"""
+    value = (text or "").strip().lower()
+    if value in {"", "0", "off", "none"}:
+        return 0.0
+    unit = 1.0
+    if value.endswith("ms"):
+        value, unit = value[:-2], 0.001
+    elif value.endswith("s"):
+        value = value[:-1]
+    elif value.endswith("m"):
+        value, unit = value[:-1], 60.0
+    seconds = float(value) * unit
+    if seconds < 0:
+        raise ValueError(f"invalid duration: {text}")
+    return seconds
+
+
+# RSS 采集总截止时间（如 45s）：到点后放弃仍在进行的抓取，用已获取的结果继续，默认不限时
+try:
+    RSS_COLLECT_DEADLINE = parse_duration(get_env_var("RSS_COLLECT_DEADLINE", "", required=False))
+except ValueError:
+    RSS_COLLECT_DEADLINE = 0.0
+# 提前结束采集：每个分类都已有 RSS_EARLY_STOP 条有效去重候选时，跳过其余未完成的源；0 为关闭（默认）
+RSS_EARLY_STOP = max(0, int(get_env_var("RSS_EARLY_STOP", "0", required=False) or 0))
+# asyncio 引擎检查提前结束信号的间隔（秒）
+EARLY_STOP_POLL_INTERVAL = 0.2
+# 源抓取台账：跨运行记录各源耗时，按最长任务优先提交并优先使用最快镜像，设置 RSS_SOURCE_LEDGER=false 可关闭
+SOURCE_LEDGER_ENABLED = (get_env_var("RSS_SOURCE_LEDGER", "true", required=False) or "").strip().lower() not in {"0", "false", "no", "off"}
+# 熔断：连续 RSS_BREAKER_THRESHOLD 次运行失败的源进入熔断，跳过 RSS_BREAKER_SKIP_RUNS 次运行后
+# 以 RSS_BREAKER_PROBE_TIMEOUT 秒的短超时半开探测，成功即恢复
+RSS_BREAKER_THRESHOLD = int(get_env_var("RSS_BREAKER_THRESHOLD", "3", required=False) or 3)
+RSS_BREAKER_SKIP_RUNS = int(get_env_var("RSS_BREAKER_SKIP_RUNS", "2", required=False) or 2)
+RSS_BREAKER_PROBE_TIMEOUT = float(get_env_var("RSS_BREAKER_PROBE_TIMEOUT", "8", required=False) or 8)
+# 自适应超时：各地址 / 原文 host 历史耗时 p95 × RSS_TIMEOUT_FACTOR，不低于 RSS_TIMEOUT_FLOOR 秒
+RSS_TIMEOUT_FACTOR = float(get_env_var("RSS_TIMEOUT_FACTOR", "3", required=False) or 3)
+RSS_TIMEOUT_FLOOR = float(get_env_var("RSS_TIMEOUT_FLOOR", "3", required=False) or 3)
+SOURCE_LEDGER = SourceLedger(
+    breaker_threshold=RSS_BREAKER_THRESHOLD,
+    breaker_skip_runs=RSS_BREAKER_SKIP_RUNS,
+    probe_timeout=RSS_BREAKER_PROBE_TIMEOUT,
+    timeout_factor=RSS_TIMEOUT_FACTOR,
+    timeout_floor=RSS_TIMEOUT_FLOOR,
+) if SOURCE_LEDGER_ENABLED else None
+# feedburner 等跳转链接的最终地址（抓取原文时记录），链接去重时直接归并，不发请求
+REDIRECT_CACHE = RedirectCache()
+# 已发布新闻记录：剔除最近 PUBLISHED_STORE_DAYS 天（默认 3）已发布过的链接与近似标题，0 为关闭
+PUBLISHED_STORE_DAYS = max(0, int(get_env_var("PUBLISHED_STORE_DAYS", "3", required=False) or 0))
+PUBLISHED_STORE = PublishedStore(retention_days=PUBLISHED_STORE_DAYS) if PUBLISHED_STORE_DAYS else None
+# 事件聚类：发布时间相差 EVENT_CLUSTER_HOURS 小时（默认 36）内、共享型号或实体 + 数值（另需标题相近）的候选归为同一事件，0 为关闭
+EVENT_CLUSTER_HOURS = max(0.0, float(get_env_var("EVENT_CLUSTER_HOURS", "36", required=False) or 0))
+# 规则排序中报道数的加分：log2(报道数)，封顶 2 分（相当于两个高信号关键词），多源小新闻不会压过单一来源的大新闻
+EVENT_CORROBORATION_MAX_BONUS = 2.0
 LAST_RSS_HEALTH: List[Dict[str, str]] = []
+LAST_RSS_CONCURRENCY: Dict = {}
 LAST_EXTERNAL_HEALTH: List[Dict[str, str]] = []
 
 GENERIC_SUBJECT_WORDS = {
@@ -260,6 +393,17 @@ KEEP_KEYWORDS = [
     "技术", "研究", "突破", "创新",
 ]
 
+# 新闻要素：标题至少包含其一（否则需命中事件类模式）
+NEWS_ELEMENT_KEYWORDS = [
+    "发布", "推出", "上线", "融资", "投资", "收购", "并购",
+    "获得", "完成", "宣布", "召开", "举行", "成立", "上市",
+    "产品", "服务", "公司", "企业", "机构", "平台",
+    "技术", "研究", "开发", "实现", "突破", "创新",
+    "市场", "行业", "领域", "全球", "中国", "美国", "欧洲",
+    "AI", "大模型", "模型", "算法", "芯片", "GPU",
+    "净利润", "营收", "财报", "利润", "销售额",
+]
+
 
 def count_chinese_chars(text: str) -> int:
     """统计文本中的中文字符数。"""
@@ -271,13 +415,19 @@ def extract_ascii_tokens(text: str) -> List[str]:
     return re.findall(r"[A-Za-z][A-Za-z0-9.+\-]*", text or "")
 
 
-def has_non_news_style(title: str) -> bool:
-    """判断标题是否带有评测、评论、提问或营销腔。"""
+def has_non_news_style(title: str, hits: Optional[Dict[str, Set[str]]] = None) -> bool:
+    """判断标题是否带有评测、评论、提问或营销腔。
+
+    hits 为调用方已对同一标题得到的 KEYWORD_MATCHER.find() 结果，传入时不再重复扫描
+    （NON_NEWS_STYLE_KEYWORDS 不含空白，空白规整前后命中相同）。
+    """
     title = re.sub(r"\s+", " ", (title or "")).strip()
     if not title:
         return False
 
-    if any(keyword in title for keyword in NON_NEWS_STYLE_KEYWORDS):
+    if hits is None:
+        hits = KEYWORD_MATCHER.find(title)
+    if "non_news_style" in hits:
         return True
 
     for pattern in NON_NEWS_STYLE_PATTERNS:
@@ -327,45 +477,27 @@ def is_valid_news_title(title: str) -> bool:
     # 清理标题
     title = title.strip()
 
-    if has_non_news_style(title):
+    # 各关键词表一次扫描得到全部命中
+    hits = KEYWORD_MATCHER.find(title)
+
+    if has_non_news_style(title, hits):
         return False
     if has_excessive_english(title):
         return False
 
     # 强过滤：无论是否含科技关键词，这些类型都不适合新闻简讯
-    for keyword in HARD_EXCLUDE_KEYWORDS:
-        if keyword in title:
-            return False
+    if "hard_exclude" in hits:
+        return False
 
-    # 检查排除模式
-    for pattern in TITLE_EXCLUDE_PATTERNS:
-        if re.match(pattern, title):
-            # 检查是否有保留关键词
-            has_keep_keyword = any(kw.lower() in title.lower() for kw in KEEP_KEYWORDS)
-            if not has_keep_keyword:
-                return False
-
-    # 检查排除关键词
-    for keyword in TITLE_EXCLUDE_KEYWORDS:
-        if keyword in title:
-            # 检查是否有保留关键词
-            has_keep_keyword = any(kw.lower() in title.lower() for kw in KEEP_KEYWORDS)
-            if not has_keep_keyword:
-                return False
-
-    # 检查标题是否包含新闻要素（至少包含以下之一）
-    news_elements = [
-        "发布", "推出", "上线", "融资", "投资", "收购", "并购",
-        "获得", "完成", "宣布", "召开", "举行", "成立", "上市",
-        "产品", "服务", "公司", "企业", "机构", "平台",
-        "技术", "研究", "开发", "实现", "突破", "创新",
-        "市场", "行业", "领域", "全球", "中国", "美国", "欧洲",
-        "AI", "大模型", "模型", "算法", "芯片", "GPU",
-        "净利润", "营收", "财报", "利润", "销售额",
-    ]
+    # 检查排除模式与排除关键词，有保留关键词时仍保留
+    if "keep" not in hits:
+        if any(re.match(pattern, title) for pattern in TITLE_EXCLUDE_PATTERNS):
+            return False
+        if "title_exclude" in hits:
+            return False
 
-    has_news_element = any(elem in title for elem in news_elements)
-    if not has_news_element:
+    # 检查标题是否包含新闻要素（至少包含 NEWS_ELEMENT_KEYWORDS 之一）
+    if "news_element" not in hits:
         # 如果没有新闻要素，检查是否是事件类标题
         event_patterns = [
             r"\d+月\d+日",  # 日期
@@ -503,6 +635,18 @@ HIGH_SIGNAL_KEYWORDS = {
     "财经要闻": ["融资", "上市", "IPO", "收购", "并购", "财报", "营收", "估值", "加息", "降息"],
 }
 
+# 标题过滤与分类打分用到的全部关键词表，导入时编译为一个自动机，一次扫描得到各表命中
+KEYWORD_MATCHER = KeywordMatcher({
+    "hard_exclude": HARD_EXCLUDE_KEYWORDS,
+    "non_news_style": NON_NEWS_STYLE_KEYWORDS,
+    "title_exclude": TITLE_EXCLUDE_KEYWORDS,
+    "keep": (KEEP_KEYWORDS, MATCH_IGNORE_CASE),
+    "news_element": NEWS_ELEMENT_KEYWORDS,
+    "ai": (AI_KEYWORDS, MATCH_TOPIC),
+    "finance": (FINANCE_KEYWORDS, MATCH_TOPIC),
+    **{f"high_signal:{category}": keywords for category, keywords in HIGH_SIGNAL_KEYWORDS.items()},
+})
+
 def log(message):
     """记录日志"""
     os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
@@ -511,47 +655,6 @@ def log(message):
         f.write(f"[{timestamp}] {message}\n")
     print(message, flush=True)  # 确保输出立即刷新
 
-def clean_html_content(raw_text):
-    """清洗 HTML 内容：移除 CDATA、HTML标签、转义字符、多余空白"""
-    if not raw_text:
-        return ''
-    text = re.sub(r'<!\[CDATA\[(.*?)\]\]>', r'\1', raw_text, flags=re.DOTALL)
-    text = re.sub(r'<[^>]+>', '', text)
-    text = html_module.unescape(text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
-
-
-def parse_feed_datetime(date_text: str) -> datetime:
-    """解析 RSS/Atom 中常见的发布时间格式。"""
-    if not date_text:
-        raise ValueError("empty date")
-
-    normalized = date_text.strip()
-
-    # 优先兼容 RFC 2822 / RFC 822 风格时间。
-    try:
-        return parsedate_to_datetime(normalized)
-    except (TypeError, ValueError, IndexError):
-        pass
-
-    # 再兼容 ISO 8601，例如 2026-04-04T15:12:06Z。
-    iso_candidate = normalized.replace("Z", "+00:00")
-    try:
-        return datetime.fromisoformat(iso_candidate)
-    except ValueError:
-        pass
-
-    # 补充少数 feed 使用的 UTC 文本后缀。
-    if normalized.endswith(" UTC"):
-        try:
-            return datetime.fromisoformat(normalized[:-4] + "+00:00")
-        except ValueError:
-            pass
-
-    raise ValueError(f"unsupported date format: {date_text}")
-
-
 def is_similar_title(t1, t2, threshold=0.6):
     """字符级 Jaccard 相似度检查"""
     s1, s2 = set(t1), set(t2)
@@ -599,13 +702,10 @@ def infer_item_category(item: Dict) -> str:
         elif category_by_source == "财经要闻":
             finance_score += 4
 
-    for keyword in AI_KEYWORDS:
-        if contains_topic_keyword(title, keyword):
-            ai_score += 2
-
-    for keyword in FINANCE_KEYWORDS:
-        if contains_topic_keyword(title, keyword):
-            finance_score += 2
+    # 等价于对 AI_KEYWORDS / FINANCE_KEYWORDS 逐个调用 contains_topic_keyword
+    hits = KEYWORD_MATCHER.find(title)
+    ai_score += 2 * len(hits.get("ai", ()))
+    finance_score += 2 * len(hits.get("finance", ()))
 
     if category_by_source == "科技动态" and ai_score < 4 and finance_score < 4:
         return "科技动态"
@@ -617,16 +717,18 @@ def infer_item_category(item: Dict) -> str:
 
 
 def score_item_for_category(item: Dict, category: str) -> tuple:
-    """为规则分类场景下的新闻排序。"""
+    """为规则分类场景下的新闻排序：高信号关键词数加上报道数加分为主序，其次关键词数、是否含数字、发布时间。"""
     text = f"{item.get('title', '')} {item.get('summary', '')}"
-    keyword_hits = sum(1 for keyword in HIGH_SIGNAL_KEYWORDS.get(category, []) if keyword in text)
+    keyword_hits = len(KEYWORD_MATCHER.find(text).get(f"high_signal:{category}", ()))
+    # 多个来源报道的同一事件（event_cluster 写入的 event_size）加分，按对数增长并封顶
+    corroboration = min(EVENT_CORROBORATION_MAX_BONUS, math.log2(max(1, item.get("event_size", 1))))
     has_digits = 1 if re.search(r"\d", text) else 0
     parsed_time = item.get("parsed_time", "")
     try:
         dt = datetime.strptime(parsed_time, "%Y-%m-%d %H:%M:%S")
     except ValueError:
         dt = datetime.min
-    return (keyword_hits, has_digits, dt)
+    return (keyword_hits + corroboration, keyword_hits, has_digits, dt)
 
 
 def select_diverse_items(items: List[Dict], limit: int = 5) -> List[Dict]:
@@ -678,129 +780,292 @@ def classify_news_with_rules(news_items: List[Dict]) -> Dict[str, List[Dict]]:
     return categorized
 
 
-def fetch_rss_items(url: str, limit: int = 10, hours_ago: int = 24) -> List[Dict]:
-    """获取 RSS 条目"""
-    try:
-        req = urllib.request.Request(url, headers=HTTP_HEADERS)
-        with urllib.request.urlopen(req, timeout=30, context=ssl_context) as response:
-            content = response.read()
+def filter_cached_feed_items(items: List[Dict], limit: int = 10, hours_ago: int = 24) -> List[Dict]:
+    """304 命中时复用缓存条目，重新按时间窗口过滤掉已过期的新闻。"""
+    cutoff = datetime.now().astimezone() - timedelta(hours=hours_ago)
 
-        # 解析 XML（加容错：先尝试标准解析，失败则清理后重试）
+    fresh = []
+    for item in items:
         try:
-            root = ET.fromstring(content)
-        except ET.ParseError:
-            # 清理���见的 XML 破坏字符（如机器之心的 mismatched tag）
-            cleaned = content.decode('utf-8', errors='ignore')
-            # 移除非法控制字符
-            cleaned = ''.join(c for c in cleaned if ord(c) >= 32 or c in '\n\r\t')
-            # 截断到最后一个完整的 </item> 或 </entry>
-            for close_tag in ['</item>', '</entry>']:
-                idx = cleaned.rfind(close_tag)
-                if idx > 0:
-                    # 找对应的根关闭标签并截断
-                    cleaned = cleaned[:idx + len(close_tag)] + '</channel></rss>' if close_tag == '</item>' else cleaned[:idx + len(close_tag)] + '</feed>'
-                    break
-            try:
-                root = ET.fromstring(cleaned.encode('utf-8'))
-            except ET.ParseError:
-                return []
+            pub_time_local = parse_feed_datetime(item.get('published', '')).astimezone()
+        except ValueError:
+            continue
+        if pub_time_local < cutoff:
+            continue
+        fresh.append(dict(item))
+    return fresh[:limit]
 
-        # RSS 格式：//rss/channel/item 或 //feed/entry
-        items = []
 
-        # 尝试不同的 RSS/Atom 格式
-        item_elements = root.findall('.//item') or root.findall('.//{http://www.w3.org/2005/Atom}entry')
+def new_feed_result(url: str) -> Dict:
+    """单个 RSS 地址的抓取结果骨架，线程与 asyncio 两种引擎共用。"""
+    return {
+        "url": url,
+        "items": [],
+        "status": "error",
+        "not_modified": False,
+        "recovered": False,
+        "truncated": False,
+        "http_status": 0,
+        "congested": False,
+        "bytes": 0,
+        "elapsed": 0.0,
+        "error": "",
+    }
 
-        # 精确的时间过滤：只收集过去24小时的新闻
-        now = datetime.now().astimezone()  # 使用 aware datetime，避免时区比较错误
-        hours_24_ago = now - timedelta(hours=24)  # 过去24小时
 
-        for elem in item_elements[:limit * 2]:
-            item = {}
+def prepare_feed_request(url: str, limit: int, hours_ago: int) -> tuple:
+    """查询条件请求缓存，返回 (缓存条目, 请求头)；缓存不够本次的条数或时间窗口时不带条件头。"""
+    cache_entry = FEED_CACHE.lookup(url, hours_ago, limit) if FEED_CACHE else None
+    headers = dict(HTTP_HEADERS)
+    headers.update(conditional_headers(cache_entry))
+    return cache_entry, headers
+
+
+def reuse_cached_feed(result: Dict, cache_entry: Dict, limit: int, hours_ago: int) -> Dict:
+    """源未更新（304）：直接复用上次解析的条目。"""
+    result["items"] = filter_cached_feed_items(cache_entry.get("items", []), limit, hours_ago)
+    result["status"] = "ok"
+    result["not_modified"] = True
+    return result
+
+
+def finish_feed_fetch(result: Dict, record: Dict, etag: str, last_modified: str, limit: int, hours_ago: int) -> Dict:
+    """根据解析结果记录（FeedStreamParser.record()）填充抓取结果并写入条件请求缓存。"""
+    result["bytes"] = record["bytes"]
+    result["truncated"] = record["truncated"]
+    items = record["items"]
+    if items is None:
+        result["error"] = "XML 解析失败"
+        return result
+    if record["recovered"]:
+        result["recovered"] = True
+        log(f"XML 损坏已修复 [{result['url']}]: 保留 {len(items)} 条，丢弃 {record['dropped']} 个损坏条目")
+
+    if FEED_CACHE:
+        FEED_CACHE.store(result["url"], etag, last_modified, items, hours_ago, limit)
+    result["items"] = items
+    result["status"] = "ok"
+    return result
+
+
+def is_congestion_signal(status_code: int, error: Exception = None) -> bool:
+    """超时、429 与 5xx 视为拥塞信号，自适应并发据此减速。"""
+    if status_code == 429 or status_code >= 500:
+        return True
+    if isinstance(error, (requests.Timeout, asyncio.TimeoutError)):
+        return True
+    # 流式读取中的读超时会被 requests 包装为 ConnectionError
+    return isinstance(error, requests.ConnectionError) and "timed out" in str(error).lower()
 
-            # 标题 - 更健壮的解析
-            title_text = ''
-            for title_path in ['title', '{http://www.w3.org/2005/Atom}title']:
-                title_elem = elem.find(title_path)
-                if title_elem is not None and title_elem.text:
-                    title_text = title_elem.text.strip()
-                    break
-            item['title'] = title_text if title_text else '无标题'
-            item['original_title'] = item['title']
-
-            # 描述/摘要（优先 content:encoded 获取更丰富正文）
-            desc_text = ''
-            for desc_path in ['{http://purl.org/rss/1.0/modules/content/}encoded', 'description', '{http://www.w3.org/2005/Atom}summary', 'content', '{http://www.w3.org/2005/Atom}content']:
-                desc_elem = elem.find(desc_path)
-                if desc_elem is not None and desc_elem.text:
-                    desc_text = desc_elem.text
-                    break
-            desc_text = clean_html_content(desc_text)
-            item['summary'] = desc_text[:500] if desc_text else ''
-            item['original_summary'] = item['summary']
-
-            # 链接
-            link_text = ''
-            for link_path in ['link', '{http://www.w3.org/2005/Atom}link']:
-                link_elem = elem.find(link_path)
-                if link_elem is not None:
-                    # 尝试获取 href 属性或文本
-                    link_text = link_elem.get('href', '') or (link_elem.text if link_elem.text else '')
-                    if link_text:
-                        break
-            item['link'] = link_text
-
-            # 发布时间
-            pub_text = ''
-            for date_path in [
-                'pubDate',
-                '{http://www.w3.org/2005/Atom}published',
-                '{http://www.w3.org/2005/Atom}updated',
-                'date'
-            ]:
-                date_elem = elem.find(date_path)
-                if date_elem is not None and date_elem.text:
-                    pub_text = date_elem.text
-                    break
-            item['published'] = pub_text
-
-            # 来源
-            source_text = ''
-            for source_path in ['.//title', './/{http://www.w3.org/2005/Atom}title']:
-                source_elem = root.find(source_path)
-                if source_elem is not None and source_elem.text:
-                    source_text = source_elem.text
-                    break
-            item['source'] = source_text if source_text else '未知来源'
 
-            # 精确的时间检查：只收集过去24小时的新闻（严格模式）
-            if not item['published']:
-                # 没有发布时间的新闻，跳过以确保内容真实性
-                continue
+def observe_retry_after(url: str, status: int, headers) -> None:
+    """429 / 503 带 Retry-After 时暂停该 host 的后续请求。"""
+    host = urllib.parse.urlsplit(url).netloc
+    seconds = HOST_RATE_LIMITER.observe(host, status, headers)
+    if seconds:
+        log(f"  {host} 返回 {status}，{seconds:g}s 内暂停请求该 host")
+
+
+def polite_request(method: str, url: str, **kwargs) -> requests.Response:
+    """不经过并发闸门的请求（Marketaux / Tavily）：先等该 host 的令牌，响应后处理 Retry-After。"""
+    HOST_RATE_LIMITER.acquire(urllib.parse.urlsplit(url).netloc)
+    response = get_session().request(method, url, **kwargs)
+    observe_retry_after(url, response.status_code, response.headers)
+    return response
+
+
+_PARSE_POOL = None
 
+
+@contextmanager
+def parse_pool_scope():
+    """在 with 块内拉起 RSS 解析进程池（RSS_PARSE_WORKERS 为 0 时什么也不做），退出时等工作进程全部结束。
+
+    Linux 上用 fork 启动并立即拉起全部工作进程，需在抓取线程启动前进入，子进程不会继承其他线程持有的锁。
+    退出后仍在进行的抓取提交解析会失败并退回线程内解析，排队中的解析任务直接取消。
+    """
+    global _PARSE_POOL
+    if not RSS_PARSE_WORKERS or _PARSE_POOL is not None:
+        yield
+        return
+    context = multiprocessing.get_context("fork") if sys.platform.startswith("linux") else None
+    with ProcessPoolExecutor(max_workers=RSS_PARSE_WORKERS, mp_context=context) as pool:
+        try:
+            pool.submit(os.getpid).result()
+            _PARSE_POOL = pool
+            yield
+        finally:
+            _PARSE_POOL = None
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def parse_feed_offloaded(content: bytes, limit: int, hours_ago: int) -> Dict:
+    """在进程池中解析已下载的完整内容；进程池未启动、已关闭（排队的任务被取消）或异常时在当前线程解析。"""
+    pool = _PARSE_POOL
+    record = None
+    if pool is not None:
+        try:
+            record = pool.submit(parse_feed_record, content, limit, hours_ago, RSS_MAX_FEED_BYTES).result()
+        except (BrokenProcessPool, CancelledError, RuntimeError) as e:
+            log(f"RSS 解析进程池不可用，改为线程内解析: {e}")
+    if record is None:
+        record = parse_feed_record(content, limit, hours_ago, RSS_MAX_FEED_BYTES)
+    # 下载量按实际读取的字节计（解析器凑够条目后不会再解析剩余内容）
+    record["bytes"] = len(content)
+    return record
+
+
+async def parse_feed_offloaded_async(content: bytes, limit: int, hours_ago: int) -> Dict:
+    """asyncio 版 parse_feed_offloaded：等待工作进程时不阻塞事件循环。"""
+    pool = _PARSE_POOL
+    record = None
+    if pool is not None:
+        try:
+            record = await asyncio.get_running_loop().run_in_executor(
+                pool, parse_feed_record, content, limit, hours_ago, RSS_MAX_FEED_BYTES
+            )
+        except (BrokenProcessPool, CancelledError, RuntimeError) as e:
+            log(f"RSS 解析进程池不可用，改为线程内解析: {e}")
+    if record is None:
+        record = parse_feed_record(content, limit, hours_ago, RSS_MAX_FEED_BYTES)
+    record["bytes"] = len(content)
+    return record
+
+
+class FetchCancelled(Exception):
+    """抓取被取消（对冲的胜出方已产生、采集截止时间已到或提前结束）。"""
+
+
+class FetchCancel(threading.Event):
+    """抓取的取消信号：置位后各检查点放弃抓取，已登记的响应立即关闭，不再占用连接。
+
+    deadline（秒）为本轮采集的截止时间：到点即视为已取消，单个请求的超时也不超过剩余时间，
+    等待响应头时阻塞的线程最晚在截止时间前后返回，不会拖住进程退出。
+    """
+
+    def __init__(self, deadline: Optional[float] = None):
+        super().__init__()
+        self.deadline_at = time.monotonic() + deadline if deadline else None
+        self._lock = threading.Lock()
+        self._attached = []
+
+    def expired(self) -> bool:
+        return self.is_set() or (self.deadline_at is not None and time.monotonic() >= self.deadline_at)
+
+    def cap_timeout(self, timeout: float) -> float:
+        if self.deadline_at is None:
+            return timeout
+        return max(0.01, min(timeout, self.deadline_at - time.monotonic()))
+
+    def attach(self, target) -> None:
+        """登记置位时要关闭的对象（响应或子信号）；已置位时抛出 FetchCancelled。"""
+        with self._lock:
+            if not self.is_set():
+                self._attached.append(target)
+                return
+        raise FetchCancelled()
+
+    def detach(self, target) -> None:
+        with self._lock:
+            if target in self._attached:
+                self._attached.remove(target)
+
+    def child(self) -> "FetchCancel":
+        """继承截止时间、随本信号一起置位的子信号；对冲抓取用它单独取消落败的镜像。"""
+        child = FetchCancel()
+        child.deadline_at = self.deadline_at
+        try:
+            self.attach(child)
+        except FetchCancelled:
+            child.set()
+        return child
+
+    def set(self) -> None:
+        super().set()
+        with self._lock:
+            attached, self._attached = self._attached, []
+        for target in attached:
             try:
-                pub_time = parse_feed_datetime(item['published'])
-                # 转换为本地时区（北京时间）进行比较
-                pub_time_local = pub_time.astimezone()
+                target.close()
+            except Exception:
+                pass
 
-                # 过去24小时时间检查
-                if pub_time_local < hours_24_ago:
-                    continue
+    close = set
+
+
+def iter_until_cancelled(chunks, cancel: Optional[FetchCancel]):
+    """逐块读取，每块之前检查取消信号。"""
+    for chunk in chunks:
+        if cancel is not None and cancel.expired():
+            raise FetchCancelled()
+        yield chunk
 
-                # 记录新闻的发布时间（用于调试）
-                item['parsed_time'] = pub_time_local.strftime("%Y-%m-%d %H:%M:%S")
-            except Exception as e:
-                # 无法解析时间格式，跳过此新闻以确保内容真实性
-                # 不记录日志避免刷屏，这是正常的过滤行为
-                continue
 
-            items.append(item)
+def cancelled_feed_result(url: str) -> Dict:
+    """被取消的请求：不记为失败，也不算拥塞信号。"""
+    result = new_feed_result(url)
+    result["error"] = "cancelled"
+    return result
 
-        return items[:limit]
+
+def fetch_feed(url: str, limit: int = 10, hours_ago: int = 24, timeout: float = RSS_FETCH_TIMEOUT,
+               cancel: Optional[FetchCancel] = None) -> Dict:
+    """获取单个 RSS 地址，返回条目及抓取元信息（是否 304 命中、下载字节数、错误原因）。
+
+    cancel 置位（或其截止时间已到）后在读取下一块之前放弃，响应随即关闭，返回 error 为 "cancelled" 的结果；
+    请求超时不超过 cancel 的剩余时间。
+    """
+    if cancel is not None:
+        if cancel.expired():
+            return cancelled_feed_result(url)
+        timeout = cancel.cap_timeout(timeout)
+    result = new_feed_result(url)
+    cache_entry, headers = prepare_feed_request(url, limit, hours_ago)
+    started = time.monotonic()
+    response = None
+
+    try:
+        with get_session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if cancel is not None:
+                cancel.attach(response)
+            result["http_status"] = response.status_code
+            observe_retry_after(url, response.status_code, response.headers)
+            if response.status_code == 304 and cache_entry:
+                return reuse_cached_feed(result, cache_entry, limit, hours_ago)
+            response.raise_for_status()
+            etag = response.headers.get("ETag", "")
+            last_modified = response.headers.get("Last-Modified", "")
+            if RSS_PARSE_WORKERS:
+                # 进程池模式：只下载（受字节上限约束），解析交给工作进程
+                content = b"".join(iter_until_cancelled(iter_limited(response, RSS_MAX_FEED_BYTES, FEED_CHUNK_SIZE), cancel))
+            else:
+                # 边下载边解析，够数或遇到过期条目后关闭连接，不再读取剩余内容
+                parser = FeedStreamParser(limit, hours_ago, max_bytes=RSS_MAX_FEED_BYTES)
+                for chunk in iter_until_cancelled(response.iter_content(chunk_size=FEED_CHUNK_SIZE), cancel):
+                    if parser.feed(chunk):
+                        break
+
+        record = parse_feed_offloaded(content, limit, hours_ago) if RSS_PARSE_WORKERS else parser.record()
+        return finish_feed_fetch(result, record, etag, last_modified, limit, hours_ago)
 
     except Exception as e:
+        if cancel is not None and cancel.expired():
+            # 已被取消：关闭连接或截止时间引起的读取异常不是源的问题
+            result["error"] = "cancelled"
+            return result
         log(f"获取 RSS 失败 [{url}]: {e}")
-        return []
+        result["error"] = str(e)
+        result["congested"] = is_congestion_signal(result["http_status"], e)
+        return result
+    finally:
+        result["elapsed"] = round(time.monotonic() - started, 3)
+        if cancel is not None and response is not None:
+            cancel.detach(response)
+
+
+def fetch_rss_items(url: str, limit: int = 10, hours_ago: int = 24) -> List[Dict]:
+    """获取 RSS 条目"""
+    return fetch_feed(url, limit, hours_ago)["items"]
 
 
 def fetch_marketaux_news(limit: int = 8, hours_ago: int = 24) -> List[Dict]:
@@ -821,7 +1086,8 @@ def fetch_marketaux_news(limit: int = 8, hours_ago: int = 24) -> List[Dict]:
     }
 
     try:
-        response = requests.get(
+        response = polite_request(
+            "GET",
             "https://api.marketaux.com/v1/news/all",
             params=params,
             headers=HTTP_HEADERS,
@@ -837,7 +1103,7 @@ def fetch_marketaux_news(limit: int = 8, hours_ago: int = 24) -> List[Dict]:
     items = []
     for article in articles:
         title = clean_html_content(article.get("title", ""))
-        summary = clean_html_content(article.get("description") or article.get("snippet") or "")
+        summary = clean_html_content(article.get("description") or article.get("snippet") or "", limit=SUMMARY_LIMIT)
         published = article.get("published_at", "")
         link = article.get("url", "")
         if not title or not published or not link:
@@ -851,8 +1117,8 @@ def fetch_marketaux_news(limit: int = 8, hours_ago: int = 24) -> List[Dict]:
         items.append({
             "title": title,
             "original_title": title,
-            "summary": summary[:500],
-            "original_summary": summary[:500],
+            "summary": summary,
+            "original_summary": summary,
             "link": link,
             "published": published,
             "parsed_time": pub_time_local.strftime("%Y-%m-%d %H:%M:%S"),
@@ -945,7 +1211,8 @@ def fetch_tavily_news(category: str, needed: int = 10) -> List[Dict]:
         if len(all_items) >= needed * 2:
             break
         try:
-            resp = requests.post(
+            resp = polite_request(
+                "POST",
                 "https://api.tavily.com/search",
                 json={
                     "api_key": TAVILY_API_KEY,
@@ -970,7 +1237,7 @@ def fetch_tavily_news(category: str, needed: int = 10) -> List[Dict]:
                 seen_urls.add(url)
 
                 title = clean_html_content(result.get("title", ""))
-                content = clean_html_content(result.get("content", ""))
+                content = clean_html_content(result.get("content", ""), limit=SUMMARY_LIMIT)
                 if not title or len(title) < 8:
                     continue
 
@@ -981,8 +1248,8 @@ def fetch_tavily_news(category: str, needed: int = 10) -> List[Dict]:
                 all_items.append({
                     "title": title,
                     "original_title": title,
-                    "summary": content[:500],
-                    "original_summary": content[:500],
+                    "summary": content,
+                    "original_summary": content,
                     "link": url,
                     "published": now.strftime("%a, %d %b %Y %H:%M:%S +0000"),
                     "parsed_time": now.strftime("%Y-%m-%d %H:%M:%S"),
@@ -997,108 +1264,678 @@ def fetch_tavily_news(category: str, needed: int = 10) -> List[Dict]:
     return all_items
 
 
-def fetch_source_with_fallback(source: Dict, hours_ago: int = 24) -> tuple:
-    """并发辅助函数：获取单个 RSS 源（含 fallback），返回抓取结果与健康信息。"""
-    items = fetch_rss_items(source['url'], source['limit'], hours_ago)
+def get_source_urls(source: Dict) -> List[str]:
+    """源的全部候选地址：主地址在前，fallback 按配置顺序在后；台账排过序时使用 mirror_urls。"""
+    return source.get('mirror_urls') or [source['url']] + source.get('fallback_urls', [])
+
+
+def summarize_source_fetch(source: Dict, attempts: List[Dict], hedge_latency: float = None) -> Dict:
+    """把一个源各地址的抓取结果汇总为源级结果与健康信息。
+
+    hedge_latency 不为 None 表示本次为对冲抓取，记录胜出镜像从开始到返回的耗时，也作为源级耗时；
+    否则源级耗时为各地址依次抓取的耗时之和。
+    """
+    items = []
     used_url = source['url']
-    used_fallback = False
-
-    # 如果主URL失败且有fallback，尝试备选URL
-    if len(items) == 0 and 'fallback_urls' in source:
-        for fallback_url in source['fallback_urls']:
-            items = fetch_rss_items(fallback_url, source['limit'], hours_ago)
-            if len(items) > 0:
-                used_url = fallback_url
-                used_fallback = True
-                break
+    not_modified = attempts[0]["not_modified"] if attempts else False
+    for attempt in attempts:
+        if attempt["items"]:
+            items = attempt["items"]
+            used_url = attempt["url"]
+            not_modified = attempt["not_modified"]
+            break
 
     for item in items:
         item['rss_source'] = source['name']
 
-    return {
+    result = {
         "source_name": source['name'],
         "items": items,
         "used_url": used_url,
-        "used_fallback": used_fallback,
+        "used_fallback": used_url != source['url'],
+        "not_modified": not_modified,
+        "bytes": sum(attempt["bytes"] for attempt in attempts),
+        "xml_recoveries": sum(1 for attempt in attempts if attempt["recovered"]),
+        "truncated": any(attempt["truncated"] for attempt in attempts),
         "status": "ok" if items else "empty",
-        "attempted_urls": [source['url']] + source.get('fallback_urls', []),
+        "elapsed": round(hedge_latency if hedge_latency is not None else sum(attempt["elapsed"] for attempt in attempts), 3),
+        "attempted_urls": get_source_urls(source),
+        "url_stats": [
+            {"url": attempt["url"], "elapsed": attempt["elapsed"], "ok": attempt["status"] == "ok"}
+            for attempt in attempts
+        ],
+    }
+    if source.get('breaker'):
+        result["breaker"] = source['breaker']
+    if hedge_latency is not None:
+        result["hedged"] = True
+        result["hedge_winner"] = used_url if items else ""
+        result["hedge_latency"] = round(hedge_latency, 3)
+    return result
+
+
+def should_hedge_source(source: Dict) -> bool:
+    """只有配置了镜像（fallback_urls）的源才需要对冲抓取。"""
+    return RSS_HEDGE_MODE in ("delay", "race") and bool(source.get('fallback_urls'))
+
+
+def get_hedge_delay() -> float:
+    """race 模式同时发起全部镜像；delay 模式在上一路超过阈值仍未返回时再发起下一路。"""
+    return 0.0 if RSS_HEDGE_MODE == "race" else RSS_HEDGE_DELAY
+
+
+def new_concurrency_controller() -> AIMDController:
+    """按配置创建本次采集的自适应并发控制器。"""
+    return AIMDController(
+        initial=RSS_INITIAL_CONCURRENCY,
+        minimum=RSS_MIN_CONCURRENCY,
+        maximum=RSS_MAX_CONCURRENCY,
+        per_host=RSS_PER_HOST_LIMIT,
+    )
+
+
+def get_fetch_timeout(source: Dict, url: str) -> float:
+    """单个地址的请求超时：半开探测的源使用探测超时，其余优先使用台账给出的自适应超时。
+
+    探测超时不受自适应超时约束：连续失败的地址已被压到下限，慢源按下限探测必然再次失败、熔断无法恢复。
+    """
+    if 'fetch_timeout' in source:
+        return min(source['fetch_timeout'], RSS_FETCH_TIMEOUT)
+    return source.get('url_timeouts', {}).get(url, RSS_FETCH_TIMEOUT)
+
+
+def fetch_feed_gated(url: str, limit: int, hours_ago: int, gate: ThreadConcurrencyGate = None, timeout: float = RSS_FETCH_TIMEOUT,
+                     cancel: Optional[FetchCancel] = None) -> Dict:
+    """在自适应并发窗口和单 host 上限内抓取单个地址（线程引擎）；排队期间被取消的请求不占名额。"""
+    if gate is None:
+        return fetch_feed(url, limit, hours_ago, timeout, cancel)
+    host = urllib.parse.urlsplit(url).netloc
+    if gate.acquire(host, cancel) is None:
+        return cancelled_feed_result(url)
+    congested = False
+    try:
+        result = fetch_feed(url, limit, hours_ago, timeout, cancel)
+        congested = result["congested"]
+        return result
+    finally:
+        gate.release(host, congested)
+
+
+def fetch_source_hedged(source: Dict, hours_ago: int = 24, gate: ThreadConcurrencyGate = None,
+                        parent_cancel: Optional[FetchCancel] = None) -> Dict:
+    """对冲抓取：按镜像顺序错峰发起请求，取第一个非空解析结果，其余请求取消。"""
+    urls = get_source_urls(source)
+    delay = get_hedge_delay()
+    started = time.monotonic()
+    attempts = []
+    pending = {}
+    next_index = 0
+    next_launch_at = started
+    winner_latency = None
+    cancel = parent_cancel.child() if parent_cancel is not None else FetchCancel()
+
+    executor = ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix="rss-hedge")
+    try:
+        while winner_latency is None:
+            now = time.monotonic()
+            if next_index < len(urls) and (not pending or now >= next_launch_at):
+                future = executor.submit(fetch_feed_gated, urls[next_index], source['limit'], hours_ago, gate,
+                                         get_fetch_timeout(source, urls[next_index]), cancel)
+                pending[future] = urls[next_index]
+                next_index += 1
+                next_launch_at = now + delay
+                continue
+            if not pending:
+                break
+
+            timeout = max(0.0, next_launch_at - now) if next_index < len(urls) else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                attempt = future.result()
+                if attempt["error"] == "cancelled":
+                    continue
+                attempts.append(attempt)
+                if attempt["items"] and winner_latency is None:
+                    winner_latency = time.monotonic() - started
+                elif not attempt["items"]:
+                    # 某一路已失败或为空，立即发起下一路，不再等待阈值
+                    next_launch_at = time.monotonic()
+    finally:
+        # 未完成的镜像请求：排队中的离开闸门队列，下载中的关闭响应，尽快归还并发名额与连接
+        cancel.set()
+        if parent_cancel is not None:
+            parent_cancel.detach(cancel)
+        if gate is not None:
+            gate.wake()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    attempts.sort(key=lambda attempt: urls.index(attempt["url"]))
+    if winner_latency is None and parent_cancel is not None and parent_cancel.expired():
+        return cancelled_source_result(source, attempts)
+    return summarize_source_fetch(source, attempts, time.monotonic() - started if winner_latency is None else winner_latency)
+
+
+def cancelled_source_result(source: Dict, attempts: List[Dict]) -> Dict:
+    """被取消而未取得条目的源：status 为 cancelled，由调用方换成 timeout / early_stop 结果。"""
+    result = summarize_source_fetch(source, attempts)
+    if not result["items"]:
+        result["status"] = "cancelled"
+    return result
+
+
+def fetch_source_with_fallback(source: Dict, hours_ago: int = 24, gate: ThreadConcurrencyGate = None,
+                               cancel: Optional[FetchCancel] = None) -> Dict:
+    """并发辅助函数：获取单个 RSS 源（含 fallback），返回抓取结果与健康信息。"""
+    if should_hedge_source(source):
+        return fetch_source_hedged(source, hours_ago, gate, cancel)
+
+    attempts = []
+    # 主URL无结果时依次尝试备选URL
+    for url in get_source_urls(source):
+        attempt = fetch_feed_gated(url, source['limit'], hours_ago, gate, get_fetch_timeout(source, url), cancel)
+        if attempt["error"] == "cancelled":
+            return cancelled_source_result(source, attempts)
+        attempts.append(attempt)
+        if attempt["items"]:
+            break
+    return summarize_source_fetch(source, attempts)
+
+
+def circuit_open_source_result(source: Dict) -> Dict:
+    """熔断中被跳过的源：不发请求，仍出现在健康摘要中。"""
+    result = summarize_source_fetch(source, [])
+    result["status"] = "circuit_open"
+    result["breaker"] = "open"
+    return result
+
+
+def timeout_source_result(source: Dict, deadline: float) -> Dict:
+    """采集截止时仍未完成的源：记为 timeout，不带任何条目，耗时按截止时间计。"""
+    result = summarize_source_fetch(source, [])
+    result["status"] = "timeout"
+    result["elapsed"] = round(deadline, 3)
+    return result
+
+
+def early_stop_source_result(source: Dict) -> Dict:
+    """候选已足够、提前结束时仍未完成或未开始的源：不带任何条目，不计入台账。"""
+    result = summarize_source_fetch(source, [])
+    result["status"] = "early_stop"
+    return result
+
+
+def iter_source_results_threaded(sources: List[Dict], hours_ago: int = 24, deadline: float = None, controller: AIMDController = None):
+    """线程池引擎：按完成顺序产出源级结果，实际并发由自适应并发控制器决定。
+
+    设置 deadline（秒）时，到点后未完成的源产出 timeout 结果；本轮共用的取消信号随之置位，
+    闸门上排队的请求不占名额直接离开，下载中的请求关闭连接，请求超时也不超过剩余时间，
+    工作线程在截止时间后很快结束，不会拖住进程退出。
+    调用方提前关闭生成器（提前结束采集）时同样置位取消信号，并取消尚未开始的源。
+    """
+    controller = controller or new_concurrency_controller()
+    gate = ThreadConcurrencyGate(controller, HOST_RATE_LIMITER)
+    cancel = FetchCancel(deadline)
+    # 线程数取并发上限，超出当前并发窗口的线程在闸门上排队
+    executor = ThreadPoolExecutor(max_workers=controller.maximum, thread_name_prefix="rss-fetch")
+    futures = {executor.submit(fetch_source_with_fallback, source, hours_ago, gate, cancel): source for source in sources}
+    yielded = set()
+
+    def settle(future, source: Dict) -> Dict:
+        result = future.result() if future.done() else None
+        return timeout_source_result(source, deadline) if result is None or result["status"] == "cancelled" else result
+
+    try:
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                yielded.add(future)
+                yield settle(future, futures[future])
+        except FuturesTimeoutError:
+            cancel.set()
+            gate.wake()
+            for future, source in futures.items():
+                if future in yielded:
+                    continue
+                yield settle(future, source)
+    finally:
+        # 进行中的请求由取消信号尽快结束，不等待它们；尚未开始的源直接取消
+        cancel.set()
+        gate.wake()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def fetch_feed_async(session, url: str, limit: int = 10, hours_ago: int = 24, timeout: float = RSS_FETCH_TIMEOUT) -> Dict:
+    """asyncio 版 fetch_feed：在事件循环上下载，解析与缓存逻辑与线程引擎一致。"""
+    result = new_feed_result(url)
+    cache_entry, headers = prepare_feed_request(url, limit, hours_ago)
+    started = time.monotonic()
+
+    try:
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            result["http_status"] = response.status
+            observe_retry_after(url, response.status, response.headers)
+            if response.status == 304 and cache_entry:
+                return reuse_cached_feed(result, cache_entry, limit, hours_ago)
+            response.raise_for_status()
+            etag = response.headers.get("ETag", "")
+            last_modified = response.headers.get("Last-Modified", "")
+            parser = None if RSS_PARSE_WORKERS else FeedStreamParser(limit, hours_ago, max_bytes=RSS_MAX_FEED_BYTES)
+            chunks = []
+            size = 0
+            async for chunk in response.content.iter_chunked(FEED_CHUNK_SIZE):
+                if RSS_PARSE_WORKERS:
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= RSS_MAX_FEED_BYTES:
+                        break
+                elif parser.feed(chunk):
+                    break
+
+        if RSS_PARSE_WORKERS:
+            record = await parse_feed_offloaded_async(b"".join(chunks)[:RSS_MAX_FEED_BYTES], limit, hours_ago)
+        else:
+            record = parser.record()
+        return finish_feed_fetch(result, record, etag, last_modified, limit, hours_ago)
+
+    except Exception as e:
+        log(f"获取 RSS 失败 [{url}]: {e or type(e).__name__}")
+        result["error"] = str(e) or type(e).__name__
+        result["congested"] = is_congestion_signal(result["http_status"], e)
+        return result
+    finally:
+        result["elapsed"] = round(time.monotonic() - started, 3)
+
+
+async def fetch_feed_limited_async(session, url: str, limit: int, hours_ago: int, gate: AsyncConcurrencyGate, timeout: float = RSS_FETCH_TIMEOUT) -> Dict:
+    """在自适应并发窗口和单 host 上限内抓取单个地址。"""
+    host = urllib.parse.urlsplit(url).netloc
+    await gate.acquire(host)
+    congested = False
+    try:
+        result = await fetch_feed_async(session, url, limit, hours_ago, timeout)
+        congested = result["congested"]
+        return result
+    finally:
+        gate.release(host, congested)
+
+
+async def fetch_source_hedged_async(session, source: Dict, hours_ago: int, gate: AsyncConcurrencyGate) -> Dict:
+    """asyncio 版对冲抓取：取第一个非空解析结果，并取消其余仍在进行的镜像请求。"""
+    urls = get_source_urls(source)
+    delay = get_hedge_delay()
+    started = time.monotonic()
+    attempts = []
+    pending = {}
+    next_index = 0
+    next_launch_at = started
+    winner_latency = None
+
+    try:
+        while winner_latency is None:
+            now = time.monotonic()
+            if next_index < len(urls) and (not pending or now >= next_launch_at):
+                task = asyncio.ensure_future(fetch_feed_limited_async(
+                    session, urls[next_index], source['limit'], hours_ago, gate, get_fetch_timeout(source, urls[next_index])
+                ))
+                pending[task] = urls[next_index]
+                next_index += 1
+                next_launch_at = now + delay
+                continue
+            if not pending:
+                break
+
+            timeout = max(0.0, next_launch_at - now) if next_index < len(urls) else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.pop(task)
+                attempt = task.result()
+                attempts.append(attempt)
+                if attempt["items"] and winner_latency is None:
+                    winner_latency = time.monotonic() - started
+                elif not attempt["items"]:
+                    next_launch_at = time.monotonic()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    attempts.sort(key=lambda attempt: urls.index(attempt["url"]))
+    return summarize_source_fetch(source, attempts, time.monotonic() - started if winner_latency is None else winner_latency)
+
+
+async def fetch_source_with_fallback_async(session, source: Dict, hours_ago: int, gate: AsyncConcurrencyGate) -> Dict:
+    """asyncio 版 fetch_source_with_fallback：每个地址同时受自适应并发窗口和单 host 上限约束。"""
+    if should_hedge_source(source):
+        return await fetch_source_hedged_async(session, source, hours_ago, gate)
+
+    attempts = []
+    for url in get_source_urls(source):
+        attempts.append(await fetch_feed_limited_async(session, url, source['limit'], hours_ago, gate, get_fetch_timeout(source, url)))
+        if attempts[-1]["items"]:
+            break
+    return summarize_source_fetch(source, attempts)
+
+
+async def collect_sources_async(sources: List[Dict], hours_ago: int, on_result, deadline: float = None, controller: AIMDController = None, stop: threading.Event = None) -> None:
+    """在单个事件循环上抓取全部源（含 fallback），每完成一个源回调一次。
+
+    设置 deadline（秒）时，到点后取消未完成的抓取，并以 timeout 结果回调；
+    stop 被设置时（调用方已不再需要结果）取消未完成的抓取，不再回调。
+    """
+    controller = controller or new_concurrency_controller()
+    gate = AsyncConcurrencyGate(controller, HOST_RATE_LIMITER)
+    connector = aiohttp.TCPConnector(
+        limit=controller.maximum,
+        limit_per_host=controller.per_host,
+        ssl=SSL_CONTEXT,
+    )
+
+    async def run_source(source: Dict) -> None:
+        try:
+            result = await fetch_source_with_fallback_async(session, source, hours_ago, gate)
+        except Exception as e:
+            log(f"获取 RSS 源失败 [{source['name']}]: {e}")
+            result = summarize_source_fetch(source, [])
+        on_result(result)
+
+    async with aiohttp.ClientSession(connector=connector, headers=HTTP_HEADERS) as session:
+        tasks = {asyncio.create_task(run_source(source)): source for source in sources}
+        if not tasks:
+            return
+        pending = set(tasks)
+        wait_until = None if deadline is None else time.monotonic() + deadline
+        while pending and not (stop and stop.is_set()):
+            timeout = EARLY_STOP_POLL_INTERVAL if stop else None
+            if wait_until is not None:
+                remaining = wait_until - time.monotonic()
+                if remaining <= 0:
+                    break
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            _, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if stop and stop.is_set():
+            return
+        for task in pending:
+            on_result(timeout_source_result(tasks[task], deadline))
+
+
+def iter_source_results_async(sources: List[Dict], hours_ago: int = 24, deadline: float = None, controller: AIMDController = None):
+    """asyncio 引擎：事件循环跑在后台线程，结果经队列按完成顺序产出。
+
+    调用方提前关闭生成器时通知事件循环取消其余抓取。
+    """
+    results: "queue.Queue" = queue.Queue()
+    done = object()
+    stop = threading.Event()
+
+    def run_loop() -> None:
+        try:
+            asyncio.run(collect_sources_async(sources, hours_ago, results.put, deadline, controller, stop))
+        except Exception as e:
+            log(f"asyncio 采集引擎异常: {e}")
+        finally:
+            results.put(done)
+
+    threading.Thread(target=run_loop, name="rss-asyncio", daemon=True).start()
+    try:
+        while True:
+            result = results.get()
+            if result is done:
+                break
+            yield result
+    finally:
+        stop.set()
+
+
+def iter_source_results(sources: List[Dict], hours_ago: int = 24, engine: str = "thread", deadline: float = None, controller: AIMDController = None):
+    """按配置选择采集引擎；未安装 aiohttp 时 asyncio 引擎自动回退到线程池。"""
+    if engine == "async":
+        if aiohttp is not None:
+            return iter_source_results_async(sources, hours_ago, deadline, controller)
+        log("警告: 未安装 aiohttp，asyncio 采集引擎回退到线程池")
+    return iter_source_results_threaded(sources, hours_ago, deadline, controller)
+
+
+def source_health_entry(result: Dict) -> Dict:
+    """源级结果对应的健康摘要条目（写入 rss_source_health）。"""
+    health = {
+        "source": result["source_name"],
+        "item_count": len(result["items"]),
+        "status": result["status"],
+        "used_fallback": result["used_fallback"],
+        "used_url": result["used_url"],
+        "not_modified": result["not_modified"],
+        "bytes": result["bytes"],
+        "xml_recoveries": result["xml_recoveries"],
+        "truncated": result["truncated"],
+        "elapsed": result["elapsed"],
     }
+    if result.get("hedged"):
+        health["hedge_winner"] = result["hedge_winner"]
+        health["hedge_latency"] = result["hedge_latency"]
+    if result.get("breaker"):
+        health["breaker"] = result["breaker"]
+    return health
+
+
+class NewsCandidateStage:
+    """候选新闻的增量过滤与去重：每个源的结果一到就处理，CPU 工作与仍在进行的抓取重叠。
+
+    按到达顺序依次过滤无效标题、链接重复（url_canon.link_key 哈希集合，O(1)）、近几天已发布过的新闻（传入 published 时）、
+    标题精确去重（忽略大小写）与字符级 Jaccard 模糊去重，结果与对全部条目一次性处理相同；
+    链接相同的转载先被剔除，进入模糊去重的条目更少，模糊去重由 TitleDedupIndex 完成：候选不足 EXACT_SCAN_LIMIT 条时逐一精确比较，超过后改由 MinHash/LSH 筛选候选（近似，阈值附近少量漏判）。
+    """
+
+    def __init__(self, published: Optional[PublishedStore] = None):
+        self.published = published
+        self.title_index = TitleDedupIndex()
+        self.seen_links = set()
+        self.unique_items: List[Dict] = []
+        self.invalid_count = 0
+        self.link_duplicate_count = 0
+        self.published_count = 0
+        # 各分类的有效去重候选数（infer_item_category 即时推断），用于提前结束采集
+        self.category_counts = {category: 0 for category in CATEGORIES}
+
+    def has_surplus(self, target: int) -> bool:
+        """每个分类都已至少有 target 条候选。"""
+        return all(count >= target for count in self.category_counts.values())
+
+    def add(self, items: List[Dict]) -> None:
+        for item in items:
+            title = item['title']
+            title_lower = title.lower()
+
+            # 检查标题是否有效
+            if not is_valid_news_title(title):
+                self.invalid_count += 1
+                log(f"  过滤无效标题: {title[:30]}...")
+                continue
+
+            link = link_key(item.get('link'), REDIRECT_CACHE)
+            if link and link in self.seen_links:
+                self.link_duplicate_count += 1
+                log(f"  链接去重过滤: {title[:30]}...")
+                continue
+
+            if self.published and self.published.contains(item):
+                self.published_count += 1
+                log(f"  已发布过滤: {title[:30]}...")
+                continue
 
+            if title_lower not in self.title_index and title != '无标题':
+                # 模糊去重：检查与已有标题的字符级 Jaccard 相似度
+                if not self.title_index.add_if_new(title_lower):
+                    log(f"  模糊去重过滤: {title[:30]}...")
+                    continue
+                if link:
+                    self.seen_links.add(link)
+                self.unique_items.append(item)
+                self.category_counts[infer_item_category(item)] += 1
+
+
+def collect_all_news(
+    hours_ago: int = 24,
+    engine: str = None,
+    deadline: float = None,
+    early_stop: int = None,
+    exclude_published: bool = True,
+) -> List[Dict]:
+    """收集所有 RSS 新闻（自适应并发，默认线程池，可切换 asyncio 引擎），支持 fallback URLs
+
+    deadline 为采集总截止秒数（None 取 RSS_COLLECT_DEADLINE，0 不限时），超时的源记为 timeout。
+    每个源的条目在结果到达时即进入 NewsCandidateStage 过滤去重，最后一个源返回时候选集即已就绪。
+    early_stop 为每个分类所需的候选数（None 取 RSS_EARLY_STOP，0 关闭）：开启时按历史产出从高到低提交，
+    各分类候选都已足够后跳过其余未完成的源，这些源记为 early_stop。
+    exclude_published 为 True 时剔除近几天已发布过的新闻（PUBLISHED_STORE），周报需要回顾整周时传 False。
+    去重后的候选再按事件聚类（EVENT_CLUSTER_HOURS），每个事件只返回一条代表，event_size 为报道条数，
+    其余报道存于代表的 event_members。
+    """
+    global LAST_RSS_HEALTH, LAST_RSS_CONCURRENCY
 
-def collect_all_news(hours_ago: int = 24) -> List[Dict]:
-    """收集所有 RSS 新闻（并发模式，10线程），支持 fallback URLs"""
-    global LAST_RSS_HEALTH
+    engine = engine or RSS_FETCH_ENGINE
+    deadline = RSS_COLLECT_DEADLINE if deadline is None else deadline
+    early_stop = RSS_EARLY_STOP if early_stop is None else early_stop
 
     # 计算时间范围用于日志
     now = datetime.now().astimezone()
     cutoff_time = now - timedelta(hours=hours_ago)
 
-    log(f"开始收集 RSS 新闻（并发模式，{len(ALL_RSS_SOURCES)} 个源）...")
+    log(f"开始收集 RSS 新闻（并发模式，{len(ALL_RSS_SOURCES)} 个源，引擎: {engine}）...")
     log(f"时间过滤范围: 过去{hours_ago}小时 ({cutoff_time.strftime('%Y-%m-%d %H:%M:%S')} - {now.strftime('%Y-%m-%d %H:%M:%S')})")
+    if deadline:
+        log(f"采集截止时间: {deadline:g}s，超时的源将被放弃")
+    if early_stop:
+        log(f"提前结束模式: 每个分类有 {early_stop} 条有效候选后跳过其余源")
 
-    all_items = []
+    candidates = NewsCandidateStage(PUBLISHED_STORE if exclude_published else None)
     source_health = []
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {executor.submit(fetch_source_with_fallback, source, hours_ago): source for source in ALL_RSS_SOURCES}
-        for future in as_completed(futures):
-            result = future.result()
+    sources = ALL_RSS_SOURCES
+    skipped_results = []
+    if SOURCE_LEDGER:
+        sources = SOURCE_LEDGER.plan_sources(ALL_RSS_SOURCES, get_source_urls, RSS_FETCH_TIMEOUT)
+        promoted = [source['name'] for source in sources if source.get('mirror_urls', [source['url']])[0] != source['url']]
+        if SOURCE_LEDGER.sources and not early_stop:
+            log(f"按历史耗时从长到短提交，预期最慢: {', '.join(source['name'] for source in sources[:3])}")
+        if promoted:
+            log(f"  优先使用历史最快镜像: {', '.join(promoted)}")
+        shortened = sum(1 for source in sources if source.get('url_timeouts'))
+        if shortened:
+            log(f"  自适应超时: {shortened} 个源按历史耗时缩短请求超时")
+        if early_stop:
+            # 提前结束模式下优先抓取历史产出高的源
+            sources = SOURCE_LEDGER.order_by_yield(sources)
+        sources, skipped_sources = SOURCE_LEDGER.apply_breaker(sources)
+        skipped_results = [circuit_open_source_result(source) for source in skipped_sources]
+        probing = [source['name'] for source in sources if source.get('breaker') == "half_open"]
+        if probing:
+            log(f"  熔断半开探测（{RSS_BREAKER_PROBE_TIMEOUT:g}s 超时）: {', '.join(probing)}")
+
+    # 解析进程在抓取线程启动前拉起，采集结束（含异常退出）时等工作进程全部退出
+    with parse_pool_scope():
+        if RSS_PARSE_WORKERS:
+            log(f"RSS 解析进程池: {RSS_PARSE_WORKERS} 个工作进程")
+
+        controller = new_concurrency_controller()
+        fetched_results = iter_source_results(sources, hours_ago, engine, deadline or None, controller)
+        reported = set()
+        early_stopped = False
+        for result in itertools.chain(skipped_results, fetched_results):
             source_name = result["source_name"]
             items = result["items"]
-            log(f"  - {source_name}: 获取 {len(items)} 条")
-            all_items.extend(items)
-            source_health.append({
-                "source": source_name,
-                "item_count": len(items),
-                "status": result["status"],
-                "used_fallback": result["used_fallback"],
-                "used_url": result["used_url"],
-            })
+            if result["status"] == "circuit_open":
+                log(f"  - {source_name}: 熔断中，本次跳过")
+            elif result["status"] == "timeout":
+                log(f"  - {source_name}: 超过采集截止时间，已放弃")
+            elif result.get("hedged") and result["hedge_winner"]:
+                log(f"  - {source_name}: 获取 {len(items)} 条（对冲命中 {urllib.parse.urlsplit(result['hedge_winner']).netloc}，{result['hedge_latency']:.1f}s）")
+            else:
+                log(f"  - {source_name}: 获取 {len(items)} 条")
+            candidates.add(items)
+            source_health.append(source_health_entry(result))
+            if SOURCE_LEDGER:
+                SOURCE_LEDGER.record(result)
+            reported.add(source_name)
+            if early_stop and candidates.has_surplus(early_stop):
+                early_stopped = True
+                break
+
+        if early_stopped:
+            # 关闭结果生成器：取消进行中的请求（排队的不再占名额），取消尚未开始的源
+            fetched_results.close()
+            remaining = [source for source in sources if source['name'] not in reported]
+            counts_text = '，'.join(f"{category} {count}" for category, count in candidates.category_counts.items())
+            log(f"候选已足够（{counts_text}），提前结束采集，跳过 {len(remaining)} 个未完成的源")
+            for source in remaining:
+                source_health.append(source_health_entry(early_stop_source_result(source)))
+
+    if SOURCE_LEDGER:
+        SOURCE_LEDGER.save()
+
+    LAST_RSS_CONCURRENCY = controller.snapshot()
+    log(
+        f"自适应并发: 最终 {LAST_RSS_CONCURRENCY['final_limit']}（峰值 {LAST_RSS_CONCURRENCY['peak_limit']}，"
+        f"最低 {LAST_RSS_CONCURRENCY['lowest_limit']}，减速 {LAST_RSS_CONCURRENCY['decreases']} 次），"
+        f"单 host 上限 {LAST_RSS_CONCURRENCY['per_host_limit']}"
+    )
+    queued_hosts = sorted(LAST_RSS_CONCURRENCY["hosts"].items(), key=lambda entry: entry[1]["total_wait"], reverse=True)
+    queued_hosts = [(host, stats) for host, stats in queued_hosts if stats["total_wait"] >= 0.1]
+    if queued_hosts:
+        queued_text = ', '.join(f"{host}({stats['total_wait']:.1f}s)" for host, stats in queued_hosts[:5])
+        log(f"  host 排队等待: {queued_text}")
 
     LAST_RSS_HEALTH = sorted(source_health, key=lambda item: (item["item_count"], item["source"]))
     healthy_sources = [item for item in LAST_RSS_HEALTH if item["item_count"] > 0]
     empty_sources = [item for item in LAST_RSS_HEALTH if item["item_count"] == 0]
     fallback_sources = [item for item in LAST_RSS_HEALTH if item["used_fallback"]]
+    not_modified_sources = [item for item in LAST_RSS_HEALTH if item["not_modified"]]
+    recovered_sources = [item for item in LAST_RSS_HEALTH if item["xml_recoveries"]]
+    timeout_sources = [item for item in LAST_RSS_HEALTH if item["status"] == "timeout"]
+    circuit_open_sources = [item for item in LAST_RSS_HEALTH if item["status"] == "circuit_open"]
+    early_stop_sources = [item for item in LAST_RSS_HEALTH if item["status"] == "early_stop"]
+    total_bytes = sum(item["bytes"] for item in LAST_RSS_HEALTH)
     log(
         f"RSS源健康检查: 正常{len(healthy_sources)}个，空返回{len(empty_sources)}个，"
-        f"fallback命中{len(fallback_sources)}个"
+        f"fallback命中{len(fallback_sources)}个，304缓存命中{len(not_modified_sources)}个，"
+        f"XML修复{len(recovered_sources)}个，超时{len(timeout_sources)}个，熔断跳过{len(circuit_open_sources)}个，下载{total_bytes / 1024:.0f}KB"
     )
     if empty_sources:
         log(f"  空返回源: {', '.join(item['source'] for item in empty_sources[:12])}")
     if fallback_sources:
         log(f"  fallback源: {', '.join(item['source'] for item in fallback_sources[:8])}")
+    if timeout_sources:
+        log(f"  超时源: {', '.join(item['source'] for item in timeout_sources[:12])}")
+    if circuit_open_sources:
+        log(f"  熔断跳过源: {', '.join(item['source'] for item in circuit_open_sources[:12])}")
+    if early_stop_sources:
+        log(f"  提前结束未抓取源: {', '.join(item['source'] for item in early_stop_sources[:12])}")
+    if recovered_sources:
+        recovered_text = ', '.join(f"{item['source']}({item['xml_recoveries']})" for item in recovered_sources[:8])
+        log(f"  XML修复源: {recovered_text}")
 
     external_items = maybe_collect_external_news(LAST_RSS_HEALTH)
     if external_items:
-        all_items.extend(external_items)
         log(f"第三方 API 补充: 获取 {len(external_items)} 条候选新闻")
-
-    # 去重（基于标题）
-    seen_titles = set()
-    unique_items = []
-    invalid_count = 0
-    for item in all_items:
-        title = item['title']
-        title_lower = title.lower()
-
-        # 检查标题是否有效
-        if not is_valid_news_title(title):
-            invalid_count += 1
-            log(f"  过滤无效标题: {title[:30]}...")
-            continue
-
-        if title_lower not in seen_titles and title != '无标题':
-            # 模糊去重：检查与已有标题的字符级 Jaccard 相似度
-            is_duplicate = any(is_similar_title(title_lower, existing) for existing in seen_titles)
-            if is_duplicate:
-                log(f"  模糊去重过滤: {title[:30]}...")
-                continue
-            seen_titles.add(title_lower)
-            unique_items.append(item)
-
-    if invalid_count > 0:
-        log(f"已过滤 {invalid_count} 条无效标题")
-
+        candidates.add(external_items)
+
+    if candidates.invalid_count > 0:
+        log(f"已过滤 {candidates.invalid_count} 条无效标题")
+    if candidates.link_duplicate_count > 0:
+        log(f"已过滤 {candidates.link_duplicate_count} 条链接重复的新闻")
+    if candidates.published_count > 0:
+        log(f"已过滤 {candidates.published_count} 条近 {PUBLISHED_STORE_DAYS} 天已发布的新闻")
+
+    unique_items = candidates.unique_items
+    if EVENT_CLUSTER_HOURS and unique_items:
+        events = collapse_events(unique_items, EVENT_CLUSTER_HOURS)
+        corroborated = [item for item in events if item["event_size"] > 1]
+        if corroborated:
+            log(f"事件聚类: {len(unique_items)} 条新闻归为 {len(events)} 个事件，其中 {len(corroborated)} 个有多个来源报道")
+        unique_items = events
     log(f"收集完成，共获取 {len(unique_items)} 条去重后新闻")
     return unique_items
 
@@ -1117,7 +1954,10 @@ def classify_news_with_ai(news_items: List[Dict], weekly: bool = False) -> Dict[
         news_text += f"{i}. 标题: {item['title']}\n"
         if item['summary']:
             news_text += f"   摘要: {item['summary'][:200]}\n"
-        news_text += f"   来源: {item['rss_source']}\n\n"
+        news_text += f"   来源: {item['rss_source']}\n"
+        if item.get('event_size', 1) > 1:
+            news_text += f"   报道数: {item['event_size']}（{'、'.join(item.get('event_sources', [])[:5])}）\n"
+        news_text += "\n"
 
     if weekly:
         intro = "你是专业新闻编辑，负责筛选和分类本周科技财经新闻。请从以下新闻中，为每个类别各选出5条本周最重要的新闻。"
@@ -1152,9 +1992,10 @@ def classify_news_with_ai(news_items: List[Dict], weekly: bool = False) -> Dict[
 
 【去重规则——重要！】
 如果多条新闻报道同一事件（同一公司的同一融资/同一产品/同一政策），只选其中最重要的1条，不重复选择同一事件的不同角度报道。
+标注了"报道数"的新闻已合并了多个来源对同一事件的报道。
 
 【选择优先级】
-优先选择：知名公司/大额融资/重大政策/行业重磅消息
+优先选择：知名公司/大额融资/重大政策/行业重磅消息、报道数多的事件
 降低优先级：学术小组研究、行业综述、分析师评论（如果没有更好的选择才用）
 
 请按以下 JSON 格式输出（只输出 JSON，不要其他文字）：
@@ -1215,6 +2056,12 @@ def classify_news_with_ai(news_items: List[Dict], weekly: bool = False) -> Dict[
         log(f"原始结果: {result[:500]}")
         return classify_news_with_rules(news_items)
 
+def new_page_decoder(response, head: bytes):
+    """按响应头与页面开头字节确定编码，返回增量解码器。"""
+    charset = resolve_charset(response.headers.get("Content-Type", ""), head)
+    return codecs.getincrementaldecoder(charset)(errors="replace")
+
+
 def fetch_article_context(url: str) -> Dict[str, str]:
     """抓取原文页面上下文，用于补全主体名和关键信息。"""
     if not url or not url.startswith("http"):
@@ -1223,6 +2070,11 @@ def fetch_article_context(url: str) -> Dict[str, str]:
     if url in ARTICLE_CONTEXT_CACHE:
         return dict(ARTICLE_CONTEXT_CACHE[url])
 
+    cached = PAGE_CACHE.get(url) if PAGE_CACHE else None
+    if cached is not None:
+        ARTICLE_CONTEXT_CACHE[url] = cached
+        return dict(cached)
+
     context = {
         "page_title": "",
         "page_h1": "",
@@ -1230,55 +2082,79 @@ def fetch_article_context(url: str) -> Dict[str, str]:
         "page_excerpt": "",
     }
 
+    host = urllib.parse.urlsplit(url).netloc
+    timeout = SOURCE_LEDGER.host_timeout(host, ARTICLE_FETCH_TIMEOUT) if SOURCE_LEDGER else ARTICLE_FETCH_TIMEOUT
+    started = time.monotonic()
     try:
-        response = requests.get(url, headers=HTTP_HEADERS, timeout=15)
-        response.raise_for_status()
-        raw_html = response.text
-
-        title_match = re.search(r"<title>(.*?)</title>", raw_html, re.IGNORECASE | re.DOTALL)
-        if title_match:
-            context["page_title"] = clean_html_content(title_match.group(1))[:200]
-
-        h1_match = re.search(r"<h1[^>]*>(.*?)</h1>", raw_html, re.IGNORECASE | re.DOTALL)
-        if h1_match:
-            context["page_h1"] = clean_html_content(h1_match.group(1))[:200]
-
-        meta_match = re.search(
-            r'<meta[^>]+(?:name|property)=["\'](?:description|og:description)["\'][^>]+content=["\'](.*?)["\']',
-            raw_html,
-            re.IGNORECASE | re.DOTALL,
-        )
-        if meta_match:
-            context["meta_description"] = clean_html_content(meta_match.group(1))[:300]
-
-        text_html = re.sub(r"<script[^>]*>.*?</script>", " ", raw_html, flags=re.IGNORECASE | re.DOTALL)
-        text_html = re.sub(r"<style[^>]*>.*?</style>", " ", text_html, flags=re.IGNORECASE | re.DOTALL)
-        text_html = re.sub(r"<noscript[^>]*>.*?</noscript>", " ", text_html, flags=re.IGNORECASE | re.DOTALL)
-        context["page_excerpt"] = clean_html_content(text_html)[:1500]
+        extractor = ArticleContextExtractor()
+        HOST_RATE_LIMITER.acquire(host)
+        started = time.monotonic()
+        with get_session().get(url, headers=HTTP_HEADERS, timeout=timeout, stream=True) as response:
+            observe_retry_after(url, response.status_code, response.headers)
+            response.raise_for_status()
+            if is_redirect_link(url):
+                REDIRECT_CACHE.record(url, response.url)
+            decoder = None
+            head = b""
+            # 边下载边解析，拿到标题、导语和正文摘录后立即停止读取；
+            # 先攒够页面开头几 KB 确定编码，之后每个字节只解码一次
+            for chunk in iter_limited(response, ARTICLE_MAX_BYTES):
+                if decoder is None:
+                    head += chunk
+                    if len(head) < CHARSET_SNIFF_BYTES:
+                        continue
+                    chunk, head = head, b""
+                    decoder = new_page_decoder(response, chunk)
+                if extractor.feed(decoder.decode(chunk)):
+                    break
+            if decoder is None and head:
+                decoder = new_page_decoder(response, head)
+                extractor.feed(decoder.decode(head))
+        if not extractor.done:
+            if decoder is not None:
+                extractor.feed(decoder.decode(b"", final=True))
+            extractor.close()
+        if SOURCE_LEDGER:
+            SOURCE_LEDGER.record_host(host, time.monotonic() - started, True)
+
+        context.update(extractor.context())
+        # 只持久化成功抓取的页面，失败的下次运行重新尝试
+        if PAGE_CACHE:
+            PAGE_CACHE.put(url, context)
     except Exception as e:
         log(f"抓取原文上下文失败 [{url}]: {e}")
+        if SOURCE_LEDGER:
+            SOURCE_LEDGER.record_host(host, time.monotonic() - started, False)
 
     ARTICLE_CONTEXT_CACHE[url] = context
     return dict(context)
 
 
 def enrich_selected_news_context(categorized: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
-    """为入选新闻补充原文页面标题/导语，降低主体缺失概率。"""
+    """为入选新闻补充原文页面标题/导语，降低主体缺失概率。
+
+    各条新闻的原文页面用有界线程池并发抓取，结果按原顺序回填。
+    """
     log("正在补充入选新闻的原文上下文...")
 
-    total = 0
+    items = [item for category_items in categorized.values() for item in category_items]
+    for item in items:
+        item.setdefault("original_title", item.get("title", ""))
+        item.setdefault("original_summary", item.get("summary", ""))
+
     enriched = 0
-    for items in categorized.values():
-        for item in items:
-            total += 1
-            item.setdefault("original_title", item.get("title", ""))
-            item.setdefault("original_summary", item.get("summary", ""))
-            context = fetch_article_context(item.get("link", ""))
+    if items:
+        with ThreadPoolExecutor(max_workers=min(ARTICLE_FETCH_WORKERS, len(items))) as executor:
+            contexts = list(executor.map(fetch_article_context, [item.get("link", "") for item in items]))
+        for item, context in zip(items, contexts):
             item.update(context)
             if any(context.values()):
                 enriched += 1
 
-    log(f"原文上下文补充完成: {enriched}/{total} 条")
+    log(f"原文上下文补充完成: {enriched}/{len(items)} 条")
+    if SOURCE_LEDGER:
+        SOURCE_LEDGER.save()
+    REDIRECT_CACHE.save()
     return categorized
 
 
@@ -1375,7 +2251,7 @@ def extract_subject_candidates(text: str) -> List[str]:
     seen = set()
 
     def add_candidate(raw: str):
-        candidate = clean_html_content(raw)
+        candidate = clean_html_cached(raw)
         candidate = candidate.strip(" ,，。：:；;（）()【】[]“”\"'")
         if not candidate or len(candidate) < 2 or len(candidate) > 40:
             return
@@ -1427,7 +2303,7 @@ def extract_subject_candidates(text: str) -> List[str]:
 
 def normalize_material_text(text: str) -> str:
     """清理素材句子里的站点噪音和时间前缀。"""
-    text = clean_html_content(text)
+    text = clean_html_cached(text)
     if not text:
         return ""
 
@@ -1462,7 +2338,7 @@ def score_subject_candidate(candidate: str, item: Dict) -> int:
     if not candidate:
         return -100
 
-    candidate = clean_html_content(candidate)
+    candidate = clean_html_cached(candidate)
     compact = re.sub(r"\s+", "", candidate)
     lower_candidate = compact.lower()
     if is_generic_subject(compact):
@@ -1750,7 +2626,7 @@ def parse_json_payload(result: str, fallback):
 
 def validate_rewritten_title(item: Dict, subject: str, title: str) -> tuple:
     """校验生成的新闻简讯是否满足事实性和可读性要求。"""
-    subject = clean_html_content(subject)
+    subject = clean_html_cached(subject)
     title = compact_title_text(title)
 
     if not subject:
@@ -2410,13 +3286,15 @@ def format_news_to_html(categorized: Dict[str, List[Dict]], yesterday_str: str,
     return html_template, summary
 
 def save_raw_news(news_items: List[Dict], categorized: Dict[str, List[Dict]], date_str: str, summary: str = ""):
-    """保存原始新闻数据为 JSON"""
+    """保存原始新闻数据为 JSON；news_items 是事件代表，total_news 仍按报道条数统计（含 event_members）"""
     raw_data = {
         "date": date_str,
-        "total_news": len(news_items),
+        "total_news": len(expand_event_members(news_items)),
+        "total_events": len(news_items),
         "categorized_count": {cat: len(items) for cat, items in categorized.items()},
         "summary": summary,  # 添加智能摘要
         "rss_source_health": LAST_RSS_HEALTH,
+        "rss_concurrency": LAST_RSS_CONCURRENCY,
         "external_source_health": LAST_EXTERNAL_HEALTH,
         "all_news": news_items,
         "categorized_news": categorized
@@ -2435,6 +3313,12 @@ def main():
     parser = argparse.ArgumentParser(description="RSS 新闻收集器")
     parser.add_argument("--weekly", action="store_true", help="周报模式（收集过去7天新闻）")
     parser.add_argument("--dry-run", action="store_true", help="试运行（不写文件）")
+    parser.add_argument("--engine", choices=RSS_FETCH_ENGINES, default=None,
+                        help="RSS 采集引擎：thread（默认）或 async（需要 aiohttp），也可用 RSS_FETCH_ENGINE 配置")
+    parser.add_argument("--collect-deadline", type=parse_duration, default=None, metavar="DURATION",
+                        help="RSS 采集总截止时间，如 45s / 2m，到点后用已获取的结果继续；也可用 RSS_COLLECT_DEADLINE 配置")
+    parser.add_argument("--early-stop", type=int, default=None, metavar="N",
+                        help="每个分类都有 N 条有效去重候选后提前结束采集（0 关闭）；也可用 RSS_EARLY_STOP 配置")
     args = parser.parse_args()
 
     log("=" * 50)
@@ -2464,7 +3348,14 @@ def main():
         week_range = ""
 
     # 1. 收集所有 RSS 新闻
-    all_news = collect_all_news(hours_ago=hours_ago)
+    # 周报回顾整周，不剔除本周日报已发布过的新闻
+    all_news = collect_all_news(
+        hours_ago=hours_ago,
+        engine=args.engine,
+        deadline=args.collect_deadline,
+        early_stop=args.early_stop,
+        exclude_published=not args.weekly,
+    )
 
     # 1.5 RSS 新闻数量检查（不使用 AI 补充，确保内容全部来自真实 RSS 源）
     if len(all_news) == 0:
@@ -2511,11 +3402,14 @@ def main():
         for cat_items in categorized_news.values():
             for item in cat_items:
                 used_titles.add(item.get('title', '').lower())
-        # 找出还没被分类的新闻
-        unused_news = [n for n in all_news if n.get('title', '').lower() not in used_titles]
+        # 找出还没被分类的新闻；事件聚类收起的同事件其他报道一并作为候选（标题、来源不同，规则分类可能归到缺的分类）
+        unused_events = [n for n in all_news if n.get('title', '').lower() not in used_titles]
+        unused_news = expand_event_members(unused_events)
         if unused_news:
             log(f"  找到 {len(unused_news)} 条未使用新闻，重新分类补充...")
             supplement = classify_news_with_rules(unused_news)
+            event_of = event_index(unused_events)
+            taken_events = set()
             # 规范化补充分类的键名
             for old_key, news_list in supplement.items():
                 new_key = category_mapping.get(old_key, old_key)
@@ -2523,8 +3417,18 @@ def main():
                     current = categorized_news.get(new_key, [])
                     needed = 5 - len(current)
                     if needed > 0:
-                        categorized_news[new_key] = current + news_list[:needed]
-                        log(f"  {new_key}: 补充 {min(needed, len(news_list))} 条")
+                        # 同一事件只补一条
+                        picked = []
+                        for item in news_list:
+                            if len(picked) >= needed:
+                                break
+                            event = event_of.get(id(item), id(item))
+                            if event in taken_events:
+                                continue
+                            taken_events.add(event)
+                            picked.append(item)
+                        categorized_news[new_key] = current + picked
+                        log(f"  {new_key}: 补充 {len(picked)} 条")
         else:
             log(f"  没有未使用的新闻可供补充")
 
@@ -2551,6 +3455,8 @@ def main():
                     continue
                 if not is_valid_news_title(item.get("title", "")):
                     continue
+                if PUBLISHED_STORE and not args.weekly and PUBLISHED_STORE.contains(item):
+                    continue
                 filtered.append(item)
                 existing_lower.add(t)
             add_count = min(needed, len(filtered))
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+RSS 源抓取台账
+跨运行持久化每个源、每个地址的抓取耗时与 fallback 使用情况，
+用于按历史耗时从长到短提交源，并把历史上最快的镜像排到首位；
+同时维护每个源的熔断状态：连续多次运行失败的源暂时跳过，之后以短超时半开探测；
+并根据各地址 / 原文 host 的历史耗时分布（p95 × 系数，限定上下限）给出自适应超时；
+另记录每个源的历史产出（窗口内条目数），供提前结束采集时按产出从高到低提交
+"""
+
+import json
+import math
+import os
+import statistics
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from utils import WORK_DIR
+
+SOURCE_LEDGER_PATH = os.path.join(WORK_DIR, "cache", "source_ledger.json")
+# 每个源 / 地址保留的最近耗时样本数
+LEDGER_MAX_SAMPLES = 20
+# 熔断默认值：连续失败 3 次运行后打开，跳过 2 次运行后半开探测
+BREAKER_THRESHOLD = 3
+BREAKER_SKIP_RUNS = 2
+BREAKER_PROBE_TIMEOUT = 8.0
+
+# 自适应超时：p95 × 系数，下限 3 秒，上限为调用方的默认超时；样本不足时用默认超时
+TIMEOUT_FACTOR = 3.0
+TIMEOUT_FLOOR = 3.0
+TIMEOUT_MIN_SAMPLES = 3
+# 连续失败达到该次数的地址直接使用下限超时，死源几秒内失败
+TIMEOUT_DEAD_FAILURES = 2
+# 使用下限超时期间，每连续失败该次数就按历史 p95 的完整超时重试一次，偶发故障后的慢源仍能恢复
+TIMEOUT_RECOVERY_EVERY = 3
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+def append_sample(samples: List[float], value: float, max_samples: int) -> List[float]:
+    """追加一个样本并只保留最近 max_samples 个。"""
+    samples = list(samples) + [round(float(value), 3)]
+    return samples[-max_samples:]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """最近邻法百分位数。"""
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class SourceLedger:
+    """JSON 文件存储的源级 / 地址级抓取历史。
+
+    源级记录只在采集主线程中读写：采集前用 plan_sources() 排序，采集中 record() 累积，结束后 save()；
+    原文 host 记录来自并发的上下文补充线程，record_host() 与 save() 由锁保护。
+    """
+
+    def __init__(
+        self,
+        path: str = SOURCE_LEDGER_PATH,
+        max_samples: int = LEDGER_MAX_SAMPLES,
+        breaker_threshold: int = BREAKER_THRESHOLD,
+        breaker_skip_runs: int = BREAKER_SKIP_RUNS,
+        probe_timeout: float = BREAKER_PROBE_TIMEOUT,
+        timeout_factor: float = TIMEOUT_FACTOR,
+        timeout_floor: float = TIMEOUT_FLOOR,
+    ):
+        self.path = path
+        self.max_samples = max_samples
+        self.breaker_threshold = max(1, breaker_threshold)
+        self.breaker_skip_runs = max(0, breaker_skip_runs)
+        self.probe_timeout = probe_timeout
+        self.timeout_factor = timeout_factor
+        self.timeout_floor = timeout_floor
+        self.sources: Dict[str, Dict] = {}
+        self.urls: Dict[str, Dict] = {}
+        # 原文页面按 host 记录耗时，用于 fetch_article_context 的自适应超时
+        self.hosts: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self.sources = data.get("sources") or {}
+            self.urls = data.get("urls") or {}
+            self.hosts = data.get("hosts") or {}
+
+    def save(self) -> None:
+        """原子写入台账；写入失败不影响本次采集。"""
+        tmp_path = None
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f, self._lock:
+                json.dump({"sources": self.sources, "urls": self.urls, "hosts": self.hosts}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError):
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def expected_latency(self, source_name: str) -> Optional[float]:
+        """源的预期耗时（最近样本中位数）；没有历史时返回 None。"""
+        samples = self.sources.get(source_name, {}).get("latency") or []
+        return statistics.median(samples) if samples else None
+
+    def expected_yield(self, source_name: str) -> Optional[float]:
+        """源的预期产出（最近几次运行窗口内条目数的中位数）；没有历史时返回 None。"""
+        samples = self.sources.get(source_name, {}).get("yield") or []
+        return statistics.median(samples) if samples else None
+
+    def order_by_yield(self, sources: List[Dict]) -> List[Dict]:
+        """按预期产出从高到低排列源；没有历史的源排在最前，同产出时保持原顺序。"""
+        def sort_key(source: Dict) -> float:
+            expected = self.expected_yield(source["name"])
+            return float("inf") if expected is None else expected
+
+        return sorted(sources, key=sort_key, reverse=True)
+
+    def url_latency(self, url: str) -> Optional[float]:
+        """地址最近成功抓取耗时的中位数；没有历史或最近一次失败时返回 None。"""
+        entry = self.urls.get(url) or {}
+        samples = entry.get("latency") or []
+        if not samples or not entry.get("last_ok", True):
+            return None
+        return statistics.median(samples)
+
+    def learned_timeout(self, entry: Optional[Dict], default: float) -> float:
+        """根据地址 / host 的历史记录给出超时：连续失败用下限，样本不足用默认值，否则 p95 × 系数。
+
+        下限超时对正常耗时超过下限的慢源必然失败，连续失败次数只增不减；因此连续失败期间每隔
+        TIMEOUT_RECOVERY_EVERY 次（第 2、3 次失败后用下限，第 4 次后完整超时，依此类推）恢复一次完整超时。
+        """
+        entry = entry or {}
+        failures = entry.get("consecutive_failures", 0)
+        if failures >= TIMEOUT_DEAD_FAILURES and (failures - TIMEOUT_DEAD_FAILURES + 1) % TIMEOUT_RECOVERY_EVERY:
+            return min(self.timeout_floor, default)
+        samples = entry.get("latency") or []
+        if len(samples) < TIMEOUT_MIN_SAMPLES:
+            return default
+        timeout = percentile(samples, 95) * self.timeout_factor
+        return round(min(max(timeout, self.timeout_floor), default), 3)
+
+    def url_timeout(self, url: str, default: float) -> float:
+        return self.learned_timeout(self.urls.get(url), default)
+
+    def host_timeout(self, host: str, default: float) -> float:
+        return self.learned_timeout(self.hosts.get(host), default)
+
+    def order_urls(self, urls: List[str]) -> List[str]:
+        """把历史最快且最近一次成功的地址提到首位，其余保持配置顺序。"""
+        known = [(self.url_latency(url), index) for index, url in enumerate(urls)]
+        known = [(latency, index) for latency, index in known if latency is not None]
+        if len(urls) < 2 or not known:
+            return list(urls)
+        fastest = min(known)[1]
+        return [urls[fastest]] + [url for index, url in enumerate(urls) if index != fastest]
+
+    def plan_sources(self, sources: List[Dict], get_urls, default_timeout: float = None) -> List[Dict]:
+        """返回按预期耗时从长到短排列的源副本（最长任务优先，缩短整体完成时间）。
+
+        没有历史的源视为最慢，排在最前；有多个地址的源写入 mirror_urls 作为本次尝试顺序；
+        给出 default_timeout 时写入 url_timeouts（各地址的自适应超时）。
+        """
+        planned = []
+        for source in sources:
+            urls = get_urls(source)
+            ordered = self.order_urls(urls)
+            extra = {}
+            if ordered != urls:
+                extra["mirror_urls"] = ordered
+            if default_timeout is not None:
+                timeouts = {url: self.url_timeout(url, default_timeout) for url in urls}
+                if any(timeout != default_timeout for timeout in timeouts.values()):
+                    extra["url_timeouts"] = timeouts
+            planned.append(dict(source, **extra) if extra else source)
+
+        def sort_key(source: Dict) -> float:
+            latency = self.expected_latency(source["name"])
+            return float("inf") if latency is None else latency
+
+        # sorted 稳定：同预期耗时（含全部无历史）时保持配置顺序
+        return sorted(planned, key=sort_key, reverse=True)
+
+    def breaker_state(self, source_name: str) -> str:
+        """本次运行的熔断状态：closed 正常抓取，open 跳过，half_open 短超时探测。"""
+        entry = self.sources.get(source_name) or {}
+        if entry.get("breaker") != BREAKER_OPEN:
+            return BREAKER_CLOSED
+        if entry.get("skipped_runs", 0) >= self.breaker_skip_runs:
+            return BREAKER_HALF_OPEN
+        return BREAKER_OPEN
+
+    def apply_breaker(self, sources: List[Dict]):
+        """按熔断状态拆分源，返回 (本次抓取的源, 跳过的源)；半开的源带上探测超时。"""
+        to_fetch, skipped = [], []
+        for source in sources:
+            state = self.breaker_state(source["name"])
+            if state == BREAKER_OPEN:
+                skipped.append(source)
+            elif state == BREAKER_HALF_OPEN:
+                to_fetch.append(dict(source, breaker=BREAKER_HALF_OPEN, fetch_timeout=self.probe_timeout))
+            else:
+                to_fetch.append(source)
+        return to_fetch, skipped
+
+    def record(self, result: Dict) -> None:
+        """记录一个源级抓取结果（summarize_source_fetch 的返回值）。"""
+        if result.get("status") == "early_stop":
+            # 候选已足够、提前结束时未抓取的源：不计入耗时、产出与熔断
+            return
+        entry = self.sources.setdefault(result["source_name"], {})
+        if result.get("status") == "circuit_open":
+            # 熔断跳过的源只累计跳过次数，到达阈值后下次运行半开探测
+            entry["skipped_runs"] = entry.get("skipped_runs", 0) + 1
+            entry["last_status"] = result["status"]
+            entry["updated_at"] = time.time()
+            return
+
+        if result.get("url_stats") or result.get("status") == "timeout":
+            entry["latency"] = append_sample(entry.get("latency", []), result["elapsed"], self.max_samples)
+        if result.get("status") != "timeout":
+            entry["yield"] = append_sample(entry.get("yield", []), len(result.get("items", [])), self.max_samples)
+        entry["runs"] = entry.get("runs", 0) + 1
+        if result.get("used_fallback"):
+            entry["fallback_uses"] = entry.get("fallback_uses", 0) + 1
+        entry["last_status"] = result.get("status", "")
+        entry["updated_at"] = time.time()
+        self._update_breaker(entry, result)
+
+        for stat in result.get("url_stats", []):
+            self._record_latency(self.urls.setdefault(stat["url"], {}), stat["elapsed"], stat["ok"])
+
+    def _update_breaker(self, entry: Dict, result: Dict) -> None:
+        # 失败：所有尝试的地址都请求失败（正常返回但窗口内无新闻不算失败）。
+        # 采集截止时被放弃、或仍在并发闸门中排队未发出请求的源没有地址级结果，熔断状态保持不变
+        url_stats = result.get("url_stats", [])
+        if not url_stats:
+            return
+        failed = not any(stat["ok"] for stat in url_stats)
+        if not failed:
+            entry["consecutive_failures"] = 0
+            entry["breaker"] = BREAKER_CLOSED
+            entry.pop("skipped_runs", None)
+            return
+
+        entry["consecutive_failures"] = entry.get("consecutive_failures", 0) + 1
+        if result.get("breaker") == BREAKER_HALF_OPEN or entry["consecutive_failures"] >= self.breaker_threshold:
+            entry["breaker"] = BREAKER_OPEN
+            entry["skipped_runs"] = 0
+
+    def record_host(self, host: str, elapsed: float, ok: bool) -> None:
+        """记录一次原文页面抓取（可在多个线程中调用）。"""
+        with self._lock:
+            self._record_latency(self.hosts.setdefault(host, {}), elapsed, ok)
+
+    def _record_latency(self, entry: Dict, elapsed: float, ok: bool) -> None:
+        if ok:
+            entry["latency"] = append_sample(entry.get("latency", []), elapsed, self.max_samples)
+            entry["successes"] = entry.get("successes", 0) + 1
+            entry["consecutive_failures"] = 0
+        else:
+            entry["failures"] = entry.get("failures", 0) + 1
+            entry["consecutive_failures"] = entry.get("consecutive_failures", 0) + 1
+        entry["last_ok"] = ok
+        entry["updated_at"] = time.time()
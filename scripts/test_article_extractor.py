@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""验证原文页面头部优先抽取（html.parser 增量解析、JSON-LD 补齐、提前停止读取）与编码判定。"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from article_extractor import ArticleContextExtractor, extract_article_context, resolve_charset  # noqa: E402
+
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html><head>
+<title>OpenAI 发布 GPT-5 &amp; 新工具 | 示例网</title>
+<meta property="og:description" content="OpenAI 今日发布 &quot;GPT-5&quot;。">
+<script>var tracking = "<h1>不是标题</h1>";</script>
+<style>body { color: red; }</style>
+</head>
+<body>
+<h1 class="headline">OpenAI 发布  GPT-5</h1>
+<noscript>请启用 JavaScript</noscript>
+<p>OpenAI 周四宣布推出新模型。</p>
+"""
+
+
+class ArticleExtractorTests(unittest.TestCase):
+    def test_extracts_metadata_and_excerpt_without_scripts(self) -> None:
+        context = extract_article_context(PAGE_HEAD + "</body></html>")
+        self.assertEqual(context["page_title"], "OpenAI 发布 GPT-5 & 新工具 | 示例网")
+        self.assertEqual(context["page_h1"], "OpenAI 发布 GPT-5")
+        self.assertEqual(context["meta_description"], 'OpenAI 今日发布 "GPT-5"。')
+        self.assertIn("OpenAI 周四宣布推出新模型。", context["page_excerpt"])
+        self.assertNotIn("tracking", context["page_excerpt"])
+        self.assertNotIn("color", context["page_excerpt"])
+        self.assertNotIn("JavaScript", context["page_excerpt"])
+
+    def test_json_ld_fills_missing_h1_and_description(self) -> None:
+        html = """<html><head><title>页面</title>
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "WebSite", "name": "示例网"},
+  {"@type": ["NewsArticle"], "headline": "英伟达发布新芯片", "description": "英伟达在 GTC 上发布新芯片。"}
+]}
+</script></head><body><div>正文</div></body></html>"""
+        context = extract_article_context(html)
+        self.assertEqual(context["page_h1"], "英伟达发布新芯片")
+        self.assertEqual(context["meta_description"], "英伟达在 GTC 上发布新芯片。")
+        self.assertNotIn("NewsArticle", context["page_excerpt"])
+
+    def test_stops_once_excerpt_and_h1_are_captured(self) -> None:
+        extractor = ArticleContextExtractor(excerpt_limit=100)
+        self.assertFalse(extractor.feed(PAGE_HEAD))
+        self.assertTrue(extractor.feed("<p>" + "正文" * 100 + "</p>"))
+        self.assertEqual(len(extractor.context()["page_excerpt"]), 100)
+
+    def test_fetch_article_context_stops_reading_large_page(self) -> None:
+        chunks = [PAGE_HEAD.encode("utf-8")] + [("<p>" + "正文内容" * 1000 + "</p>").encode("utf-8")] * 100
+        consumed = []
+
+        def iter_content(chunk_size=None):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        session = mock.MagicMock()
+        response = session.get.return_value.__enter__.return_value
+        response.headers = {"Content-Type": "text/html; charset=utf-8"}
+        response.iter_content.side_effect = iter_content
+
+        with mock.patch.object(collector, "get_session", return_value=session), \
+             mock.patch.object(collector, "ARTICLE_CONTEXT_CACHE", {}), \
+             mock.patch.object(collector, "PAGE_CACHE", None), \
+             mock.patch.object(collector, "SOURCE_LEDGER", None):
+            context = collector.fetch_article_context("https://example.com/story")
+
+        self.assertLessEqual(len(consumed), 2)
+        self.assertEqual(context["page_h1"], "OpenAI 发布 GPT-5")
+        self.assertEqual(len(context["page_excerpt"]), 1500)
+
+
+class CharsetResolverTests(unittest.TestCase):
+    def test_priority_bom_then_header_then_meta(self) -> None:
+        meta_gbk = b'<html><head><meta charset="gbk">'
+        self.assertEqual(resolve_charset("text/html; charset=utf-8", b"\xef\xbb\xbf" + meta_gbk), "utf-8-sig")
+        self.assertEqual(resolve_charset('text/html; charset="Big5"', meta_gbk), "big5")
+        self.assertEqual(resolve_charset("text/html", meta_gbk), "gb18030")
+        self.assertEqual(
+            resolve_charset("", b'<meta http-equiv="Content-Type" content="text/html; charset=gb2312">'),
+            "gb18030",
+        )
+
+    def test_unknown_or_missing_labels_fall_back_to_utf8(self) -> None:
+        self.assertEqual(resolve_charset("text/html; charset=bogus", b""), "utf-8")
+        self.assertEqual(resolve_charset("text/html", b'<meta charset="utf-16">'), "utf-8")
+        self.assertEqual(resolve_charset("text/html", b"<html><body>" + b" " * 8192 + b'<meta charset="gbk">'), "utf-8")
+
+    def test_gbk_page_without_header_charset_decodes_title(self) -> None:
+        padding = "<!--" + " " * 5000 + "-->"
+        page = f'<html><head><meta charset="gb2312">{padding}<title>IT之家：华为发布新机</title></head><body><p>正文</p></body></html>'
+        session = mock.MagicMock()
+        response = session.get.return_value.__enter__.return_value
+        response.headers = {"Content-Type": "text/html"}
+        # 分两块返回，GBK 双字节字符跨块：编码在开头判定一次，之后增量解码
+        body = page.encode("gbk")
+        split = body.index("华".encode("gbk")) + 1
+        response.iter_content.return_value = iter([body[:split], body[split:]])
+
+        with mock.patch.object(collector, "get_session", return_value=session), \
+             mock.patch.object(collector, "ARTICLE_CONTEXT_CACHE", {}), \
+             mock.patch.object(collector, "PAGE_CACHE", None), \
+             mock.patch.object(collector, "SOURCE_LEDGER", None):
+            context = collector.fetch_article_context("https://www.ithome.com/0/1.htm")
+
+        self.assertEqual(context["page_title"], "IT之家：华为发布新机")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""验证 asyncio 采集引擎与线程池引擎返回一致的源级结果。"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from feed_test_server import start_feed_server, stop_feed_server  # noqa: E402
+
+
+class AsyncEngineTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server, base = start_feed_server(item_count=3)
+        cls.sources = [
+            {"name": "主源", "url": f"{base}/a", "limit": 5},
+            {"name": "镜像源", "url": f"{base}/broken", "limit": 5, "fallback_urls": [f"{base}/b"]},
+        ]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        stop_feed_server(cls.server)
+
+    def collect(self, engine: str) -> dict:
+        with mock.patch.object(collector, "FEED_CACHE", None):
+            results = list(collector.iter_source_results(self.sources, 24, engine))
+        return {
+            result["source_name"]: (
+                [item["title"] for item in result["items"]],
+                result["used_url"],
+                result["used_fallback"],
+                result["status"],
+            )
+            for result in results
+        }
+
+    @unittest.skipIf(collector.aiohttp is None, "aiohttp 未安装")
+    def test_async_engine_matches_thread_engine(self) -> None:
+        thread_results = self.collect("thread")
+        async_results = self.collect("async")
+        self.assertEqual(thread_results, async_results)
+        self.assertTrue(async_results["镜像源"][2])
+        self.assertEqual(len(async_results["主源"][0]), 3)
+
+    def test_async_engine_falls_back_without_aiohttp(self) -> None:
+        with mock.patch.object(collector, "aiohttp", None):
+            results = self.collect("async")
+        self.assertEqual(set(results), {"主源", "镜像源"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""验证候选新闻的增量过滤去重（结果到达即处理，与一次性处理结果一致）。"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+
+
+TITLES = [
+    "OpenAI 发布新一代推理模型 o5，性能大幅提升",
+    "openai 发布新一代推理模型 o5，性能大幅提升",
+    "OpenAI 发布新一代推理模型 o5 性能大幅提升了",
+    "首页",
+    "英伟达市值突破五万亿美元创历史新高",
+    "无标题",
+    "央行宣布下调存款准备金率 0.5 个百分点",
+]
+
+
+def make_result(name: str, titles) -> dict:
+    result = collector.summarize_source_fetch({"name": name, "url": f"https://example.com/{name}"}, [])
+    result["items"] = [{"title": title, "link": "", "summary": ""} for title in titles]
+    return result
+
+
+def batch_dedup(items):
+    """一次性处理全部条目的参考实现（增量化之前的逻辑）。"""
+    seen_titles = set()
+    unique_items = []
+    invalid_count = 0
+    for item in items:
+        title = item["title"]
+        title_lower = title.lower()
+        if not collector.is_valid_news_title(title):
+            invalid_count += 1
+            continue
+        if title_lower not in seen_titles and title != "无标题":
+            if any(collector.is_similar_title(title_lower, existing) for existing in seen_titles):
+                continue
+            seen_titles.add(title_lower)
+            unique_items.append(item)
+    return unique_items, invalid_count
+
+
+class NewsCandidateStageTests(unittest.TestCase):
+    def test_incremental_matches_batch(self) -> None:
+        items = [{"title": title} for title in TITLES]
+        stage = collector.NewsCandidateStage()
+        stage.add(items[:2])
+        stage.add([])
+        stage.add(items[2:5])
+        stage.add(items[5:])
+
+        expected_items, expected_invalid = batch_dedup(items)
+        self.assertEqual(stage.unique_items, expected_items)
+        self.assertEqual(stage.invalid_count, expected_invalid)
+
+    def test_collect_all_news_filters_each_source_as_it_arrives(self) -> None:
+        calls = []
+        checked_before_second = []
+
+        def fake_results(sources, hours_ago, engine, deadline, controller):
+            yield make_result("first", TITLES[:4])
+            checked_before_second.append(len(calls))
+            yield make_result("second", TITLES[4:])
+
+        is_valid = collector.is_valid_news_title
+
+        def spy_valid(title):
+            calls.append(title)
+            return is_valid(title)
+
+        with mock.patch.object(collector, "iter_source_results", side_effect=fake_results), \
+             mock.patch.object(collector, "SOURCE_LEDGER", None), \
+             mock.patch.object(collector, "maybe_collect_external_news", return_value=[]), \
+             mock.patch.object(collector, "is_valid_news_title", spy_valid):
+            items = collector.collect_all_news(hours_ago=24, deadline=0)
+
+        self.assertEqual(checked_before_second, [4])
+        expected_items, _ = batch_dedup([{"title": title} for title in TITLES])
+        self.assertEqual([item["title"] for item in items], [item["title"] for item in expected_items])
+
+
+if __name__ == "__main__":
+    unittest.main()
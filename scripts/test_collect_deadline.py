@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""验证采集总截止时间：到点放弃慢源，已完成的源照常返回。"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from feed_test_server import start_feed_server, stop_feed_server  # noqa: E402
+
+
+class CollectDeadlineTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server, base = start_feed_server(delays={"/slow": 2})
+        cls.sources = [
+            {"name": "快源", "url": f"{base}/fast", "limit": 5},
+            {"name": "慢源", "url": f"{base}/slow", "limit": 5, "fallback_urls": [f"{base}/slow-mirror"]},
+        ]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        stop_feed_server(cls.server)
+
+    def collect(self, engine: str) -> tuple:
+        started = time.monotonic()
+        with mock.patch.object(collector, "FEED_CACHE", None):
+            results = list(collector.iter_source_results(self.sources, 24, engine, deadline=0.5))
+        return {result["source_name"]: result for result in results}, time.monotonic() - started
+
+    def assert_partial_results(self, results: dict, elapsed: float) -> None:
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(results["快源"]["status"], "ok")
+        self.assertEqual(len(results["快源"]["items"]), 1)
+        self.assertEqual(results["慢源"]["status"], "timeout")
+        self.assertEqual(results["慢源"]["items"], [])
+
+    def test_thread_engine_abandons_slow_sources(self) -> None:
+        self.assert_partial_results(*self.collect("thread"))
+
+    def test_thread_engine_workers_exit_soon_after_deadline(self) -> None:
+        server, base = start_feed_server(delays={"/stalled": 6})
+        sources = [
+            {"name": "快源", "url": f"{base}/fast", "limit": 5},
+            {"name": "卡住的源", "url": f"{base}/stalled", "limit": 5, "fallback_urls": [f"{base}/stalled-mirror"]},
+        ]
+        existing = set(threading.enumerate())
+        try:
+            started = time.monotonic()
+            with mock.patch.object(collector, "FEED_CACHE", None), mock.patch.object(collector, "log") as log:
+                results = list(collector.iter_source_results(sources, 24, "thread", deadline=0.5))
+            self.assertLess(time.monotonic() - started, 1.0)
+            self.assertEqual([result["status"] for result in results], ["ok", "timeout"])
+            # 等待响应头的请求超时被截到剩余时间，不等服务端 6 秒后才返回；备用地址也不再请求
+            # 线程池工作线程不是守护线程，解释器退出时要等它们结束；本地服务的处理线程都是守护线程
+            while any(not thread.daemon for thread in set(threading.enumerate()) - existing):
+                self.assertLess(time.monotonic() - started, 1.5)
+                time.sleep(0.05)
+            self.assertFalse([call for call in log.call_args_list if "获取 RSS 失败" in call.args[0]])
+        finally:
+            stop_feed_server(server)
+
+    @unittest.skipIf(collector.aiohttp is None, "aiohttp 未安装")
+    def test_async_engine_cancels_slow_sources(self) -> None:
+        self.assert_partial_results(*self.collect("async"))
+
+    def test_parse_duration(self) -> None:
+        self.assertEqual(collector.parse_duration("45s"), 45)
+        self.assertEqual(collector.parse_duration("2m"), 120)
+        self.assertEqual(collector.parse_duration("30"), 30)
+        self.assertEqual(collector.parse_duration("off"), 0)
+        with self.assertRaises(ValueError):
+            collector.parse_duration("soon")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""验证 AIMD 自适应并发：成功时加性增、拥塞时乘性减、单 host 上限与排队统计，以及 host 限速与 Retry-After。"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from concurrency import AIMDController, ThreadConcurrencyGate  # noqa: E402
+from http_transport import HostRateLimiter  # noqa: E402
+
+
+class BusyHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        self.send_response(429 if self.path == "/busy" else 503)
+        if self.path == "/busy":
+            self.send_header("Retry-After", "30")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class AIMDControllerTests(unittest.TestCase):
+    def run_requests(self, controller: AIMDController, host: str, outcomes) -> None:
+        for congested in outcomes:
+            controller.started(host, 0.0)
+            controller.finished(host, congested)
+
+    def test_additive_increase_after_full_window(self) -> None:
+        controller = AIMDController(initial=4, minimum=2, maximum=6)
+        self.run_requests(controller, "a.example.com", [False] * 3)
+        self.assertEqual(controller.limit, 4)
+        self.run_requests(controller, "a.example.com", [False])
+        self.assertEqual(controller.limit, 5)
+        self.run_requests(controller, "a.example.com", [False] * 50)
+        self.assertEqual(controller.limit, 6)
+
+    def test_burst_of_congestion_halves_once(self) -> None:
+        controller = AIMDController(initial=8, minimum=2, maximum=24)
+        self.run_requests(controller, "rsshub.example.com", [True] * 5)
+        self.assertEqual(controller.limit, 4)
+        self.assertEqual(controller.decreases, 1)
+        self.run_requests(controller, "rsshub.example.com", [True] * 5)
+        self.assertEqual(controller.limit, 2)
+        self.assertEqual(controller.snapshot()["lowest_limit"], 2)
+
+    def test_per_host_cap_queues_requests(self) -> None:
+        controller = AIMDController(initial=8, per_host=2)
+        gate = ThreadConcurrencyGate(controller)
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def work() -> None:
+            gate.acquire("rsshub.example.com")
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            gate.release("rsshub.example.com", False)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            for _ in range(6):
+                executor.submit(work)
+
+        self.assertEqual(active["peak"], 2)
+        host_stats = controller.snapshot()["hosts"]["rsshub.example.com"]
+        self.assertEqual(host_stats["requests"], 6)
+        self.assertGreater(host_stats["max_wait"], 0.05)
+
+    def test_cancelled_waiter_leaves_queue_without_slot(self) -> None:
+        controller = AIMDController(initial=8, per_host=1)
+        gate = ThreadConcurrencyGate(controller)
+        gate.acquire("rsshub.example.com")
+        cancel = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            waiter = executor.submit(gate.acquire, "rsshub.example.com", cancel)
+            time.sleep(0.05)
+            cancel.set()
+            gate.wake()
+            self.assertIsNone(waiter.result(timeout=1))
+        self.assertEqual(controller.in_flight, 1)
+        self.assertEqual(controller.host_stats["rsshub.example.com"]["requests"], 1)
+
+
+class HostRateLimitGateTests(unittest.TestCase):
+    def test_throttled_host_does_not_block_other_hosts(self) -> None:
+        controller = AIMDController(initial=4, per_host=2)
+        limiter = HostRateLimiter(interval=0.0)
+        limiter.defer("slow.example.com", 0.3)
+        gate = ThreadConcurrencyGate(controller, limiter)
+        finished = {}
+
+        def work(host: str) -> None:
+            gate.acquire(host)
+            finished[host] = time.monotonic()
+            gate.release(host, False)
+
+        started = time.monotonic()
+        throttled = threading.Thread(target=work, args=("slow.example.com",))
+        throttled.start()
+        time.sleep(0.05)
+        # 被限速的请求在闸门外等待，不占用并发名额
+        self.assertEqual(controller.in_flight, 0)
+        work("fast.example.com")
+        throttled.join()
+
+        self.assertLess(finished["fast.example.com"] - started, 0.2)
+        self.assertGreaterEqual(finished["slow.example.com"] - started, 0.3)
+
+
+class CongestionSignalTests(unittest.TestCase):
+    def test_429_and_5xx_mark_fetch_as_congested(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), BusyHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        limiter = HostRateLimiter(interval=0.0)
+        try:
+            with mock.patch.object(collector, "FEED_CACHE", None), \
+                 mock.patch.object(collector, "HOST_RATE_LIMITER", limiter):
+                for path in ("/busy", "/down"):
+                    result = collector.fetch_feed(base + path)
+                    self.assertTrue(result["congested"], path)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertFalse(collector.is_congestion_signal(404))
+        # 429 的 Retry-After 让该 host 暂停，其他 host 不受影响
+        self.assertGreater(limiter.reserve(urllib.parse.urlsplit(base).netloc), 25)
+        self.assertEqual(limiter.reserve("other.example.com"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""验证提前结束采集：各分类候选足够后跳过其余源，且不计入台账。"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from feed_test_server import start_feed_server, stop_feed_server  # noqa: E402
+from concurrency import AIMDController  # noqa: E402
+from source_ledger import SourceLedger  # noqa: E402
+
+
+SOURCES = [
+    {"name": "量子位", "url": "https://example.com/ai", "limit": 5},
+    {"name": "华尔街见闻", "url": "https://example.com/finance", "limit": 5},
+    {"name": "少数派", "url": "https://example.com/tech", "limit": 5},
+    {"name": "低产出源", "url": "https://example.com/low", "limit": 5},
+]
+TITLES = {
+    "量子位": ["深度求索开源新一代多模态大模型", "智谱发布面向开发者的智能体平台"],
+    "华尔街见闻": ["美联储宣布维持基准利率区间不变", "沪深两市成交额连续三日突破万亿"],
+    "少数派": ["苹果发布新款折叠屏手机售价公布", "小米汽车宣布第二款车型正式交付"],
+    "低产出源": ["这一条不应该被抓取的新闻标题"],
+}
+
+
+def make_result(source: dict) -> dict:
+    result = collector.summarize_source_fetch(source, [])
+    result["items"] = [{"title": title, "link": "", "summary": "", "rss_source": source["name"]} for title in TITLES[source["name"]]]
+    result["status"] = "ok"
+    return result
+
+
+class EarlyStopTests(unittest.TestCase):
+    def test_stops_once_every_category_has_surplus(self) -> None:
+        closed = []
+
+        def fake_results(sources, hours_ago, engine, deadline, controller):
+            try:
+                for source in sources:
+                    yield make_result(source)
+            finally:
+                closed.append(True)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ledger = SourceLedger(path=os.path.join(tmpdir, "ledger.json"))
+            with mock.patch.object(collector, "ALL_RSS_SOURCES", SOURCES), \
+                 mock.patch.object(collector, "iter_source_results", side_effect=fake_results), \
+                 mock.patch.object(collector, "SOURCE_LEDGER", ledger), \
+                 mock.patch.object(collector, "maybe_collect_external_news", return_value=[]):
+                items = collector.collect_all_news(hours_ago=24, deadline=0, early_stop=2)
+            health = {entry["source"]: entry["status"] for entry in collector.LAST_RSS_HEALTH}
+
+            self.assertEqual(closed, [True])
+            self.assertEqual(len(items), 6)
+            self.assertEqual(health["低产出源"], "early_stop")
+            # 未抓取的源不计入台账，其余源记录本次产出
+            self.assertNotIn("低产出源", ledger.sources)
+            self.assertEqual(ledger.expected_yield("量子位"), 2)
+
+    def test_order_by_yield_puts_unknown_and_productive_sources_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ledger = SourceLedger(path=os.path.join(tmpdir, "ledger.json"))
+            for name, count in (("量子位", 8), ("华尔街见闻", 1), ("少数派", 5)):
+                ledger.record({"source_name": name, "items": [{}] * count, "status": "ok", "elapsed": 1.0,
+                               "url_stats": [{"url": name, "elapsed": 1.0, "ok": True}]})
+            ordered = [source["name"] for source in ledger.order_by_yield(SOURCES)]
+        self.assertEqual(ordered, ["低产出源", "量子位", "少数派", "华尔街见闻"])
+
+
+class ThreadEarlyStopTests(unittest.TestCase):
+    def test_closing_thread_results_cancels_running_and_queued_fetches(self) -> None:
+        server, base = start_feed_server(drips={"/drip": 0.3})
+        sources = [
+            {"name": "快源", "url": f"{base}/fast", "limit": 5},
+            {"name": "慢源一", "url": f"{base}/drip-1", "limit": 5},
+            {"name": "慢源二", "url": f"{base}/drip-2", "limit": 5},
+        ]
+        # 单 host 只放行一个请求：快源返回后一个慢源在下载，另一个在闸门上排队
+        controller = AIMDController(initial=4, per_host=1)
+        existing = set(threading.enumerate())
+        try:
+            with mock.patch.object(collector, "FEED_CACHE", None):
+                results = collector.iter_source_results(sources, 24, "thread", controller=controller)
+                self.assertEqual(next(results)["source_name"], "快源")
+                time.sleep(0.2)
+                started = time.monotonic()
+                results.close()
+                # 慢源完整下载需约 2.4 秒；取消后在下一块之前放弃，排队的请求不再发出
+                while any(not thread.daemon for thread in set(threading.enumerate()) - existing):
+                    self.assertLess(time.monotonic() - started, 1.0)
+                    time.sleep(0.05)
+        finally:
+            stop_feed_server(server)
+        self.assertEqual(controller.in_flight, 0)
+        self.assertEqual(controller.host_stats[base.split("//")[1]]["requests"], 2)
+
+
+@unittest.skipIf(collector.aiohttp is None, "aiohttp 未安装")
+class AsyncEarlyStopTests(unittest.TestCase):
+    def test_closing_async_results_cancels_remaining_sources(self) -> None:
+        server, base = start_feed_server(delays={"/slow": 3})
+        sources = [
+            {"name": "快源", "url": f"{base}/fast", "limit": 5},
+            {"name": "慢源", "url": f"{base}/slow", "limit": 5},
+        ]
+        try:
+            with mock.patch.object(collector, "FEED_CACHE", None):
+                results = collector.iter_source_results(sources, 24, "async")
+                self.assertEqual(next(results)["source_name"], "快源")
+                started = time.monotonic()
+                results.close()
+                while any(thread.name == "rss-asyncio" for thread in threading.enumerate()):
+                    self.assertLess(time.monotonic() - started, 1.5)
+                    time.sleep(0.05)
+        finally:
+            stop_feed_server(server)
+
+
+if __name__ == "__main__":
+    unittest.main()
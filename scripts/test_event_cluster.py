@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""验证事件聚类：中英文报道按实体 / 型号 / 数值归组，报道数在规则排序中封顶加分，分类只看到每个事件的代表。"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from event_cluster import cluster_events, collapse_events, event_index, expand_event_members, extract_event_features  # noqa: E402
+
+
+def news(title: str, source: str, parsed_time: str = "2026-03-10 08:00:00") -> dict:
+    return {"title": title, "summary": "", "rss_source": source, "parsed_time": parsed_time}
+
+
+class EventFeatureTests(unittest.TestCase):
+    def test_aliases_models_and_numbers_normalise_across_languages(self) -> None:
+        self.assertEqual(
+            extract_event_features("Nvidia becomes first company worth $5 trillion"),
+            extract_event_features("英伟达市值突破5万亿美元，创历史新高"),
+        )
+        self.assertEqual(
+            extract_event_features("Apple unveils iPhone 17 lineup"),
+            extract_event_features("苹果发布 iPhone 17 系列"),
+        )
+        self.assertEqual(
+            extract_event_features("Tesla Q3 revenue rises 12% to $25.7 billion") - {"m:q3"},
+            extract_event_features("特斯拉第三季度营收增长12%至257亿美元"),
+        )
+        self.assertEqual(extract_event_features("OpenAI launches GPT-5"), {"e:openai", "m:gpt5"})
+        self.assertEqual(extract_event_features("Top 10 AI stories of 2026"), {"n:10"})
+
+    def test_parameter_counts_are_not_money(self) -> None:
+        self.assertEqual(extract_event_features("阿里开源 Qwen3-235B 模型"), {"e:alibaba", "m:qwen3", "n:235b"})
+        self.assertIn("n:2.35e+11", extract_event_features("Alibaba raises $235B"))
+        self.assertIn("n:4e+10", extract_event_features("OpenAI raises $40B"))
+
+
+class ClusterEventsTests(unittest.TestCase):
+    def test_groups_same_event_but_not_same_company(self) -> None:
+        items = [
+            news("英伟达市值突破5万亿美元，创历史新高", "华尔街见闻"),
+            news("OpenAI 为 ChatGPT 推出购物功能", "量子位"),
+            news("Nvidia becomes first company worth $5 trillion", "Bloomberg Markets"),
+            news("OpenAI 称 ChatGPT 周活跃用户达 8 亿", "机器之心"),
+            news("NVDA hits $5T market cap as AI demand surges", "CNBC"),
+        ]
+        groups = cluster_events(items)
+        self.assertEqual([len(group) for group in groups], [3, 1, 1])
+        self.assertEqual(groups[0], [items[0], items[2], items[4]])
+
+    def test_shared_entity_and_common_number_is_not_enough(self) -> None:
+        for first, second in (
+            ("英伟达股价上涨 3%，市值逼近 5 万亿美元", "英伟达发布新一代 GPU，性能提升 3%"),
+            ("小米 SU7 交付量破 10 万", "小米手机出货量 10 万台 创新高"),
+            ("阿里开源 Qwen3-235B 模型", "阿里巴巴获 2350 亿美元投资"),
+        ):
+            self.assertEqual(len(cluster_events([news(first, "a"), news(second, "b")])), 2, first)
+        # 同语言且字面相近、跨语言且数值完全一致的仍归为一组
+        self.assertEqual(len(cluster_events([
+            news("英伟达市值突破5万亿美元，创历史新高", "a"),
+            news("英伟达成为首家市值达5万亿美元的公司", "b"),
+            news("OpenAI raises $40B at $300B valuation", "c"),
+            news("OpenAI 融资 400 亿美元，估值 3000 亿美元", "d"),
+        ])), 2)
+
+    def test_members_are_compared_with_group_seed_only(self) -> None:
+        items = [
+            news("苹果发布 iPhone 17 系列", "IT之家"),
+            news("苹果 iPhone 17 国行售价 5999 元", "36氪"),
+            # 与第二条共享型号与售价，与种子只共享型号：不经第二条串进苹果的事件
+            news("iPhone 17 对手华为 Mate 80 售价 5999 元", "少数派"),
+        ]
+        self.assertEqual(cluster_events(items), [items[:2], items[2:]])
+
+    def test_reports_outside_window_stay_separate(self) -> None:
+        items = [
+            news("OpenAI launches GPT-5 with better reasoning", "The Verge", "2026-03-10 08:00:00"),
+            news("OpenAI 正式发布 GPT-5，推理能力大幅提升", "量子位", "2026-03-12 09:00:00"),
+        ]
+        self.assertEqual(len(cluster_events(items, window_hours=36)), 2)
+        self.assertEqual(len(cluster_events(items, window_hours=72)), 1)
+
+    def test_collapse_prefers_chinese_representative(self) -> None:
+        items = [
+            news("Apple unveils iPhone 17 lineup", "The Verge"),
+            news("苹果发布 iPhone 17 系列", "IT之家"),
+            news("小米汽车宣布第二款车型正式交付", "36氪"),
+        ]
+        events = collapse_events(items)
+        self.assertEqual([item["title"] for item in events], ["苹果发布 iPhone 17 系列", "小米汽车宣布第二款车型正式交付"])
+        self.assertEqual(events[0]["event_size"], 2)
+        self.assertEqual(events[0]["event_sources"], ["The Verge", "IT之家"])
+        self.assertEqual(events[1]["event_size"], 1)
+        self.assertEqual(events[0]["event_members"], [items[0]])
+        self.assertEqual(events[1]["event_members"], [])
+
+    def test_members_stay_available_as_fallback_candidates(self) -> None:
+        items = [
+            news("英伟达市值突破5万亿美元，创历史新高", "华尔街见闻"),
+            news("Nvidia becomes first company worth $5 trillion", "Bloomberg Markets"),
+            news("NVDA hits $5T market cap as AI demand surges", "CNBC"),
+            news("苹果发布 iPhone 17 系列", "IT之家"),
+        ]
+        events = collapse_events(list(items))
+        self.assertEqual(expand_event_members(events), items)
+        owners = event_index(events)
+        self.assertEqual({owners[id(item)] for item in items[:3]}, {id(items[0])})
+        self.assertEqual(owners[id(items[3])], id(items[3]))
+        # 成员不反向引用代表，原始新闻仍可整体写入 JSON
+        self.assertEqual(len(json.loads(json.dumps(events))[0]["event_members"]), 2)
+
+    def test_raw_news_counts_articles_and_events_separately(self) -> None:
+        events = collapse_events([
+            news("英伟达市值突破5万亿美元，创历史新高", "华尔街见闻"),
+            news("Nvidia becomes first company worth $5 trillion", "Bloomberg Markets"),
+            news("NVDA hits $5T market cap as AI demand surges", "CNBC"),
+            news("苹果发布 iPhone 17 系列", "IT之家"),
+        ])
+        with tempfile.TemporaryDirectory() as tmpdir, \
+             mock.patch.object(collector, "WORK_DIR", tmpdir), \
+             mock.patch.object(collector, "log"):
+            collector.save_raw_news(events, {}, "20260310")
+            with open(os.path.join(tmpdir, "raw_news_20260310.json"), encoding="utf-8") as f:
+                raw_data = json.load(f)
+        self.assertEqual(raw_data["total_news"], 4)
+        self.assertEqual(raw_data["total_events"], 2)
+
+
+class CorroborationRankingTests(unittest.TestCase):
+    def test_rule_ranking_prefers_corroborated_events(self) -> None:
+        single = news("特斯拉发布财报", "Marketaux")
+        corroborated = dict(news("比亚迪发布财报", "财联社快讯"), event_size=3)
+        self.assertGreater(
+            collector.score_item_for_category(corroborated, "财经要闻"),
+            collector.score_item_for_category(single, "财经要闻"),
+        )
+
+    def test_single_source_major_story_is_not_buried_by_corroborated_minor_ones(self) -> None:
+        major = dict(news("特斯拉发布财报，营收增长超预期", "Marketaux"), source_category="财经要闻")
+        minor = [
+            dict(news(f"概念股{i}号盘中小幅上涨", f"快讯{i}"), source_category="财经要闻", event_size=12)
+            for i in range(6)
+        ]
+        with mock.patch.object(collector, "log"):
+            categorized = collector.classify_news_with_rules(minor + [major])
+        self.assertIs(categorized["财经要闻"][0], major)
+        # 报道数加分封顶：再多的报道也只相当于两个高信号关键词
+        self.assertEqual(
+            collector.score_item_for_category(minor[0], "财经要闻")[0],
+            collector.EVENT_CORROBORATION_MAX_BONUS,
+        )
+
+    def test_ai_prompt_lists_each_event_once_with_report_count(self) -> None:
+        items = collapse_events([
+            news("英伟达市值突破5万亿美元，创历史新高", "华尔街见闻"),
+            news("Nvidia becomes first company worth $5 trillion", "Bloomberg Markets"),
+            news("苹果发布 iPhone 17 系列", "IT之家"),
+        ])
+        with mock.patch.object(collector, "call_llm_api", return_value=None) as call_llm_api, \
+             mock.patch.object(collector, "log"):
+            collector.classify_news_with_ai(items)
+
+        prompt = call_llm_api.call_args[0][0]
+        self.assertNotIn("Nvidia becomes", prompt)
+        self.assertIn("报道数: 2（华尔街见闻、Bloomberg Markets）", prompt)
+        self.assertEqual(prompt.count("报道数: "), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""验证 RSS 条件请求缓存（ETag / Last-Modified + 304 复用，条数或时间窗口不够时改发普通请求）。"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from feed_test_server import build_feed  # noqa: E402
+from feed_cache import FeedCache, conditional_headers  # noqa: E402
+
+
+def make_item(title: str, hours_old: float) -> dict:
+    published = datetime.now(timezone.utc) - timedelta(hours=hours_old)
+    return {
+        "title": title,
+        "original_title": title,
+        "summary": "",
+        "original_summary": "",
+        "link": "https://example.com/a",
+        "published": format_datetime(published),
+        "source": "Example",
+    }
+
+
+class FeedCacheTests(unittest.TestCase):
+    def test_lookup_requires_validators_and_matching_window(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = FeedCache(cache_dir=tmpdir)
+            cache.store("https://example.com/feed", "", "", [make_item("a", 1)], 24, 10)
+            self.assertIsNone(cache.lookup("https://example.com/feed", 24, 10))
+
+            cache.store("https://example.com/feed", '"v1"', "", [make_item("a", 1)], 24, 10)
+            entry = cache.lookup("https://example.com/feed", 24, 10)
+            self.assertEqual(conditional_headers(entry), {"If-None-Match": '"v1"'})
+            self.assertIsNotNone(cache.lookup("https://example.com/feed", 24, 5))
+            # 日报缓存不能用于周报窗口，也不能用于更大的条数上限
+            self.assertIsNone(cache.lookup("https://example.com/feed", 168, 10))
+            self.assertIsNone(cache.lookup("https://example.com/feed", 24, 20))
+
+    def test_fetch_feed_reuses_cached_items_on_304(self) -> None:
+        url = "https://example.com/feed"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = FeedCache(cache_dir=tmpdir)
+            cache.store(url, '"v1"', "", [make_item("仍在窗口内", 2), make_item("已过期", 30)], 24, 10)
+
+            session = mock.MagicMock()
+            response = session.get.return_value.__enter__.return_value
+            response.status_code = 304
+
+            with mock.patch.object(collector, "FEED_CACHE", cache), \
+                 mock.patch.object(collector, "get_session", return_value=session):
+                result = collector.fetch_feed(url, limit=10, hours_ago=24)
+
+        self.assertEqual(session.get.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
+        self.assertTrue(result["not_modified"])
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual([item["title"] for item in result["items"]], ["仍在窗口内"])
+
+    def test_larger_limit_sends_unconditional_request(self) -> None:
+        url = "https://example.com/feed"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = FeedCache(cache_dir=tmpdir)
+            cache.store(url, '"v1"', "", [make_item(f"旧条目 {i}", 2) for i in range(3)], 24, 3)
+
+            session = mock.MagicMock()
+            response = session.get.return_value.__enter__.return_value
+            response.status_code = 200
+            response.headers = {"ETag": '"v2"'}
+            response.iter_content.return_value = [build_feed([f"新条目 {i}" for i in range(6)])]
+
+            with mock.patch.object(collector, "FEED_CACHE", cache), \
+                 mock.patch.object(collector, "RSS_PARSE_WORKERS", 0), \
+                 mock.patch.object(collector, "get_session", return_value=session):
+                result = collector.fetch_feed(url, limit=6, hours_ago=24)
+            refreshed = cache.lookup(url, 24, 6)
+
+        self.assertNotIn("If-None-Match", session.get.call_args.kwargs["headers"])
+        self.assertFalse(result["not_modified"])
+        self.assertEqual(len(result["items"]), 6)
+        # 新缓存记下本次的条数上限，之后同样的请求可以再走 304
+        self.assertEqual(conditional_headers(refreshed), {"If-None-Match": '"v2"'})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""验证流式 RSS 解析：时间窗口优先、提前停止读取、损坏 XML 兜底；单遍 HTML 清洗与原四步实现一致。"""
+
+import html
+import os
+import random
+import re
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest import mock
+
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from feed_parser import (  # noqa: E402
+    SALVAGE_HEAD_BYTES, SALVAGE_TAIL_BYTES, FeedStreamParser, clean_html_cached, clean_html_content, parse_feed_items,
+)
+
+
+def build_rss(ages_in_hours, channel_title_first: bool = True) -> bytes:
+    now = datetime.now(timezone.utc)
+    items = "".join(
+        f"<item><title>新闻 {i}</title><link>https://example.com/{i}</link>"
+        f"<content:encoded><![CDATA[<p>{'正文' * 2000}</p>]]></content:encoded>"
+        f"<pubDate>{format_datetime(now - timedelta(hours=age))}</pubDate></item>"
+        for i, age in enumerate(ages_in_hours)
+    )
+    title = "<title>测试源</title>"
+    channel = title + items if channel_title_first else items + title
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<rss xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>'
+        f"{channel}</channel></rss>"
+    ).encode("utf-8")
+
+
+def feed_in_chunks(parser: FeedStreamParser, content: bytes, size: int = 4096):
+    for start in range(0, len(content), size):
+        if parser.feed(content[start:start + size]):
+            break
+    return parser.close()
+
+
+class FeedStreamParserTests(unittest.TestCase):
+    def test_stops_reading_once_limit_reached(self) -> None:
+        content = build_rss([1] * 40)
+        parser = FeedStreamParser(limit=3, hours_ago=24)
+        items = feed_in_chunks(parser, content)
+        self.assertEqual([item["title"] for item in items], ["新闻 0", "新闻 1", "新闻 2"])
+        self.assertLess(parser.bytes_read, len(content) // 5)
+        self.assertEqual(items[0]["source"], "测试源")
+
+    def test_byte_cap_keeps_complete_items(self) -> None:
+        content = build_rss([1] * 20)
+        parser = FeedStreamParser(limit=20, hours_ago=24, max_bytes=len(content) // 4)
+        items = feed_in_chunks(parser, content)
+        self.assertTrue(parser.truncated)
+        self.assertFalse(parser.recovered)
+        self.assertLess(parser.bytes_read, len(content) // 2)
+        self.assertGreater(len(items), 0)
+        self.assertEqual(items[0]["source"], "测试源")
+
+    def test_stops_after_run_of_stale_items(self) -> None:
+        content = build_rss([1, 30, 31, 32] + [1] * 20)
+        parser = FeedStreamParser(limit=10, hours_ago=24)
+        items = feed_in_chunks(parser, content)
+        self.assertEqual([item["title"] for item in items], ["新闻 0"])
+        self.assertLess(parser.bytes_read, len(content) // 2)
+
+    def test_honours_hours_ago(self) -> None:
+        content = build_rss([1, 72, 200])
+        self.assertEqual(len(parse_feed_items(content, limit=10, hours_ago=24)), 1)
+        self.assertEqual(len(parse_feed_items(content, limit=10, hours_ago=168)), 2)
+
+    def test_channel_title_after_items_fills_source(self) -> None:
+        items = parse_feed_items(build_rss([1, 2], channel_title_first=False), limit=10)
+        self.assertEqual({item["source"] for item in items}, {"测试源"})
+
+    def test_atom_entries(self) -> None:
+        updated = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+        content = (
+            '<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom 源</title>'
+            f'<entry><title>发布新模型</title><link href="https://example.com/x"/>'
+            f"<summary>&lt;b&gt;摘要&lt;/b&gt;</summary><updated>{updated}</updated></entry></feed>"
+        ).encode("utf-8")
+        items = parse_feed_items(content)
+        self.assertEqual(items[0]["link"], "https://example.com/x")
+        self.assertEqual(items[0]["summary"], "摘要")
+        self.assertEqual(items[0]["source"], "Atom 源")
+
+    def test_recovers_truncated_feed(self) -> None:
+        content = build_rss([1, 2])
+        broken = content[: content.rindex(b"</item>") + len(b"</item>")] + b"<item><title>\x01"
+        items = parse_feed_items(broken, limit=10)
+        self.assertEqual(len(items), 2)
+
+    def test_recovery_salvages_items_after_bad_fragment(self) -> None:
+        content = build_rss([1, 2, 3])
+        # 第一条中混入控制字节，第二条标签错配：只丢弃第二条，之后的条目仍可抢救
+        content = content.replace("新闻 0".encode("utf-8"), "新闻\x0b 0".encode("utf-8"))
+        content = content.replace("<title>新闻 1</title>".encode("utf-8"), "<title>新闻 1</b></title>".encode("utf-8"))
+        parser = FeedStreamParser(limit=10, hours_ago=24)
+        parser.feed(content)
+        items = parser.close()
+        self.assertTrue(parser.recovered)
+        self.assertEqual(parser.dropped, 1)
+        self.assertEqual([item["title"] for item in items], ["新闻 0", "新闻 2"])
+        self.assertEqual(items[0]["source"], "测试源")
+        self.assertTrue(items[0]["summary"].startswith("正文"))
+
+    def test_salvage_buffer_is_bounded_and_keeps_items_parsed_before_error(self) -> None:
+        content = build_rss([1] * 60)
+        # 第 50 条标签错配，出错位置远超保留的开头与最近一段
+        content = content.replace("<title>新闻 50</title>".encode("utf-8"), "<title>新闻 50</b></title>".encode("utf-8"))
+        self.assertGreater(content.index("新闻 50".encode("utf-8")), SALVAGE_HEAD_BYTES + SALVAGE_TAIL_BYTES + 16 * 1024)
+        parser = FeedStreamParser(limit=60, hours_ago=24)
+        chunk_size = 16 * 1024
+        peak = 0
+        for start in range(0, len(content), chunk_size):
+            parser.feed(content[start:start + chunk_size])
+            if not parser.failed:
+                peak = max(peak, parser.buffered_bytes)
+        items = parser.close()
+
+        self.assertLessEqual(peak, SALVAGE_HEAD_BYTES + SALVAGE_TAIL_BYTES + chunk_size)
+        self.assertTrue(parser.recovered)
+        self.assertEqual(parser.dropped, 1)
+        self.assertEqual([item["title"] for item in items], [f"新闻 {i}" for i in range(60) if i != 50])
+        self.assertEqual(parser.buffered_bytes, 0)
+
+    def test_recovery_keeps_atom_namespace(self) -> None:
+        updated = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+        entry = f"<entry><title>条目</title><updated>{updated}</updated></entry>"
+        content = (
+            f'<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom 源</title>{entry}'
+            f"<entry><title>坏条目</div></entry>{entry}</feed>"
+        ).encode("utf-8")
+        items = parse_feed_items(content)
+        self.assertEqual([item["title"] for item in items], ["条目", "条目"])
+        self.assertEqual(items[0]["source"], "Atom 源")
+
+    def test_unrecoverable_content_returns_none(self) -> None:
+        self.assertIsNone(parse_feed_items(b"<html><body>502 Bad Gateway</body>"))
+
+
+def reference_clean(raw_text):
+    """单遍化之前的四步实现（CDATA、标签、实体、空白各整体处理一遍）。"""
+    if not raw_text:
+        return ''
+    text = re.sub(r'<!\[CDATA\[(.*?)\]\]>', r'\1', raw_text, flags=re.DOTALL)
+    text = re.sub(r'<[^>]+>', '', text)
+    text = html.unescape(text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class CleanHtmlContentTests(unittest.TestCase):
+    CASES = [
+        "",
+        "  <p>OpenAI 发布&nbsp;GPT-5 &amp; 新工具</p>\n\n<p>第二段</p>  ",
+        "<![CDATA[<p>a > b</p>]]> 尾部",
+        "<![CDATA[未闭合 <b>粗体</b>",
+        "1 < 2 且 3 > 2，<> 不是标签",
+        "<a<b>标签跨 CDATA 边界<![CDATA[<i]]>>结束",
+        "实体跨标签 &am<b>p; 与 &#x4e<i>2d; 以及 &#20013",
+        "&lt;p&gt;转义出的标签保留&lt;/p&gt; &",
+    ]
+
+    def test_matches_reference_implementation(self) -> None:
+        for raw in self.CASES:
+            expected = reference_clean(raw)
+            self.assertEqual(clean_html_content(raw), expected, raw)
+            for limit in (0, 1, 5, 12):
+                self.assertEqual(clean_html_content(raw, limit), expected[:limit], (raw, limit))
+
+    def test_matches_reference_on_random_fragments(self) -> None:
+        pieces = ["<", ">", "<![CDATA[", "]]>", "&", "&amp;", "&#", "x", "1", ";", " ", "\n", "\xa0", "<p>", "中"]
+        rng = random.Random(20)
+        for _ in range(3000):
+            raw = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 12)))
+            expected = reference_clean(raw)
+            self.assertEqual(clean_html_content(raw), expected, raw)
+            self.assertEqual(clean_html_content(raw, 3), expected[:3], raw)
+
+    def test_limit_stops_before_processing_whole_body(self) -> None:
+        body = "<![CDATA[" + "<p>正文&nbsp;内容</p>" * 5000 + "]]>"
+        with mock.patch("feed_parser.html_module.unescape", wraps=html.unescape) as unescape:
+            summary = clean_html_content(body, limit=500)
+        self.assertEqual(summary, reference_clean(body)[:500])
+        self.assertLess(sum(len(call.args[0]) for call in unescape.call_args_list), 2000)
+
+    def test_cached_variant(self) -> None:
+        clean_html_cached.cache_clear()
+        self.assertEqual(clean_html_cached("<b>英伟达</b>"), "英伟达")
+        self.assertEqual(clean_html_cached("<b>英伟达</b>"), "英伟达")
+        self.assertEqual(clean_html_cached.cache_info().hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
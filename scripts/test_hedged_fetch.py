@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""验证镜像源对冲抓取：慢镜像超过阈值后由下一个镜像接管，落败的请求被取消。"""
+
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from concurrency import AIMDController, ThreadConcurrencyGate  # noqa: E402
+from feed_test_server import start_feed_server, stop_feed_server  # noqa: E402
+
+
+class HedgedFetchTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server, base = start_feed_server(delays={"/slow": 1.5}, drips={"/drip": 0.3})
+        cls.source = {
+            "name": "财联社快讯",
+            "url": f"{base}/slow",
+            "limit": 5,
+            "fallback_urls": [f"{base}/fast"],
+        }
+        cls.base = base
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        stop_feed_server(cls.server)
+
+    def collect(self, engine: str, mode: str) -> dict:
+        with mock.patch.object(collector, "FEED_CACHE", None), \
+             mock.patch.object(collector, "RSS_HEDGE_MODE", mode), \
+             mock.patch.object(collector, "RSS_HEDGE_DELAY", 0.2):
+            return list(collector.iter_source_results([self.source], 24, engine))[0]
+
+    def test_delay_mode_switches_to_next_mirror(self) -> None:
+        result = self.collect("thread", "delay")
+        self.assertTrue(result["hedged"])
+        self.assertTrue(result["hedge_winner"].endswith("/fast"))
+        self.assertLess(result["hedge_latency"], 1.2)
+        self.assertTrue(result["used_fallback"])
+
+    @unittest.skipIf(collector.aiohttp is None, "aiohttp 未安装")
+    def test_async_race_mode_takes_first_non_empty(self) -> None:
+        result = self.collect("async", "race")
+        self.assertTrue(result["hedge_winner"].endswith("/fast"))
+        self.assertLess(result["hedge_latency"], 1.2)
+
+    def test_losing_mirror_is_cancelled_and_releases_gate(self) -> None:
+        source = dict(self.source, url=f"{self.base}/drip")
+        controller = AIMDController(initial=4, per_host=4)
+        with mock.patch.object(collector, "FEED_CACHE", None), \
+             mock.patch.object(collector, "RSS_HEDGE_MODE", "delay"), \
+             mock.patch.object(collector, "RSS_HEDGE_DELAY", 0.2):
+            result = collector.fetch_source_hedged(source, 24, ThreadConcurrencyGate(controller))
+        self.assertTrue(result["hedge_winner"].endswith("/fast"))
+
+        # 慢镜像完整下载需约 2.4 秒；取消后在下一块之前放弃，名额随即归还
+        started = time.monotonic()
+        while controller.in_flight:
+            self.assertLess(time.monotonic() - started, 1.0)
+            time.sleep(0.05)
+        self.assertEqual(controller.host_stats[self.base.split("//")[1]]["congested"], 0)
+
+    def test_cancelled_fetch_skips_request(self) -> None:
+        cancel = collector.FetchCancel()
+        cancel.set()
+        with mock.patch.object(collector, "get_session") as get_session:
+            result = collector.fetch_feed_gated(self.source["url"], 5, 24, None, 5.0, cancel)
+        get_session.assert_not_called()
+        self.assertEqual(result["error"], "cancelled")
+        self.assertFalse(result["congested"])
+
+    def test_off_mode_keeps_sequential_fallback(self) -> None:
+        result = self.collect("thread", "off")
+        self.assertNotIn("hedged", result)
+        self.assertEqual(result["used_url"], self.source["url"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""验证共享 HTTP 连接池的配置与按 host 的令牌桶限速。"""
+
+import gzip
+import os
+import sys
+import threading
+import time
+import unittest
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import http_transport  # noqa: E402
+from utils import SSL_CONTEXT  # noqa: E402
+
+
+class CompressedHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        body = ("<p>" + "正文内容" * 50000 + "</p>").encode("utf-8")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class HttpTransportTests(unittest.TestCase):
+    def test_session_is_shared(self) -> None:
+        self.assertIs(http_transport.get_session(), http_transport.get_session())
+
+    def test_adapter_uses_pool_size_and_shared_ssl_context(self) -> None:
+        session = http_transport.create_session(pool_connections=4, pool_maxsize=3)
+        adapter = session.get_adapter("https://techcrunch.com/feed/")
+        self.assertIsInstance(adapter, http_transport.SSLContextAdapter)
+        self.assertIs(adapter.ssl_context, SSL_CONTEXT)
+        pool = adapter.poolmanager.connection_from_url("https://techcrunch.com/feed/")
+        self.assertEqual(pool.pool.maxsize, 3)
+        self.assertIs(pool.conn_kw["ssl_context"], SSL_CONTEXT)
+
+    def test_configured_pool_size_covers_thread_count(self) -> None:
+        previous = http_transport._POOL_MAXSIZE
+        try:
+            http_transport.configure_session(pool_maxsize=24)
+            adapter = http_transport.get_session().get_adapter("https://techcrunch.com/feed/")
+            self.assertEqual(adapter.poolmanager.connection_from_url("https://techcrunch.com/feed/").pool.maxsize, 24)
+            http_transport.configure_session(pool_maxsize=4)
+            adapter = http_transport.get_session().get_adapter("https://techcrunch.com/feed/")
+            self.assertEqual(adapter.poolmanager.connection_from_url("https://techcrunch.com/feed/").pool.maxsize, http_transport.POOL_MAXSIZE)
+        finally:
+            http_transport.configure_session(pool_maxsize=previous)
+
+    def test_compressed_body_is_decoded_and_read_is_bounded(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), CompressedHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/article"
+        try:
+            session = http_transport.create_session()
+            self.assertIn("gzip", session.headers["Accept-Encoding"])
+            with session.get(url, stream=True) as response:
+                self.assertEqual(response.headers["Content-Encoding"], "gzip")
+                content = b"".join(http_transport.iter_limited(response, 64 * 1024))
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(len(content), 64 * 1024)
+        self.assertTrue(content.startswith("<p>正文内容".encode("utf-8")))
+
+
+class HostRateLimiterTests(unittest.TestCase):
+    def test_token_bucket_allows_burst_then_paces_per_host(self) -> None:
+        limiter = http_transport.HostRateLimiter(interval=0.2, burst=2)
+        self.assertEqual(limiter.reserve("a.example.com"), 0.0)
+        self.assertEqual(limiter.reserve("a.example.com"), 0.0)
+        delay = limiter.reserve("a.example.com")
+        self.assertGreater(delay, 0.1)
+        self.assertLessEqual(delay, 0.2)
+        # 其他 host 有各自的令牌桶
+        self.assertEqual(limiter.reserve("b.example.com"), 0.0)
+        waited = limiter.acquire("a.example.com")
+        self.assertGreater(waited, 0.1)
+
+    def test_retry_after_defers_host(self) -> None:
+        limiter = http_transport.HostRateLimiter(interval=0.0, retry_after_max=60)
+        self.assertIsNone(limiter.observe("a.example.com", 200, {"Retry-After": "5"}))
+        self.assertEqual(limiter.observe("a.example.com", 429, {"Retry-After": "5"}), 5)
+        self.assertGreater(limiter.reserve("a.example.com"), 4)
+        self.assertEqual(limiter.observe("b.example.com", 503, {"Retry-After": "3600"}), 60)
+        self.assertLessEqual(limiter.reserve("b.example.com"), 60)
+
+    def test_parse_retry_after_accepts_seconds_and_http_date(self) -> None:
+        now = time.time()
+        self.assertEqual(http_transport.parse_retry_after("120"), 120.0)
+        self.assertAlmostEqual(http_transport.parse_retry_after(formatdate(now + 30, usegmt=True), now), 30, delta=1)
+        self.assertEqual(http_transport.parse_retry_after(formatdate(now - 30, usegmt=True), now), 0.0)
+        self.assertIsNone(http_transport.parse_retry_after("soon"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""验证 Aho–Corasick 多组关键词匹配与原先逐个关键词查找的结果完全一致。"""
+
+import os
+import random
+import re
+import sys
+import unittest
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from keyword_matcher import MATCH_IGNORE_CASE, MATCH_TOPIC, KeywordMatcher  # noqa: E402
+
+
+EVENT_PATTERNS = [
+    r"\d+月\d+日", r"\d+日", r"北京", r"上海", r"深圳", r"广州", r"杭州",
+    r"年度", r"季度", r"月份", r"首次", r"第一届", r"第二届",
+]
+
+
+def reference_valid_title(title: str) -> bool:
+    """改写前的 is_valid_news_title：每个关键词各做一次子串查找。"""
+    if not title or len(title.strip()) < 8:
+        return False
+    title = title.strip()
+    normalized = re.sub(r"\s+", " ", title)
+    if any(keyword in normalized for keyword in collector.NON_NEWS_STYLE_KEYWORDS):
+        return False
+    if any(re.search(pattern, normalized, re.IGNORECASE) for pattern in collector.NON_NEWS_STYLE_PATTERNS):
+        return False
+    if collector.has_excessive_english(title):
+        return False
+    if any(keyword in title for keyword in collector.HARD_EXCLUDE_KEYWORDS):
+        return False
+    has_keep_keyword = any(kw.lower() in title.lower() for kw in collector.KEEP_KEYWORDS)
+    for pattern in collector.TITLE_EXCLUDE_PATTERNS:
+        if re.match(pattern, title) and not has_keep_keyword:
+            return False
+    for keyword in collector.TITLE_EXCLUDE_KEYWORDS:
+        if keyword in title and not has_keep_keyword:
+            return False
+    if not any(element in title for element in collector.NEWS_ELEMENT_KEYWORDS):
+        return any(re.search(pattern, title) for pattern in EVENT_PATTERNS)
+    return True
+
+
+def reference_topic_scores(text: str) -> tuple:
+    lowered = text.lower()
+    return (
+        sum(2 for keyword in collector.AI_KEYWORDS if collector.contains_topic_keyword(lowered, keyword)),
+        sum(2 for keyword in collector.FINANCE_KEYWORDS if collector.contains_topic_keyword(lowered, keyword)),
+    )
+
+
+def build_titles(count: int, seed: int = 7):
+    keyword_lists = [
+        collector.HARD_EXCLUDE_KEYWORDS, collector.NON_NEWS_STYLE_KEYWORDS, collector.TITLE_EXCLUDE_KEYWORDS,
+        collector.KEEP_KEYWORDS, collector.NEWS_ELEMENT_KEYWORDS, collector.AI_KEYWORDS, collector.FINANCE_KEYWORDS,
+        *collector.HIGH_SIGNAL_KEYWORDS.values(),
+    ]
+    words = sorted({keyword for keywords in keyword_lists for keyword in keywords})
+    fillers = list("的了公司新款在中美 _-.+09abXZ") + ["openai", "OPENAI", "gpt", "İ", "\n", "？"]
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 8)):
+            word = rng.choice(words) if rng.random() < 0.5 else rng.choice(fillers)
+            roll = rng.random()
+            parts.append(word.upper() if roll < 0.15 else word.lower() if roll < 0.3 else word)
+        titles.append(("" if rng.random() < 0.5 else " ").join(parts))
+    return titles
+
+
+class KeywordMatcherTests(unittest.TestCase):
+    def test_reports_overlapping_hits_per_group(self) -> None:
+        matcher = KeywordMatcher({
+            "exact": ["模型", "大模型", "AI"],
+            "keep": (["OpenAI"], MATCH_IGNORE_CASE),
+            "topic": (["AI", "LLM", "模型"], MATCH_TOPIC),
+        })
+        self.assertEqual(
+            matcher.find("openai 发布大模型"),
+            {"exact": {"模型", "大模型"}, "keep": {"OpenAI"}, "topic": {"模型"}},
+        )
+        # 中文字符属于 \w，紧贴中文的英文词不满足词边界
+        self.assertEqual(matcher.find("新款AI手机")["exact"], {"AI"})
+        self.assertNotIn("topic", matcher.find("新款AI手机"))
+        self.assertEqual(matcher.find("新款 ai 手机, LLM.")["topic"], {"AI", "LLM"})
+        self.assertEqual(matcher.find(""), {})
+
+    def test_case_changing_characters_fall_back_to_substring_search(self) -> None:
+        matcher = KeywordMatcher({"exact": ["AI"], "keep": (["ai"], MATCH_IGNORE_CASE)})
+        self.assertEqual(matcher.find("İ AI 芯片"), {"exact": {"AI"}, "keep": {"ai"}})
+        self.assertEqual(matcher.find("İ ai 芯片"), {"keep": {"ai"}})
+
+
+class CollectorKeywordEquivalenceTests(unittest.TestCase):
+    def test_filters_and_scorers_match_per_keyword_scans(self) -> None:
+        for title in build_titles(3000):
+            self.assertEqual(collector.is_valid_news_title(title), reference_valid_title(title), title)
+            hits = collector.KEYWORD_MATCHER.find(title.lower())
+            self.assertEqual((2 * len(hits.get("ai", ())), 2 * len(hits.get("finance", ()))), reference_topic_scores(title), title)
+            for category, keywords in collector.HIGH_SIGNAL_KEYWORDS.items():
+                expected = sum(1 for keyword in keywords if keyword in title)
+                self.assertEqual(collector.score_item_for_category({"title": title}, category)[1], expected, title)
+
+
+if __name__ == "__main__":
+    unittest.main()
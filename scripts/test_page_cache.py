@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""验证原文页面磁盘缓存（规范化 URL、TTL、LRU 淘汰）与并发上下文补充。"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from page_cache import PageCache  # noqa: E402
+from url_canon import canonical_url  # noqa: E402
+
+
+def make_context(title: str) -> dict:
+    return {"page_title": title, "page_h1": "", "meta_description": "", "page_excerpt": "x" * 200}
+
+
+class PageCacheTests(unittest.TestCase):
+    def test_canonical_url_drops_tracking_and_fragment(self) -> None:
+        self.assertEqual(
+            canonical_url("HTTPS://Example.COM:443/a?id=1&utm_source=rss&spm=x#top"),
+            "https://example.com/a?id=1",
+        )
+        self.assertEqual(canonical_url("http://example.com"), "http://example.com/")
+
+    def test_get_returns_entry_for_equivalent_url_until_ttl(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = PageCache(cache_dir=tmpdir, ttl_hours=1)
+            cache.put("https://example.com/a?utm_medium=feed", make_context("A"))
+            self.assertEqual(cache.get("https://example.com/a#comments")["page_title"], "A")
+
+            with mock.patch("page_cache.time.time", return_value=time.time() + 7200):
+                self.assertIsNone(cache.get("https://example.com/a"))
+            self.assertEqual(os.listdir(tmpdir), [])
+
+    def test_evicts_least_recently_used_over_size_limit(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = PageCache(cache_dir=tmpdir, max_bytes=10 ** 6)
+            cache.put("https://example.com/old", make_context("old"))
+            cache.put("https://example.com/used", make_context("used"))
+            past = time.time() - 100
+            for name in os.listdir(tmpdir):
+                os.utime(os.path.join(tmpdir, name), (past, past))
+            # 命中刷新 LRU 时间戳
+            self.assertIsNotNone(cache.get("https://example.com/used"))
+
+            entry_size = os.path.getsize(os.path.join(tmpdir, os.listdir(tmpdir)[0]))
+            cache.max_bytes = entry_size * 2 + entry_size // 2
+            cache.put("https://example.com/new", make_context("new"))
+
+            self.assertIsNone(cache.get("https://example.com/old"))
+            self.assertIsNotNone(cache.get("https://example.com/used"))
+            self.assertIsNotNone(cache.get("https://example.com/new"))
+
+
+class ArticleContextEnrichmentTests(unittest.TestCase):
+    def test_fetch_article_context_reuses_disk_cache(self) -> None:
+        url = "https://example.com/story?utm_source=rss"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = PageCache(cache_dir=tmpdir)
+            cache.put("https://example.com/story", make_context("来自缓存"))
+            session = mock.MagicMock()
+            with mock.patch.object(collector, "PAGE_CACHE", cache), \
+                 mock.patch.object(collector, "ARTICLE_CONTEXT_CACHE", {}), \
+                 mock.patch.object(collector, "get_session", return_value=session):
+                context = collector.fetch_article_context(url)
+
+        session.get.assert_not_called()
+        self.assertEqual(context["page_title"], "来自缓存")
+
+    def test_enrichment_runs_concurrently_and_keeps_order(self) -> None:
+        categorized = {
+            "AI 领域": [{"title": f"a{i}", "link": f"https://example.com/a{i}"} for i in range(3)],
+            "科技动态": [{"title": "t0", "link": "https://example.com/t0"}],
+        }
+
+        def fake_fetch(url: str) -> dict:
+            time.sleep(0.2)
+            return make_context(url.rsplit("/", 1)[-1])
+
+        started = time.monotonic()
+        with mock.patch.object(collector, "fetch_article_context", side_effect=fake_fetch), \
+             mock.patch.object(collector, "ARTICLE_FETCH_WORKERS", 4), \
+             mock.patch.object(collector, "SOURCE_LEDGER", None):
+            collector.enrich_selected_news_context(categorized)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual([item["page_title"] for item in categorized["AI 领域"]], ["a0", "a1", "a2"])
+        self.assertEqual(categorized["科技动态"][0]["page_title"], "t0")
+        self.assertEqual(categorized["科技动态"][0]["original_title"], "t0")
+
+
+if __name__ == "__main__":
+    unittest.main()
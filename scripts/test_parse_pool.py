@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""验证 RSS 解析进程池：工作进程返回的结果记录与线程内流式解析一致，离开作用域时工作进程全部退出。"""
+
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from feed_parser import parse_feed_record  # noqa: E402
+from test_feed_parser import build_rss  # noqa: E402
+
+
+FEED = build_rss([1] * 12 + [30] * 5)
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(FEED)))
+        self.end_headers()
+        try:
+            self.wfile.write(FEED)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class ParseRecordTests(unittest.TestCase):
+    def test_record_matches_streaming_parser(self) -> None:
+        record = parse_feed_record(FEED, limit=5, hours_ago=24)
+        self.assertEqual([item["title"] for item in record["items"]], [f"新闻 {i}" for i in range(5)])
+        self.assertLess(record["bytes"], len(FEED))
+        self.assertFalse(record["truncated"])
+        self.assertIsNone(parse_feed_record(b"not xml at all", limit=5)["items"])
+
+
+class ParsePoolTests(unittest.TestCase):
+    def test_fetch_feed_offloads_parsing_to_worker_processes(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/feed"
+        try:
+            with mock.patch.object(collector, "FEED_CACHE", None):
+                streamed = collector.fetch_feed(url, limit=10, hours_ago=24)
+                with mock.patch.object(collector, "RSS_PARSE_WORKERS", 2):
+                    with collector.parse_pool_scope():
+                        pool = collector._PARSE_POOL
+                        workers = list(pool._processes.values())
+                        with mock.patch.object(pool, "submit", wraps=pool.submit) as submit:
+                            offloaded = collector.fetch_feed(url, limit=10, hours_ago=24)
+                    # 离开作用域时工作进程已全部退出，不会留到采集之后
+                    self.assertIsNone(collector._PARSE_POOL)
+                    self.assertEqual(len(workers), 2)
+                    self.assertFalse([worker for worker in workers if worker.is_alive()])
+                    # 进程池已关闭时退回线程内解析
+                    fallback = collector.fetch_feed(url, limit=10, hours_ago=24)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        submit.assert_called_once()
+        titles = [item["title"] for item in streamed["items"]]
+        self.assertEqual(len(titles), 10)
+        self.assertEqual([item["title"] for item in offloaded["items"]], titles)
+        self.assertEqual([item["title"] for item in fallback["items"]], titles)
+        # 进程池模式下载完整内容，下载量按实际读取字节计
+        self.assertEqual(offloaded["bytes"], len(FEED))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""验证已发布新闻记录：按链接 / 近似标题跨天剔除、按天滚动保留、日报发布成功后写入（周报不写入）。"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import auto_daily_news  # noqa: E402
+import rss_news_collector as collector  # noqa: E402
+from published_store import BloomFilter, PublishedStore  # noqa: E402
+
+
+TODAY = date(2026, 3, 10)
+PUBLISHED = {
+    "title": "OpenAI 推出 GPT-5：推理能力大幅提升",
+    "original_title": "OpenAI 发布新一代推理模型 GPT-5，性能大幅提升",
+    "link": "https://example.com/news/gpt5?utm_source=rss",
+}
+
+
+class BloomFilterTests(unittest.TestCase):
+    def test_membership_survives_round_trip(self) -> None:
+        bloom = BloomFilter(capacity=64)
+        links = [f"https://example.com/{i}" for i in range(64)]
+        for link in links:
+            bloom.add(link)
+        restored = BloomFilter.from_dict(json.loads(json.dumps(bloom.to_dict())))
+        self.assertTrue(all(link in restored for link in links))
+        false_positives = sum(f"https://other.example.com/{i}" in restored for i in range(2000))
+        self.assertLess(false_positives, 5)
+
+
+class PublishedStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "published.json")
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def store(self, today: date = TODAY) -> PublishedStore:
+        return PublishedStore(path=self.path, retention_days=3, today=today)
+
+    def test_matches_canonical_link_or_similar_original_title(self) -> None:
+        store = self.store(TODAY - timedelta(days=1))
+        self.assertEqual(store.record([PUBLISHED]), 1)
+        store.save()
+
+        store = self.store()
+        self.assertTrue(store.contains({"title": "完全不同的标题", "link": "https://EXAMPLE.com/news/gpt5#top"}))
+        self.assertTrue(store.contains({"title": "OpenAI 发布新一代推理模型 GPT-5 性能大幅提升了", "link": "https://other.com/x"}))
+        self.assertFalse(store.contains({"title": "英伟达市值突破五万亿美元创历史新高", "link": "https://example.com/news/nvda"}))
+
+    def test_days_roll_out_after_retention(self) -> None:
+        store = self.store(TODAY - timedelta(days=3))
+        store.record([PUBLISHED])
+        store.save()
+
+        self.assertTrue(self.store(TODAY - timedelta(days=1)).contains(PUBLISHED))
+        expired = self.store()
+        self.assertFalse(expired.contains(PUBLISHED))
+        expired.record([{"title": "央行宣布下调存款准备金率 0.5 个百分点", "link": "https://example.com/rrr"}])
+        expired.save()
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.assertEqual(list(json.load(f)["days"]), [TODAY.isoformat()])
+
+    def test_candidate_stage_drops_published_items_before_counting(self) -> None:
+        store = self.store()
+        store.record([PUBLISHED])
+        stage = collector.NewsCandidateStage(store)
+        stage.add([
+            {"title": PUBLISHED["original_title"], "link": PUBLISHED["link"], "summary": ""},
+            {"title": "英伟达市值突破五万亿美元创历史新高", "link": "https://example.com/nvda", "summary": ""},
+        ])
+        self.assertEqual(stage.published_count, 1)
+        self.assertEqual([item["title"] for item in stage.unique_items], ["英伟达市值突破五万亿美元创历史新高"])
+        self.assertEqual(sum(stage.category_counts.values()), 1)
+
+    def test_records_selected_news_after_successful_publish(self) -> None:
+        with open(os.path.join(self.tmpdir.name, "raw_news_20260310.json"), "w", encoding="utf-8") as f:
+            json.dump({"categorized_news": {"AI领域": [PUBLISHED], "财经要闻": []}}, f, ensure_ascii=False)
+
+        def store_factory(retention_days):
+            return PublishedStore(path=self.path, retention_days=retention_days, today=TODAY)
+
+        with mock.patch.object(auto_daily_news, "WORK_DIR", self.tmpdir.name), \
+             mock.patch.object(auto_daily_news, "PublishedStore", side_effect=store_factory), \
+             mock.patch.object(auto_daily_news, "log"):
+            auto_daily_news.record_published_news("20260310")
+
+        self.assertTrue(self.store(TODAY + timedelta(days=1)).contains(PUBLISHED))
+
+    def run_main_on(self, day: datetime) -> mock.Mock:
+        """在 day 这天跑一次发布成功的 main()，返回 record_published_news 的 mock。"""
+        fixed_now = mock.Mock(wraps=datetime)
+        fixed_now.now.return_value = day
+        with mock.patch.object(sys, "argv", ["auto_daily_news.py"]), \
+             mock.patch.object(auto_daily_news, "datetime", fixed_now), \
+             mock.patch.object(auto_daily_news, "WORK_DIR", self.tmpdir.name), \
+             mock.patch.object(auto_daily_news, "check_environment", return_value=True), \
+             mock.patch.object(auto_daily_news, "generate_news_html_with_rss", return_value="<p>新闻</p>"), \
+             mock.patch.object(auto_daily_news, "validate_news_content",
+                               return_value={"valid": True, "errors": [], "warnings": []}), \
+             mock.patch.object(auto_daily_news, "generate_cover_image", return_value=None), \
+             mock.patch.object(auto_daily_news, "publish_to_wechat", return_value=True), \
+             mock.patch.object(auto_daily_news, "record_published_news") as record, \
+             mock.patch.object(auto_daily_news, "log"):
+            auto_daily_news.main()
+        return record
+
+    def test_only_daily_publish_is_recorded(self) -> None:
+        self.run_main_on(datetime(2026, 3, 10, 8)).assert_called_once_with("20260310")
+        # 2026-03-09 是周一，发布的是周报
+        self.run_main_on(datetime(2026, 3, 9, 8)).assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""验证源抓取台账：跨运行持久化耗时、最长任务优先排序、最快镜像优先、熔断与自适应超时。"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from source_ledger import SourceLedger  # noqa: E402
+
+
+def make_attempt(url: str, elapsed: float, ok: bool) -> dict:
+    attempt = collector.new_feed_result(url)
+    attempt["elapsed"] = elapsed
+    if ok:
+        attempt["status"] = "ok"
+        attempt["items"] = [{"title": "公司发布新产品"}]
+    return attempt
+
+
+class SourceLedgerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "ledger.json")
+        self.sources = [
+            {"name": "快源", "url": "https://fast.example.com/feed", "limit": 5},
+            {"name": "慢源", "url": "https://slow.example.com/feed", "limit": 5},
+            {"name": "镜像源", "url": "https://a.example.com/feed", "limit": 5,
+             "fallback_urls": ["https://b.example.com/feed", "https://c.example.com/feed"]},
+            {"name": "新源", "url": "https://new.example.com/feed", "limit": 5},
+        ]
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def record_run(self, ledger: SourceLedger) -> None:
+        fast, slow, mirrored, _ = self.sources
+        ledger.record(collector.summarize_source_fetch(fast, [make_attempt(fast["url"], 0.4, True)]))
+        ledger.record(collector.summarize_source_fetch(slow, [make_attempt(slow["url"], 9.0, True)]))
+        ledger.record(collector.summarize_source_fetch(mirrored, [
+            make_attempt("https://a.example.com/feed", 3.0, False),
+            make_attempt("https://b.example.com/feed", 2.0, True),
+        ]))
+
+    def test_history_survives_reload_and_orders_longest_first(self) -> None:
+        ledger = SourceLedger(path=self.path)
+        self.record_run(ledger)
+        ledger.save()
+
+        planned = SourceLedger(path=self.path).plan_sources(self.sources, collector.get_source_urls)
+        self.assertEqual([source["name"] for source in planned], ["新源", "慢源", "镜像源", "快源"])
+        self.assertEqual(SourceLedger(path=self.path).sources["镜像源"]["fallback_uses"], 1)
+
+    def test_fastest_healthy_mirror_becomes_primary(self) -> None:
+        ledger = SourceLedger(path=self.path)
+        self.record_run(ledger)
+        planned = {source["name"]: source for source in ledger.plan_sources(self.sources, collector.get_source_urls)}
+
+        mirrored = planned["镜像源"]
+        self.assertEqual(collector.get_source_urls(mirrored), [
+            "https://b.example.com/feed", "https://a.example.com/feed", "https://c.example.com/feed",
+        ])
+        # 换了首选镜像，但 fallback 判定仍以配置的主地址为准
+        result = collector.summarize_source_fetch(mirrored, [make_attempt("https://b.example.com/feed", 1.0, True)])
+        self.assertTrue(result["used_fallback"])
+        self.assertNotIn("mirror_urls", planned["快源"])
+
+    def test_timeout_counts_as_slow_sample(self) -> None:
+        ledger = SourceLedger(path=self.path)
+        ledger.record(collector.timeout_source_result(self.sources[0], 45))
+        self.assertEqual(ledger.expected_latency("快源"), 45)
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ledger = SourceLedger(
+            path=os.path.join(self.tmpdir.name, "ledger.json"),
+            breaker_threshold=3,
+            breaker_skip_runs=2,
+            probe_timeout=5,
+        )
+        self.source = {"name": "财联社快讯", "url": "https://rsshub.example.com/cls/telegraph", "limit": 5}
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def run_once(self, ok: bool) -> tuple:
+        to_fetch, skipped = self.ledger.apply_breaker([self.source])
+        if skipped:
+            result = collector.circuit_open_source_result(skipped[0])
+        else:
+            result = collector.summarize_source_fetch(to_fetch[0], [make_attempt(self.source["url"], 1.0, ok)])
+        self.ledger.record(result)
+        return (to_fetch[0] if to_fetch else None), result
+
+    def test_failing_source_is_skipped_then_probed(self) -> None:
+        for _ in range(3):
+            planned, result = self.run_once(ok=False)
+            self.assertEqual(result["status"], "empty")
+        self.assertEqual(self.ledger.breaker_state("财联社快讯"), "open")
+
+        for _ in range(2):
+            planned, result = self.run_once(ok=True)
+            self.assertIsNone(planned)
+            self.assertEqual(result["status"], "circuit_open")
+
+        # 半开探测失败：重新打开并重新计数跳过次数
+        planned, result = self.run_once(ok=False)
+        self.assertEqual(planned["fetch_timeout"], 5)
+        self.assertEqual(collector.get_fetch_timeout(planned, self.source["url"]), 5)
+        self.assertEqual(result["breaker"], "half_open")
+        self.assertEqual(self.ledger.breaker_state("财联社快讯"), "open")
+
+        self.run_once(ok=True)
+        self.run_once(ok=True)
+        planned, result = self.run_once(ok=True)
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(self.ledger.breaker_state("财联社快讯"), "closed")
+
+    def test_quiet_feed_does_not_trip_breaker(self) -> None:
+        quiet = make_attempt(self.source["url"], 1.0, False)
+        quiet["status"] = "ok"
+        for _ in range(5):
+            self.ledger.record(collector.summarize_source_fetch(self.source, [quiet]))
+        self.assertEqual(self.ledger.breaker_state("财联社快讯"), "closed")
+
+
+    def test_probe_timeout_is_not_capped_by_learned_floor(self) -> None:
+        for _ in range(3):
+            self.run_once(ok=False)
+        for _ in range(2):
+            self.run_once(ok=True)
+        planned = self.ledger.plan_sources([self.source], collector.get_source_urls, 30)
+        planned = self.ledger.apply_breaker(planned)[0][0]
+        self.assertEqual(planned["url_timeouts"][self.source["url"]], 3.0)
+        self.assertEqual(collector.get_fetch_timeout(planned, self.source["url"]), 5)
+
+    def test_deadline_timeouts_do_not_trip_breaker(self) -> None:
+        self.run_once(ok=False)
+        self.run_once(ok=False)
+        for _ in range(3):
+            self.ledger.record(collector.timeout_source_result(self.source, 45))
+        self.assertEqual(self.ledger.breaker_state("财联社快讯"), "closed")
+        self.assertEqual(self.ledger.sources["财联社快讯"]["consecutive_failures"], 2)
+
+        self.run_once(ok=False)
+        self.assertEqual(self.ledger.breaker_state("财联社快讯"), "open")
+
+
+class AdaptiveTimeoutTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.ledger = SourceLedger(path=os.path.join(self.tmpdir.name, "ledger.json"))
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_timeout_is_p95_times_factor_within_bounds(self) -> None:
+        fast = {"name": "快源", "url": "https://fast.example.com/feed", "limit": 5}
+        slow = {"name": "慢源", "url": "https://slow.example.com/feed", "limit": 5}
+        for elapsed in (0.2, 0.3, 0.25, 0.4):
+            self.ledger.record(collector.summarize_source_fetch(fast, [make_attempt(fast["url"], elapsed, True)]))
+        for elapsed in (6.0, 8.0, 7.0, 12.0):
+            self.ledger.record(collector.summarize_source_fetch(slow, [make_attempt(slow["url"], elapsed, True)]))
+
+        self.assertEqual(self.ledger.url_timeout(fast["url"], 30), 3.0)
+        self.assertEqual(self.ledger.url_timeout(slow["url"], 30), 30)
+        self.assertEqual(self.ledger.url_timeout("https://new.example.com/feed", 30), 30)
+
+        self.ledger.record(collector.summarize_source_fetch(slow, [make_attempt(slow["url"], 5.0, True)]))
+        self.assertEqual(self.ledger.url_timeout(slow["url"], 40), 36.0)
+
+    def test_dead_feed_fails_fast_and_timeouts_persist(self) -> None:
+        dead = {"name": "死源", "url": "https://dead.example.com/feed", "limit": 5,
+                "fallback_urls": ["https://mirror.example.com/feed"]}
+        for _ in range(2):
+            self.ledger.record(collector.summarize_source_fetch(dead, [
+                make_attempt(dead["url"], 30.0, False),
+                make_attempt("https://mirror.example.com/feed", 1.0, True),
+            ]))
+        self.ledger.save()
+
+        planned = SourceLedger(path=self.ledger.path).plan_sources([dead], collector.get_source_urls, 30)[0]
+        self.assertEqual(collector.get_fetch_timeout(planned, dead["url"]), 3.0)
+        self.assertEqual(collector.get_fetch_timeout(planned, "https://mirror.example.com/feed"), 30)
+
+    def test_slow_feed_recovers_after_transient_failures(self) -> None:
+        slow = {"name": "慢源", "url": "https://slow.example.com/feed", "limit": 5}
+        for _ in range(5):
+            self.ledger.record(collector.summarize_source_fetch(slow, [make_attempt(slow["url"], 6.0, True)]))
+        self.assertEqual(self.ledger.url_timeout(slow["url"], 30), 18.0)
+
+        timeouts = []
+        for _ in range(5):
+            self.ledger.record(collector.summarize_source_fetch(slow, [make_attempt(slow["url"], 3.0, False)]))
+            timeouts.append(self.ledger.url_timeout(slow["url"], 30))
+        self.assertEqual(timeouts, [18.0, 3.0, 3.0, 18.0, 3.0])
+
+        self.ledger.record(collector.summarize_source_fetch(slow, [make_attempt(slow["url"], 6.5, True)]))
+        self.assertEqual(self.ledger.url_timeout(slow["url"], 30), 19.5)
+
+    def test_article_host_timeout(self) -> None:
+        for elapsed in (0.5, 0.8, 1.2):
+            self.ledger.record_host("www.ithome.com", elapsed, True)
+        self.assertEqual(self.ledger.host_timeout("www.ithome.com", 15), 3.6)
+        self.assertEqual(self.ledger.host_timeout("unknown.example.com", 15), 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
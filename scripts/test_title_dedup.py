@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""验证标题去重索引：规模不大时与逐一比较字符级 Jaccard 完全一致，超过阈值后切换到 MinHash/LSH 仍能找到已收录标题。"""
+
+import os
+import random
+import sys
+import unittest
+
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from title_dedup import TitleDedupIndex, dedup, jaccard_similar  # noqa: E402
+
+
+def brute_force_dedup(titles):
+    kept = []
+    for title in titles:
+        if any(jaccard_similar(frozenset(title), frozenset(existing)) for existing in kept):
+            continue
+        kept.append(title)
+    return kept
+
+
+def build_pair(rng: random.Random, shared: int, only: int):
+    """两个标题共有 shared 个字、各自另有 only 个字，Jaccard = shared / (shared + 2 * only)。"""
+    chars = rng.sample([chr(code) for code in range(0x4E00, 0x4E00 + 3000)], shared + 2 * only)
+    common = chars[:shared]
+    return "".join(common + chars[shared:shared + only]), "".join(common + chars[shared + only:])
+
+
+def build_titles(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    pool = [chr(code) for code in range(0x4E00, 0x4E00 + 800)]
+    titles = []
+    for _ in range(count):
+        if titles and rng.random() < 0.3:
+            chars = list(rng.choice(titles))
+            chars[rng.randrange(len(chars))] = rng.choice(pool)
+            titles.append("".join(chars))
+        else:
+            titles.append("".join(rng.choices(pool, k=rng.randint(12, 28))))
+    return titles
+
+
+class TitleDedupIndexTests(unittest.TestCase):
+    def test_matches_brute_force_jaccard(self) -> None:
+        titles = build_titles(800)
+        kept = dedup(titles, key=str)
+        self.assertEqual(kept, brute_force_dedup(titles))
+        self.assertLess(len(kept), len(titles))
+
+    def test_pairs_at_threshold_are_judged_exactly_below_cutoff(self) -> None:
+        rng = random.Random(7)
+        above = [build_pair(rng, 13, 4) for _ in range(300)]  # 13 / 21 ≈ 0.62
+        at = [build_pair(rng, 12, 4) for _ in range(100)]  # 12 / 20 = 0.6，不超过阈值
+        lsh_missed = 0
+        for first, second in above:
+            index = TitleDedupIndex()
+            index.add(first)
+            self.assertEqual(index.find_similar(second), first)
+            lsh = TitleDedupIndex(exact_limit=0)
+            lsh.add(first)
+            lsh_missed += lsh.find_similar(second) is None
+        for first, second in at:
+            index = TitleDedupIndex()
+            self.assertTrue(index.add_if_new(first))
+            self.assertTrue(index.add_if_new(second))
+        # 同样的标题对交给 LSH 分桶会漏掉一小部分，这正是小规模时逐一比较的原因
+        self.assertGreater(lsh_missed, 0)
+        self.assertLess(lsh_missed, 30)
+
+    def test_switching_to_lsh_keeps_titles_added_during_exact_scan(self) -> None:
+        titles = build_titles(60, seed=11)
+        index = TitleDedupIndex(exact_limit=40)
+        kept = [title for title in titles if index.add_if_new(title)]
+        self.assertEqual(kept, brute_force_dedup(titles))
+        self.assertTrue(index.uses_lsh)
+        for title in kept:
+            self.assertEqual(index.find_similar(title), title)
+
+    def test_find_similar_and_exact_membership(self) -> None:
+        index = TitleDedupIndex()
+        index.add("openai 发布新一代推理模型 o5，性能大幅提升")
+        self.assertIn("openai 发布新一代推理模型 o5，性能大幅提升", index)
+        self.assertEqual(
+            index.find_similar("openai 发布新一代推理模型 o5 性能大幅提升了"),
+            "openai 发布新一代推理模型 o5，性能大幅提升",
+        )
+        self.assertIsNone(index.find_similar("英伟达市值突破五万亿美元创历史新高"))
+        self.assertIsNone(index.find_similar(""))
+
+    def test_add_if_new_rejects_exact_and_near_duplicates(self) -> None:
+        index = TitleDedupIndex()
+        self.assertTrue(index.add_if_new("央行宣布下调存款准备金率 0.5 个百分点"))
+        self.assertFalse(index.add_if_new("央行宣布下调存款准备金率 0.5 个百分点"))
+        self.assertFalse(index.add_if_new("央行宣布下调存款准备金率0.5个百分点"))
+        self.assertTrue(index.add_if_new("英伟达市值突破五万亿美元创历史新高"))
+        self.assertEqual(len(index), 2)
+
+    def test_bulk_dedup_defaults_to_lowercased_item_titles(self) -> None:
+        items = [{"title": "OpenAI 发布 GPT-5"}, {"title": "openai 发布 gpt-5"}, {"title": "小米汽车宣布第二款车型正式交付"}]
+        self.assertEqual(dedup(items), [items[0], items[2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
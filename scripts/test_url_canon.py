@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""验证 URL 规范化、跳转链接归并与先于标题模糊去重的链接去重。"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+
+os.environ.setdefault("DOUBAO_API_KEY", "test-key")
+sys.path.insert(0, os.path.dirname(__file__))
+
+import rss_news_collector as collector  # noqa: E402
+from feed_parser import parse_feed_items  # noqa: E402
+from test_feed_parser import build_rss  # noqa: E402
+from url_canon import RedirectCache, link_key  # noqa: E402
+
+
+class LinkKeyTests(unittest.TestCase):
+    def test_same_article_across_feeds_shares_key(self) -> None:
+        key = link_key("https://techcrunch.com/2026/03/10/openai-gpt-5/")
+        self.assertEqual(link_key("http://www.TechCrunch.com/2026/03/10/openai-gpt-5?utm_source=ai-feed&utm_medium=rss"), key)
+        self.assertEqual(link_key("https://techcrunch.com/2026/03/10/openai-gpt-5#comments"), key)
+        self.assertEqual(link_key("https://example.com/a?b=2&a=1&fbclid=x"), link_key("https://example.com/a?a=1&b=2"))
+
+    def test_distinct_articles_and_non_http_links(self) -> None:
+        self.assertNotEqual(link_key("https://example.com/a?id=1"), link_key("https://example.com/a?id=2"))
+        self.assertEqual(link_key(""), "")
+        self.assertEqual(link_key(None), "")
+        self.assertEqual(link_key("javascript:void(0)"), "")
+
+    def test_generic_params_are_kept(self) -> None:
+        for param in ("source", "from", "ref"):
+            self.assertNotEqual(
+                link_key(f"https://example.com/view?{param}=a"),
+                link_key(f"https://example.com/view?{param}=b"),
+                param,
+            )
+        self.assertEqual(link_key("https://example.com/view?ref=a&gclid=x&spm=1.2"), link_key("https://example.com/view?ref=a"))
+
+
+class RedirectCacheTests(unittest.TestCase):
+    def test_records_only_redirect_services_and_persists(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "redirects.json")
+            cache = RedirectCache(path=path, max_entries=2)
+            cache.record("http://feedproxy.google.com/~r/techcrunch/~3/abc/?utm_source=feedburner", "https://techcrunch.com/story/")
+            cache.record("https://example.com/old", "https://example.com/new")
+            cache.save()
+
+            restored = RedirectCache(path=path, max_entries=2)
+            self.assertEqual(
+                link_key("http://feedproxy.google.com/~r/techcrunch/~3/abc/", restored),
+                link_key("https://techcrunch.com/story"),
+            )
+            self.assertEqual(restored.resolve("https://example.com/old"), "https://example.com/old")
+
+            for i in range(3):
+                restored.record(f"https://t.co/{i}", f"https://example.com/{i}")
+            self.assertEqual(list(restored.targets), ["https://t.co/1", "https://t.co/2"])
+
+    def test_feedburner_orig_link_preferred_over_proxy_link(self) -> None:
+        content = build_rss([1]).replace(
+            b"<link>https://example.com/0</link>",
+            b"<link>http://feedproxy.google.com/~r/x/~3/0/</link><feedburner:origLink>https://example.com/real</feedburner:origLink>",
+        ).replace(b"<rss ", b'<rss xmlns:feedburner="http://rssnamespace.org/feedburner/ext/1.0" ')
+        self.assertEqual(parse_feed_items(content)[0]["link"], "https://example.com/real")
+
+
+class LinkDedupStageTests(unittest.TestCase):
+    def test_same_link_dropped_before_title_comparison(self) -> None:
+        items = [
+            {"title": "OpenAI 发布新一代推理模型 GPT-5，性能大幅提升", "link": "https://techcrunch.com/2026/03/10/gpt-5/?utm_source=tc"},
+            {"title": "央行宣布下调存款准备金率 0.5 个百分点", "link": "http://www.techcrunch.com/2026/03/10/gpt-5?utm_source=tc-ai"},
+            {"title": "英伟达市值突破五万亿美元创历史新高", "link": "https://example.com/nvda"},
+        ]
+        stage = collector.NewsCandidateStage()
+        with mock.patch.object(stage.title_index, "add_if_new", wraps=stage.title_index.add_if_new) as add_if_new:
+            stage.add(items)
+
+        self.assertEqual(stage.link_duplicate_count, 1)
+        self.assertEqual([item["title"] for item in stage.unique_items], [items[0]["title"], items[2]["title"]])
+        self.assertEqual(add_if_new.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+URL 规范化
+canonical_url() 去掉片段、默认端口与常见跟踪参数（utm_*、spm、fbclid 等），小写 scheme 与 host，
+仍是可请求的地址，用作页面缓存键；link_key() 进一步忽略 http/https、www. 与末尾斜杠并排序查询参数，
+作为链接去重键。feedburner 等跳转链接按 RedirectCache 中记录的最终地址归并，去重时不发请求
+"""
+
+import json
+import os
+import tempfile
+import threading
+import urllib.parse
+from typing import Dict, Optional
+
+from utils import WORK_DIR
+
+TRACKING_PARAM_PREFIXES = ("utm_",)
+# 只列专用于投放与分享追踪的参数；source、from、ref 等通用名在不少站点是区分内容的真实参数，不能去掉
+TRACKING_PARAMS = {
+    "spm", "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_hsenc", "_hsmi", "ncid", "cmpid", "ocid", "sr_share",
+}
+
+REDIRECT_CACHE_PATH = os.path.join(WORK_DIR, "cache", "redirects.json")
+REDIRECT_CACHE_MAX_ENTRIES = 2000
+# 只记录这些跳转服务的链接：它们本身不是原文地址，同一篇文章在不同源里可能一个是跳转链接、一个是原文链接
+REDIRECT_HOSTS = {
+    "feedproxy.google.com", "feeds.feedburner.com", "feedburner.com", "rss.feedsportal.com",
+    "t.co", "bit.ly", "buff.ly", "dlvr.it", "ow.ly", "trib.al", "lnkd.in",
+}
+
+
+def is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def is_redirect_link(url: str) -> bool:
+    """链接是否指向 REDIRECT_HOSTS 中的跳转服务。"""
+    try:
+        return (urllib.parse.urlsplit(url.strip()).hostname or "") in REDIRECT_HOSTS
+    except ValueError:
+        return False
+
+
+def canonical_url(url: str) -> str:
+    """小写 scheme/host、去掉片段、常见跟踪参数与默认端口，其余部分保持不变。"""
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = [
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not is_tracking_param(key)
+    ]
+    return urllib.parse.urlunsplit((scheme, host, parts.path or "/", urllib.parse.urlencode(query), ""))
+
+
+def link_key(url: str, redirects: Optional["RedirectCache"] = None) -> str:
+    """链接去重键：canonical_url 基础上忽略 scheme、www. 前缀与末尾斜杠，查询参数排序；空链接返回空串。"""
+    url = (url or "").strip()
+    if not url.startswith(("http://", "https://")):
+        return ""
+    try:
+        if redirects is not None:
+            url = redirects.resolve(url)
+        parts = urllib.parse.urlsplit(canonical_url(url))
+    except ValueError:
+        # 端口等部分无法解析时按原样比较
+        return url.lower()
+    host = parts.netloc
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/") or "/"
+    query = "&".join(sorted(parts.query.split("&"))) if parts.query else ""
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+class RedirectCache:
+    """跳转链接 → 最终地址（均为 canonical_url），抓取原文时记录，可被多线程并发写入。"""
+
+    def __init__(self, path: str = REDIRECT_CACHE_PATH, max_entries: int = REDIRECT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.targets: Dict[str, str] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self.targets = {key: value for key, value in data.items() if isinstance(value, str)}
+
+    def save(self) -> None:
+        """有新记录时原子写入；写入失败不影响本次运行。"""
+        if not self._dirty:
+            return
+        tmp_path = None
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f, self._lock:
+                json.dump(self.targets, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except (OSError, TypeError, ValueError):
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def record(self, url: str, final_url: str) -> None:
+        """记录一次跳转；只记录 REDIRECT_HOSTS 中的跳转服务。"""
+        if not is_redirect_link(url):
+            return
+        try:
+            source = canonical_url(url)
+            target = canonical_url(final_url)
+        except ValueError:
+            return
+        if source == target:
+            return
+        with self._lock:
+            # 重新插入使其成为最新条目，超出上限时丢弃最早记录的
+            self.targets.pop(source, None)
+            self.targets[source] = target
+            self._dirty = True
+            while len(self.targets) > self.max_entries:
+                self.targets.pop(next(iter(self.targets)))
+
+    def resolve(self, url: str) -> str:
+        """已记录跳转目标时返回最终地址，否则原样返回。"""
+        return self.targets.get(canonical_url(url), url)
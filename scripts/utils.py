@@ -6,9 +6,8 @@ Daily Tech News 公共工具模块
 
 import os
 import ssl
-import time
 from datetime import datetime
-from typing import Optional, Callable, Any
+from typing import Optional
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 WORK_DIR = os.path.dirname(SCRIPT_DIR)
@@ -120,27 +119,6 @@ def get_weekday_name(dt: datetime) -> str:
     weekday_names = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
     return weekday_names[dt.weekday()]
 
-def rate_limited_request(
-    func: Callable[..., Any],
-    *args,
-    delay: float = 0.5,
-    **kwargs
-) -> Any:
-    """带速率限制的请求包装器
-
-    Args:
-        func: 要执行的函数
-        *args: 函数参数
-        delay: 请求后的延迟时间（秒）
-        **kwargs: 函数关键字参数
-
-    Returns:
-        函数返回值
-    """
-    result = func(*args, **kwargs)
-    time.sleep(delay)
-    return result
-
 def check_environment() -> dict:
     """检查运行环境依赖
 